@@ -1,20 +1,39 @@
+from __future__ import annotations
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import bcrypt
 import datetime
-from transformers import pipeline
 import time
 import os
 import base64
-from typing import Dict, List, Optional, Union, Tuple, Any
+from typing import Dict, List, Optional, Union, Tuple, Any, Callable, Protocol, TYPE_CHECKING
 import json
 import requests
 import uuid
+import threading
+import atexit
+import bisect
+import logging
+import sqlite3
+import queue
+import sys
+import gc
+import argparse
+import subprocess
+import hashlib
+import importlib
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# pandas, plotly, torch and transformers take seconds to import, so they are
+# imported inside the functions that use them; the login page needs none of them
+if TYPE_CHECKING:
+    import pandas as pd
+    import torch
+
+logger = logging.getLogger("empathypulse")
 
-# Initialize session state variables
-if "data_cache" not in st.session_state:
-    st.session_state.data_cache = {}
 # Page configuration
 st.set_page_config(
     page_title="EmpathyPulse - Employee Sentiment Analysis",
@@ -159,379 +178,3255 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# GitHub API Integration
-class GitHubDataStore:
-    """Class to handle data storage in GitHub repository"""
+# Process-wide data cache
+def diff_records(previous, records, key):
+    """
+    Find what changed between two versions of a cached record list
     
-    def __init__(self):
-        """Initialize GitHub data store with API token and repo details"""
-        # Get GitHub credentials from Streamlit secrets
-        self.token = st.secrets.get("github_token", "")
-        self.repo_owner = st.secrets.get("github_username", "")
-        self.repo_name = st.secrets.get("github_repo", "")
-        
-        # Base API URL
-        self.base_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}"
-        
-        # Define data file paths
-        self.employees_file = "data/employees.json"
-        self.admins_file = "data/admins.json"
-        self.feedback_file = "data/feedback.json"
-        self.password_reset_file = "data/password_reset.json"
-        
-        # Store data in session state for caching
-        if "data_cache" not in st.session_state:
-            st.session_state.data_cache = {}
+    Cached lists are never mutated: a change produces a new list that reuses
+    the unchanged record objects, so records are compared by identity.
+    
+    Returns:
+    --------
+    list or None
+        (old, new) pairs for replaced records and (None, new) for appended
+        ones, or None when records were removed or reordered
+    """
+    if len(records) < len(previous):
+        return None
+    changes = []
+    for old, new in zip(previous, records):
+        if new is old:
+            continue
+        if str(new.get(key)) != str(old.get(key)):
+            return None
+        changes.append((old, new))
+    changes.extend((None, new) for new in records[len(previous):])
+    return changes
+
+class RecordIndex:
+    """
+    Dict indexes over a list of records, kept in step with that list.
+
+    Records are looked up by a unique key field and grouped by other fields
+    (e.g. feedback by emp_id). A new list is diffed against the one indexed
+    last and only appended or replaced records are reindexed; anything else
+    (deletions, reordering) rebuilds the index.
+    """
+
+    def __init__(self, key: str, groups: Tuple[str, ...] = ()):
+        """Create an empty index on the key field and the group fields"""
+        self.key = key
+        self.groups = groups
+        self._lock = threading.Lock()
+        self._records: Optional[List[dict]] = None
+        self._by_key: Dict[str, dict] = {}
+        # group field -> value -> keys, kept as dicts for ordered O(1) removal
+        self._by_group: Dict[str, Dict[Any, Dict[str, None]]] = {field: {} for field in groups}
+
+    def get(self, records: List[dict], key: Any) -> Optional[dict]:
+        """Get the record with the given key from records"""
+        with self._lock:
+            self._sync(records)
+            return self._by_key.get(str(key))
+
+    def group(self, records: List[dict], field: str, value: Any) -> List[dict]:
+        """Get the records of records whose group field equals value"""
+        with self._lock:
+            self._sync(records)
+            return [self._by_key[key] for key in self._by_group[field].get(value, {})]
+
+    def _sync(self, records: List[dict]):
+        """Bring the index up to date with records"""
+        if records is self._records:
+            return
         
-        # Initialize data if not exists
-        self._ensure_data_files_exist()
+        changes = diff_records(self._records or [], records, self.key)
+        if changes is None:
+            self._rebuild(records)
+        else:
+            for old, new in changes:
+                if old is None:
+                    self._add(new)
+                else:
+                    self._replace(old, new)
+        self._records = records
+
+    def _rebuild(self, records: List[dict]):
+        """Index records from scratch"""
+        self._by_key = {}
+        self._by_group = {field: {} for field in self.groups}
+        for record in records:
+            self._add(record)
+
+    def _add(self, record: dict):
+        """Index one new record"""
+        key = str(record.get(self.key))
+        self._by_key[key] = record
+        for field in self.groups:
+            self._by_group[field].setdefault(record.get(field), {})[key] = None
+
+    def _replace(self, old: dict, new: dict):
+        """Reindex a changed version of a record in place"""
+        key = str(new.get(self.key))
+        self._by_key[key] = new
+        for field in self.groups:
+            if old.get(field) != new.get(field):
+                self._by_group[field].get(old.get(field), {}).pop(key, None)
+                self._by_group[field].setdefault(new.get(field), {})[key] = None
+
+def employee_search_terms(name: Any, emp_id: Any) -> Tuple[str, List[str]]:
+    """
+    Casefolded search text ("name emp_id") and words of an employee
     
-    def _get_headers(self):
-        """Get headers for GitHub API requests"""
-        return {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+    Shared by EmployeeSearchIndex and the SQLite store's search, so both
+    fold case the same way (str.casefold, not ASCII-only lower()).
+    """
+    name = str(name or "").casefold()
+    emp_id = str(emp_id).casefold()
+    return f"{name} {emp_id}", name.split() + [emp_id]
+
+def employee_search_match(text: str, words: List[str], query: str) -> bool:
+    """Whether an employee's search terms match a stripped, casefolded query (see EmployeeSearchIndex)"""
+    if len(query) < 3:
+        return any(word.startswith(query) for word in words)
+    return query in text
+
+class EmployeeSearchIndex:
+    """
+    Search index over employee names and IDs, kept in step with the employee list.
     
-    def _ensure_data_files_exist(self):
-        """Initialize data files if they don't exist in the repository"""
-        files_to_check = [
-            {"path": self.employees_file, "default": []},
-            {"path": self.admins_file, "default": []},
-            {"path": self.feedback_file, "default": []},
-            {"path": self.password_reset_file, "default": []}
-        ]
-        
-        for file_info in files_to_check:
-            try:
-                # Try to get file content
-                self._get_file_content(file_info["path"])
-            except Exception:
-                # File doesn't exist, create it
-                self._create_file(file_info["path"], json.dumps(file_info["default"]), "Initialize data file")
+    Each employee is filed under the trigrams of its casefolded "name emp_id"
+    text, so a query of three or more characters only checks the employees
+    sharing all of the query's trigrams. Shorter queries match the start of
+    a word of the name or of the ID through a sorted word list. Like
+    RecordIndex, a new list is diffed against the last one and only replaced
+    or appended employees are reindexed; anything else rebuilds the index.
+    """
+    
+    def __init__(self):
+        """Create an empty index"""
+        self._lock = threading.Lock()
+        self._records: Optional[List[dict]] = None
+        self._by_id: Dict[str, dict] = {}
+        self._text: Dict[str, str] = {}
+        self._trigrams: Dict[str, set] = {}
+        # sorted (word, emp_id) pairs for prefix queries
+        self._words: List[Tuple[str, str]] = []
+        self._by_dept: Dict[Any, set] = {}
+        # emp_ids sorted by name, rebuilt after changes
+        self._order: Optional[List[str]] = None
     
-    def _get_file_content(self, path):
+    def search(self, records: List[dict], query: str = "", dept: Any = None,
+               offset: int = 0, limit: Optional[int] = None) -> Tuple[int, List[dict]]:
         """
-        Get file content from GitHub repository
+        Find employees of records by name or ID, sorted by name
         
         Parameters:
         -----------
-        path : str
-            Path to the file in the repository
-            
+        records : list
+            Current employee records
+        query : str
+            Text to look for (case-insensitive); empty matches everyone
+        dept : optional
+            Only return employees of this department
+        offset, limit : int
+            Slice of the sorted matches to return (all of them by default)
+        
         Returns:
         --------
-        dict or list
-            Parsed JSON content of the file
+        tuple
+            (number of matches, employee records in the requested slice)
         """
-        # Check cache first
-        cache_key = f"content_{path}"
-        if cache_key in st.session_state.data_cache:
-            return st.session_state.data_cache[cache_key]
-        
-        # Make API request
-        url = f"{self.base_url}/contents/{path}"
-        response = requests.get(url, headers=self._get_headers())
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to get file content: {response.json().get('message', 'Unknown error')}")
-        
-        # Decode content
-        content_data = response.json()
-        content = base64.b64decode(content_data["content"]).decode("utf-8")
-        parsed_content = json.loads(content)
-        
-        # Save SHA for future updates
-        st.session_state.data_cache[f"sha_{path}"] = content_data["sha"]
+        with self._lock:
+            self._sync(records)
+            matches = self._match(query.strip().casefold())
+            if dept is not None:
+                in_dept = self._by_dept.get(dept, set())
+                matches = in_dept if matches is None else matches & in_dept
+            
+            end = offset + limit if limit is not None else None
+            if matches is None:
+                if self._order is None:
+                    self._order = sorted(self._by_id, key=self._sort_key)
+                total, page = len(self._order), self._order[offset:end]
+            else:
+                total, page = len(matches), sorted(matches, key=self._sort_key)[offset:end]
+            return total, [self._by_id[emp_id] for emp_id in page]
+    
+    def departments(self, records: List[dict]) -> List[Any]:
+        """Sorted departments of the employees in records"""
+        with self._lock:
+            self._sync(records)
+            return sorted(dept for dept, emp_ids in self._by_dept.items() if dept is not None and emp_ids)
+    
+    def _sort_key(self, emp_id: str) -> Tuple[str, str]:
+        """Sort employees by name, then ID"""
+        return str(self._by_id[emp_id].get("name") or ""), emp_id
+    
+    def _match(self, query: str) -> Optional[set]:
+        """IDs of the employees matching a casefolded query, or None for no query"""
+        if not query:
+            return None
+        if len(query) < 3:
+            start = bisect.bisect_left(self._words, (query,))
+            matches = set()
+            for word, emp_id in self._words[start:]:
+                if not word.startswith(query):
+                    break
+                matches.add(emp_id)
+            return matches
         
-        # Cache content
-        st.session_state.data_cache[cache_key] = parsed_content
+        # Intersect the smallest trigram sets first, then drop trigram-only matches
+        postings = sorted((self._trigrams.get(query[i:i + 3], set()) for i in range(len(query) - 2)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {emp_id for emp_id in candidates if query in self._text[emp_id]}
+    
+    def _sync(self, records: List[dict]):
+        """Bring the index up to date with records"""
+        if records is self._records:
+            return
         
-        return parsed_content
+        changes = diff_records(self._records or [], records, "emp_id")
+        if changes is None:
+            self._by_id, self._text, self._trigrams, self._words, self._by_dept = {}, {}, {}, [], {}
+            changes = [(None, record) for record in records]
+        for old, new in changes:
+            if old is not None:
+                self._remove(old)
+            self._add(new)
+        self._records = records
+        self._order = None
     
-    def _update_file(self, path, content, commit_message):
-        """
-        Update file in GitHub repository
-        """
-        # Fetch the latest SHA
-        url = f"{self.base_url}/contents/{path}"
-        response = requests.get(url, headers=self._get_headers())
-        if response.status_code == 200:
-            sha = response.json()["sha"]
-            st.session_state.data_cache[f"sha_{path}"] = sha
-        else:
-            st.error(f"Failed to fetch latest SHA for {path}: {response.json().get('message', 'Unknown error')}")
-            return False
+    @staticmethod
+    def _terms(employee: dict) -> Tuple[str, List[str]]:
+        """Casefolded search text and words of an employee"""
+        return employee_search_terms(employee.get("name"), employee.get("emp_id"))
+    
+    def _add(self, employee: dict):
+        """Index one employee"""
+        emp_id = str(employee.get("emp_id"))
+        text, words = self._terms(employee)
+        self._by_id[emp_id] = employee
+        self._text[emp_id] = text
+        for i in range(len(text) - 2):
+            self._trigrams.setdefault(text[i:i + 3], set()).add(emp_id)
+        for word in set(words):
+            bisect.insort(self._words, (word, emp_id))
+        self._by_dept.setdefault(employee.get("dept"), set()).add(emp_id)
+    
+    def _remove(self, employee: dict):
+        """Take one employee out of the index"""
+        emp_id = str(employee.get("emp_id"))
+        text, words = self._terms(employee)
+        del self._by_id[emp_id], self._text[emp_id]
+        for i in range(len(text) - 2):
+            self._trigrams.get(text[i:i + 3], set()).discard(emp_id)
+        for word in set(words):
+            i = bisect.bisect_left(self._words, (word, emp_id))
+            if i < len(self._words) and self._words[i] == (word, emp_id):
+                del self._words[i]
+        self._by_dept.get(employee.get("dept"), set()).discard(emp_id)
 
-        # Prepare payload
-        payload = {
-            "message": commit_message,
-            "content": base64.b64encode(content.encode()).decode(),
-            "sha": sha
-        }
+class SharedDataCache:
+    """
+    Cache of parsed data files shared by every session in the process.
 
-        # Make API request to update
-        response = requests.put(url, headers=self._get_headers(), json=payload)
-        if response.status_code not in [200, 201]:
-            st.error(f"Failed to update file: {response.json().get('message', 'Unknown error')}")
+    Each entry keeps the parsed JSON together with the blob SHA (and ETag)
+    it was decoded from, so a stale entry can be revalidated cheaply and a
+    write can replace it in place instead of forcing a refetch.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        """Create an empty cache whose entries are trusted for ttl_seconds"""
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._stats = {"hits": 0, "misses": 0, "revalidations": 0, "not_modified": 0}
+        self._indexes: Dict[str, RecordIndex] = {}
+        self._derived: Dict[str, Tuple[Any, Any]] = {}
+        self._rollups: Dict[str, FeedbackRollup] = {}
+        self._search_indexes: Dict[str, EmployeeSearchIndex] = {}
+
+    def path_lock(self, path: str) -> threading.Lock:
+        """Lock serializing fetches of one file, so concurrent sessions share one request"""
+        with self._lock:
+            if path not in self._path_locks:
+                self._path_locks[path] = threading.Lock()
+            return self._path_locks[path]
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a file, fresh or not"""
+        with self._lock:
+            return self._entries.get(path)
+
+    def is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        """Check whether an entry is still inside its TTL"""
+        if entry is None:
             return False
+        return time.monotonic() - entry["fetched_at"] < self.ttl_seconds
 
-        # Update cache
-        st.session_state.data_cache[f"sha_{path}"] = response.json()["content"]["sha"]
-        return True
+    def put(self, path: str, content: Any, sha: str, etag: Optional[str] = None):
+        """Store freshly fetched or freshly written content for a file"""
+        with self._lock:
+            self._entries[path] = {
+                "content": content,
+                "sha": sha,
+                "etag": etag,
+                "fetched_at": time.monotonic()
+            }
+
+    def touch(self, path: str):
+        """Mark an entry as revalidated without replacing its content"""
+        with self._lock:
+            if path in self._entries:
+                self._entries[path]["fetched_at"] = time.monotonic()
+
+    def record(self, counter: str):
+        """Increment one of the hit/miss/revalidation counters"""
+        with self._lock:
+            self._stats[counter] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the cache counters"""
+        with self._lock:
+            return dict(self._stats)
+
+    def write_lock(self, path: str) -> threading.Lock:
+        """Lock serializing writes of one file within this process"""
+        with self._lock:
+            if path not in self._write_locks:
+                self._write_locks[path] = threading.Lock()
+            return self._write_locks[path]
+
+    def expire(self, path: str):
+        """Force the next read of a file to revalidate it"""
+        with self._lock:
+            if path in self._entries:
+                self._entries[path]["fetched_at"] = float("-inf")
+
+    def index(self, name: str, key: str, groups: Tuple[str, ...] = ()) -> RecordIndex:
+        """Get the index registered under name, creating it on first use"""
+        with self._lock:
+            if name not in self._indexes:
+                self._indexes[name] = RecordIndex(key, groups)
+            return self._indexes[name]
+
+    def rollup(self, name: str) -> FeedbackRollup:
+        """Get the feedback rollup registered under name, creating it on first use"""
+        with self._lock:
+            if name not in self._rollups:
+                self._rollups[name] = FeedbackRollup()
+            return self._rollups[name]
     
-    def _create_file(self, path, content, commit_message):
-        """
-        Create new file in GitHub repository
-        
-        Parameters:
-        -----------
-        path : str
-            Path to the file in the repository
-        content : str
-            Content of the file
-        commit_message : str
-            Commit message for the creation
-            
-        Returns:
-        --------
-        bool
-            True if creation was successful, False otherwise
-        """
-        # Make API request to create
-        url = f"{self.base_url}/contents/{path}"
-        payload = {
-            "message": commit_message,
-            "content": base64.b64encode(content.encode()).decode()
-        }
-        
-        response = requests.put(url, headers=self._get_headers(), json=payload)
-        
-        if response.status_code not in [200, 201]:
-            st.error(f"Failed to create file: {response.json().get('message', 'Unknown error')}")
-            return False
-        
-        # Update SHA and cache
-        st.session_state.data_cache[f"sha_{path}"] = response.json()["content"]["sha"]
-        return True
+    def search_index(self, name: str) -> EmployeeSearchIndex:
+        """Get the employee search index registered under name, creating it on first use"""
+        with self._lock:
+            if name not in self._search_indexes:
+                self._search_indexes[name] = EmployeeSearchIndex()
+            return self._search_indexes[name]
     
-    # Employee operations
-    def get_employees(self):
-        """Get all employees from GitHub"""
-        try:
-            return self._get_file_content(self.employees_file)
-        except Exception as e:
-            st.error(f"Error getting employees: {e}")
-            return []
+    def derived(self, name: str, source: Any, compute: Callable[[Any], Any], version: Any = None) -> Any:
+        """Get compute(source), recomputed only when source is a different object or version changed"""
+        with self._lock:
+            cached = self._derived.get(name)
+        if cached is not None and cached[0] is source and cached[1] == version:
+            return cached[2]
+        value = compute(source)
+        with self._lock:
+            self._derived[name] = (source, version, value)
+        return value
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop one file (or everything) from the cache"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+@st.cache_resource
+def get_shared_data_cache() -> SharedDataCache:
+    """Get the data cache shared by all sessions of this process"""
+    return SharedDataCache(ttl_seconds=float(st.secrets.get("data_cache_ttl", 30)))
+
+def apply_feedback_ops(feedback_list, ops):
+    """
+    Apply queued feedback changes to a list of feedback records
     
-    def get_employee(self,emp_id: str) -> Optional[dict]:
-        employees = self._get_file_content("data/employees.json")
-        for employee in employees:
-            if employee.get("emp_id") == emp_id:
-                return employee
-        return None
+    Appends whose id is already present are skipped, so replaying a spool
+    that was partly committed before a crash does not duplicate records.
     
-    def add_employee(self, employee_data):
-        """Add new employee to GitHub"""
-        employees = self.get_employees()
-        
-        # Generate a unique ID if not provided
-        if not employee_data.get("emp_id"):
-            employee_data["emp_id"] = str(uuid.uuid4())
-        
-        # Add creation timestamp
-        employee_data["created_at"] = datetime.datetime.now().isoformat()
+    Parameters:
+    -----------
+    feedback_list : list
+        Current feedback records (not modified)
+    ops : list
+        Queued changes, {"op": "append", "record": {...}},
+        {"op": "update", "id": ..., "changes": {...}} or
+        {"op": "delete_employee", "emp_id": ...}
         
-        employees.append(employee_data)
-        return self._update_file(
-            self.employees_file, 
-            json.dumps(employees), 
-            f"Add employee {employee_data.get('name')}"
-        )
+    Returns:
+    --------
+    list
+        New list with the changes applied
+    """
+    feedback_list = list(feedback_list)
+    positions = {str(f.get("id")): i for i, f in enumerate(feedback_list)}
+    for op in ops:
+        if op["op"] == "append":
+            record_id = str(op["record"].get("id"))
+            if record_id not in positions:
+                positions[record_id] = len(feedback_list)
+                feedback_list.append(op["record"])
+        elif op["op"] == "update":
+            i = positions.get(str(op["id"]))
+            if i is not None:
+                feedback_list[i] = {**feedback_list[i], **op["changes"]}
+        elif op["op"] == "delete_employee":
+            feedback_list = [f for f in feedback_list if f.get("emp_id") != op["emp_id"]]
+            positions = {str(f.get("id")): i for i, f in enumerate(feedback_list)}
+    return feedback_list
+
+# JSON Lines feedback log
+#
+# With feedback_format = "jsonl" feedback is stored as a base segment
+# (data/feedback.jsonl: a header line, then one record per line) plus
+# immutable log segments in data/feedback_log/, one small file per write
+# holding the same ops as the write-behind queue. Compaction folds the log
+# into a new base segment; the header lists the segments it folded so
+# readers skip them until they are deleted.
+def new_feedback_segment_name():
+    """Name for a new log segment, sortable by creation time"""
+    return f"{datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}.jsonl"
+
+def parse_feedback_base(text):
+    """Parse a base segment into {"folded": [...], "records": [...]}"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return {"folded": [], "records": []}
+    header = json.loads(lines[0])
+    return {"folded": header.get("folded", []), "records": [json.loads(line) for line in lines[1:]]}
+
+def serialize_feedback_base(records, folded):
+    """Serialize records into a base segment that folds the given log segments"""
+    header = json.dumps({"format": "feedback-log", "folded": folded})
+    return "".join([header + "\n"] + [json.dumps(record) + "\n" for record in records])
+
+def parse_feedback_segment(text):
+    """Parse a log segment into its list of ops"""
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def replay_feedback_log(base_text, segments):
+    """
+    Materialize feedback records from a base segment and its log
     
-    def update_employee(self, emp_id, updated_data):
-        """Update employee data in GitHub"""
-        employees = self.get_employees()
-        
-        for i, employee in enumerate(employees):
-            if employee.get("emp_id") == emp_id:
-                employees[i].update(updated_data)
-                return self._update_file(
-                    self.employees_file,
-                    json.dumps(employees),
-                    f"Update employee {employee.get('name')}"
-                )
+    Parameters:
+    -----------
+    base_text : str
+        Content of the base segment
+    segments : dict
+        Log segment name -> content
         
-        return False
+    Returns:
+    --------
+    list
+        Feedback records with every live segment applied in order
+    """
+    base = parse_feedback_base(base_text)
+    folded = set(base["folded"])
+    ops = []
+    for name in sorted(segments):
+        if name not in folded:
+            ops.extend(parse_feedback_segment(segments[name]))
+    return apply_feedback_ops(base["records"], ops)
+
+def feedback_month(feedback):
+    """Month ("YYYY-MM") a feedback record is filed under, "undated" when it has no usable timestamp"""
+    month = str(feedback.get("timestamp", ""))[:7]
+    return month if re.fullmatch(r"\d{4}-\d{2}", month) else "undated"
+
+def filter_feedback_by_date(feedback_list, start_date=None, end_date=None):
+    """Keep the records whose timestamp falls between start_date and end_date (inclusive)"""
+    start = start_date.isoformat() if start_date else None
+    end = end_date.isoformat() if end_date else None
+    return [
+        f for f in feedback_list
+        if (start is None or str(f.get("timestamp", ""))[:10] >= start)
+        and (end is None or str(f.get("timestamp", ""))[:10] <= end)
+    ]
+
+# Feedback aggregates
+FEEDBACK_SUMMARY_COLUMNS = ["submissions", "positive", "negative"]
+
+def summarize_feedback_by_employee(feedback_list):
+    """
+    Count each employee's feedback submissions and sentiments in one pass
     
-    def delete_employee(self, emp_id):
-        """Delete an employee and all related data from GitHub"""
-        # Remove employee from employees.json
-        employees = self.get_employees()
-        employees = [emp for emp in employees if emp.get("emp_id") != emp_id]
-        emp_update_result = self._update_file(
-            self.employees_file,
-            json.dumps(employees),
-            f"Delete employee {emp_id}"
-        )
-        # Remove all feedback for this employee from feedback.json
-        feedback_list = self.get_feedback()
-        feedback_list = [fb for fb in feedback_list if fb.get("emp_id") != emp_id]
-        feedback_update_result = self._update_file(
-            self.feedback_file,
-            json.dumps(feedback_list),
-            f"Delete feedback for employee {emp_id}"
-        )
-        return emp_update_result and feedback_update_result
+    Returns:
+    --------
+    pd.DataFrame
+        Indexed by emp_id, with integer submissions, positive and negative columns
+    """
+    import pandas as pd
+    if not feedback_list:
+        return pd.DataFrame(columns=FEEDBACK_SUMMARY_COLUMNS, index=pd.Index([], name="emp_id"), dtype="int64")
     
-    # Admin operations
-    def get_admins(self):
-        """Get all admins from GitHub"""
-        try:
-            return self._get_file_content(self.admins_file)
-        except Exception:
-            return []
+    df = pd.DataFrame(feedback_list, columns=["emp_id", "sentiment"])
+    df["positive"] = df["sentiment"].eq("POSITIVE")
+    df["negative"] = df["sentiment"].eq("NEGATIVE")
+    summary = df.groupby("emp_id").agg(
+        submissions=("sentiment", "size"),
+        positive=("positive", "sum"),
+        negative=("negative", "sum")
+    )
+    return summary.astype("int64")
+
+def join_feedback_summary(emp_df, summary):
+    """Add the feedback summary columns to a DataFrame of employees (0 for no feedback)"""
+    joined = emp_df.join(summary, on="emp_id")
+    joined[FEEDBACK_SUMMARY_COLUMNS] = joined[FEEDBACK_SUMMARY_COLUMNS].fillna(0).astype("int64")
+    return joined
+
+SATISFACTION_SCORES = ["work_satisfaction", "team_satisfaction", "management_satisfaction"]
+
+def rollup_fields(feedback):
+    """
+    What one feedback record adds to its (date, department) rollup cell
     
-    def get_admin(self, admin_id):
-        """Get admin by ID from GitHub"""
-        admins = self.get_admins()
-        for admin in admins:
-            if admin.get("admin_id") == admin_id:
-                return admin
-        return None
+    Every record counts in "feedback"; its sentiment and emotion count in
+    "sentiment:<label>" and "emotion:<label>"; each satisfaction score
+    present adds to "<score>_sum" and "<score>_count".
+    """
+    fields = {"feedback": 1}
+    for label_field in ("sentiment", "emotion"):
+        if feedback.get(label_field):
+            fields[f"{label_field}:{feedback[label_field]}"] = 1
+    for score in SATISFACTION_SCORES:
+        value = feedback.get(score)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            fields[f"{score}_sum"] = value
+            fields[f"{score}_count"] = 1
+    return fields
+
+def rollup_frame(cells):
+    """
+    Turn rollup cells into a DataFrame
     
-    def add_admin(self, admin_data):
-        """Add new admin to GitHub"""
-        admins = self.get_admins()
-        
-        # Add creation timestamp
-        admin_data["created_at"] = datetime.datetime.now().isoformat()
-        
-        admins.append(admin_data)
-        return self._update_file(
-            self.admins_file,
-            json.dumps(admins),
-            f"Add admin {admin_data.get('admin_id')}"
-        )
+    Parameters:
+    -----------
+    cells : dict
+        (date "YYYY-MM-DD", dept) -> {field: total}, fields as in rollup_fields
     
-    # Feedback operations
-    def get_feedback(self):
-        """Get all feedback from GitHub"""
-        try:
-            return self._get_file_content(self.feedback_file)
-        except Exception:
-            return []
+    Returns:
+    --------
+    pd.DataFrame
+        One row per date and department, sorted by date, with a column per
+        field (0 where a cell has none)
+    """
+    import pandas as pd
+    count_columns = ["feedback"] + [f"{score}_count" for score in SATISFACTION_SCORES]
+    sum_columns = [f"{score}_sum" for score in SATISFACTION_SCORES]
+    df = pd.DataFrame(
+        [{"date": datetime.date.fromisoformat(date), "dept": dept, **fields} for (date, dept), fields in cells.items()]
+    )
+    label_columns = sorted(column for column in df.columns if ":" in column)
+    df = df.reindex(columns=["date", "dept"] + count_columns + sum_columns + label_columns)
+    df[count_columns + label_columns] = df[count_columns + label_columns].fillna(0).astype("int64")
+    df[sum_columns] = df[sum_columns].fillna(0)
+    return df.sort_values("date", kind="stable").reset_index(drop=True)
+
+FEEDBACK_CATEGORY_COLUMNS = ["dept", "sentiment", "emotion", "status"]
+FEEDBACK_SCORE_COLUMNS = SATISFACTION_SCORES + ["mood_score"]
+
+def feedback_frame(feedback_list):
+    """
+    Build the typed DataFrame of feedback records shared by the admin views
+
+    Department, sentiment, emotion and status are categoricals, timestamps
+    are datetime64 (NaT where unparseable) and scores are nullable int8,
+    which keeps the frame a fraction of the size of the object columns
+    pd.DataFrame(feedback_list) would give and makes filtering cheap.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per record in list order, with at least the id, emp_id,
+        timestamp, category and score columns
+    """
+    import pandas as pd
+    df = pd.DataFrame(feedback_list)
+    for column in ["id", "emp_id", "timestamp"] + FEEDBACK_CATEGORY_COLUMNS + FEEDBACK_SCORE_COLUMNS:
+        if column not in df:
+            df[column] = None
+
+    df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601", errors="coerce")
+    df[FEEDBACK_CATEGORY_COLUMNS] = df[FEEDBACK_CATEGORY_COLUMNS].astype("category")
+    for column in FEEDBACK_SCORE_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int8")
+    return df
+
+def newest_first(frame):
+    """Row positions of a feedback frame ordered by timestamp, newest first and undated rows last"""
+    return frame["timestamp"].reset_index(drop=True).sort_values(ascending=False, kind="stable").index.to_numpy()
+
+class FeedbackRollup:
+    """
+    Per-day, per-department feedback totals, kept in step with the feedback list.
     
-    def add_feedback(self, feedback_data):
-        """Add new feedback to GitHub"""
-        feedback_list = self.get_feedback()
-        
+    Each (date, dept) cell holds the counts and sums of rollup_fields, so
+    the sentiment overview is drawn from days x departments rows instead
+    of every feedback record. Like RecordIndex, a new feedback list is
+    diffed against the last one and only the records a write replaced or
+    appended are moved between cells; anything else rebuilds the totals.
+    """
+    
+    def __init__(self):
+        """Create empty totals"""
+        self._lock = threading.Lock()
+        self._records: Optional[List[dict]] = None
+        self._cells: Dict[Tuple[str, Any], Dict[str, float]] = {}
+        self._frame = None
+    
+    def frame(self, records: List[dict]) -> pd.DataFrame:
+        """The totals for records as a DataFrame (see rollup_frame)"""
+        with self._lock:
+            self._sync(records)
+            if self._frame is None:
+                self._frame = rollup_frame(self._cells)
+            return self._frame
+    
+    def _sync(self, records: List[dict]):
+        """Bring the totals up to date with records"""
+        if records is self._records:
+            return
+        
+        changes = diff_records(self._records or [], records, "id")
+        if changes is None:
+            self._cells = {}
+            changes = [(None, record) for record in records]
+        for old, new in changes:
+            if old is not None:
+                self._apply(old, -1)
+            self._apply(new, 1)
+        self._records = records
+        self._frame = None
+    
+    def _apply(self, feedback: dict, sign: int):
+        """Add a record to its cell (sign 1) or take it out again (sign -1)"""
+        key = (str(feedback.get("timestamp", ""))[:10], feedback.get("dept"))
+        if len(key[0]) < 10:
+            return
+        cell = self._cells.setdefault(key, {})
+        for field, value in rollup_fields(feedback).items():
+            cell[field] = cell.get(field, 0) + sign * value
+            if not cell[field]:
+                del cell[field]
+        if not cell:
+            del self._cells[key]
+
+def feedback_snapshot_schema():
+    """Arrow schema of the feedback snapshot, the typed columns of feedback_frame"""
+    import pyarrow as pa
+    label = pa.dictionary(pa.int32(), pa.string())
+    # Columns in the order submissions write them
+    return pa.schema(
+        [("id", pa.string()), ("emp_id", pa.string()), ("dept", label), ("timestamp", pa.timestamp("ns")),
+         ("mood", pa.string()), ("mood_score", pa.int8())]
+        + [(score, pa.int8()) for score in SATISFACTION_SCORES]
+        + [("feedback_text", pa.string()), ("emotion", label), ("emotion_confidence", pa.float64()),
+           ("sentiment", label), ("sentiment_confidence", pa.float64()),
+           ("alert_shown", pa.bool_()), ("status", label)]
+    )
+
+def snapshot_pandas_type(arrow_type):
+    """Pandas dtype for a snapshot column that keeps nulls without converting to object"""
+    import pandas as pd
+    import pyarrow as pa
+    if arrow_type == pa.string():
+        return pd.StringDtype("pyarrow")
+    if arrow_type == pa.int8():
+        return pd.Int8Dtype()
+    if arrow_type == pa.bool_():
+        return pd.BooleanDtype()
+    return None
+
+def load_feedback_snapshot(directory, columns=None):
+    """
+    Read a feedback snapshot written by FeedbackSnapshot
+    
+    Each month file is memory-mapped and only the requested columns are
+    touched; strings stay in the mapped Arrow buffers and numbers and
+    timestamps are not copied either, labels become sorted categoricals.
+    
+    Parameters:
+    -----------
+    directory : str
+        Snapshot directory, one <YYYY-MM>.arrow file per month
+    columns : list, optional
+        Columns to load (see feedback_snapshot_schema), all by default
+    
+    Returns:
+    --------
+    pd.DataFrame
+        The snapshot rows, month by month
+    """
+    import pyarrow as pa
+    schema = feedback_snapshot_schema()
+    names = list(columns) if columns is not None else schema.names
+    tables = []
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".arrow"):
+                source = pa.memory_map(os.path.join(directory, name))
+                tables.append(pa.ipc.open_file(source).read_all().select(names))
+    table = pa.concat_tables(tables) if tables else schema.empty_table().select(names)
+    frame = table.to_pandas(types_mapper=snapshot_pandas_type)
+    # Sorted categories, as feedback_frame gives them
+    for column in frame.select_dtypes("category"):
+        frame[column] = frame[column].cat.reorder_categories(sorted(frame[column].cat.categories))
+    return frame
+
+class FeedbackSnapshot:
+    """
+    Columnar copy of the feedback list on local disk, kept in step with it.
+    
+    Feedback is stored as one Arrow IPC file per month, which readers
+    memory-map (see load_feedback_snapshot), so a view or an offline
+    notebook loads only the columns it uses. The JSON files stay the source
+    of truth: like FeedbackRollup, a new feedback list is diffed against the
+    last one and only the months holding replaced or appended records are
+    rewritten. Anything else, including the first list a process sees,
+    rewrites the whole snapshot.
+    """
+    
+    def __init__(self, directory: str):
+        """Keep the snapshot in directory (created if needed)"""
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._records: Optional[List[dict]] = None
+        # month -> feedback id -> record, in list order
+        self._months: Dict[str, Dict[str, dict]] = {}
+        # loaded columns (None for all) -> frame, until the snapshot changes
+        self._frames: Dict[Optional[Tuple[str, ...]], pd.DataFrame] = {}
+        os.makedirs(directory, exist_ok=True)
+    
+    def frame(self, records: List[dict], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The snapshot of records as a DataFrame with the given columns (see load_feedback_snapshot)"""
+        key = tuple(columns) if columns is not None else None
+        with self._lock:
+            self._sync(records)
+            if key not in self._frames:
+                self._frames[key] = load_feedback_snapshot(self.directory, columns)
+            return self._frames[key]
+    
+    def _sync(self, records: List[dict]):
+        """Rewrite the months whose records changed since the last list"""
+        if records is self._records:
+            return
+        
+        changes = diff_records(self._records, records, "id") if self._records is not None else None
+        rebuild = changes is None
+        if rebuild:
+            self._months = {}
+            changes = [(None, record) for record in records]
+        
+        dirty = set()
+        for old, new in changes:
+            key = str(new.get("id"))
+            month = feedback_month(new)
+            if old is not None and feedback_month(old) != month:
+                self._months.get(feedback_month(old), {}).pop(key, None)
+                dirty.add(feedback_month(old))
+            self._months.setdefault(month, {})[key] = new
+            dirty.add(month)
+        
+        if not (rebuild or dirty):
+            self._records = records
+            return
+        
+        # Until every write has succeeded the files are unknown, so a failure rewrites them all next time
+        self._records = None
+        self._frames = {}
+        if rebuild:
+            for name in os.listdir(self.directory):
+                if name.endswith(".arrow") and name[:-len(".arrow")] not in self._months:
+                    os.remove(os.path.join(self.directory, name))
+        for month in dirty:
+            self._write_month(month)
+        self._records = records
+    
+    def _write_month(self, month: str):
+        """Replace one month's file with its current records, atomically"""
+        import pyarrow as pa
+        path = os.path.join(self.directory, f"{month}.arrow")
+        records = list(self._months.get(month, {}).values())
+        if not records:
+            self._months.pop(month, None)
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        
+        # New submissions lack the analysis fields (and alert_shown) until they are set
+        schema = feedback_snapshot_schema()
+        frame = feedback_frame(records).reindex(columns=schema.names)
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        # Dot-prefixed, so dataset readers skip a half-written file
+        temp_path = os.path.join(self.directory, f".{month}.arrow.tmp")
+        with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+        # Readers still mapping the old file keep it until they are done
+        os.replace(temp_path, path)
+
+def try_lock_file(f) -> bool:
+    """
+    Lock an open file exclusively without waiting
+    
+    The lock belongs to the process holding the file open, and the OS drops
+    it when that process exits, however it exits.
+    
+    Returns:
+    --------
+    bool
+        True if the lock was taken, False if someone else holds it
+    """
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+# <data file, "/" as "__">.<owner>.pending.jsonl; spools from before owners have none
+SPOOL_FILE_NAME = re.compile(r"(?P<path>.+?)(?:\.(?P<owner>\d+-[0-9a-f]{8}))?\.pending\.jsonl")
+SPOOL_LOCK_NAME = re.compile(r"(?P<owner>\d+-[0-9a-f]{8})\.lock")
+
+class WriteBehindQueue:
+    """
+    Write-behind queue that coalesces changes to a data file into one commit.
+    
+    Each change is journaled to a local spool file (and fsync'd) before it
+    is acknowledged, then a background thread commits everything pending
+    for a file in a single write every `interval` seconds, or sooner once
+    `max_batch` changes are waiting. Whatever is left is flushed at exit.
+    
+    Every queue journals to spool files of its own, named after its owner
+    ID and guarded by an owner lock file it keeps locked, so processes
+    sharing a spool directory (several servers, the reanalyze command)
+    never touch each other's journal. Spools whose owner's lock can be
+    taken were left behind by a crash and are replayed on startup.
+    """
+    
+    def __init__(self, commit_batch, spool_dir, interval=2.0, max_batch=50):
+        """
+        Parameters:
+        -----------
+        commit_batch : callable
+            commit_batch(path, ops) -> bool, writes the ops in one commit
+        spool_dir : str
+            Directory for the local journal of pending changes
+        interval : float
+            Seconds between background flushes
+        max_batch : int
+            Pending changes that trigger an early flush
+        """
+        self.commit_batch = commit_batch
+        self.spool_dir = spool_dir
+        self.interval = interval
+        self.max_batch = max_batch
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._pending: Dict[str, List[dict]] = {}
+        # Bumped whenever a file's pending changes change, so views can cache their overlay
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        
+        os.makedirs(self.spool_dir, exist_ok=True)
+        # Held until exit: while it is locked, nobody else replays our spools
+        self._owner_lock = open(self._owner_lock_path(self.owner), "a")
+        try_lock_file(self._owner_lock)
+        self._load_spool()
+        
+        self._thread = threading.Thread(target=self._run, name="empathypulse-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def _spool_path(self, path, owner=None):
+        """Local journal file of a data file (this queue's unless another owner is given)"""
+        owner = owner or self.owner
+        return os.path.join(self.spool_dir, f"{path.replace('/', '__')}.{owner}.pending.jsonl")
+    
+    def _owner_lock_path(self, owner):
+        """Lock file guarding an owner's spools ("unowned" for spools from before owners)"""
+        return os.path.join(self.spool_dir, f"{owner or 'unowned'}.lock")
+    
+    def _load_spool(self):
+        """
+        Take over the changes other queues spooled but never committed
+        
+        Only spools whose owner lock can be taken are read, i.e. those of
+        processes that are gone. Their changes are journaled into this
+        queue's spool before the old files are removed, so a crash halfway
+        leaves them in at least one of the two (a replayed append whose id
+        is already stored is skipped).
+        """
+        owners = set()
+        for name in os.listdir(self.spool_dir):
+            match = SPOOL_FILE_NAME.fullmatch(name) or SPOOL_LOCK_NAME.fullmatch(name)
+            if match and match["owner"] != self.owner:
+                owners.add(match["owner"])
+        
+        for owner in owners:
+            lock_path = self._owner_lock_path(owner)
+            with open(lock_path, "a") as lock:
+                if not try_lock_file(lock):
+                    continue  # its process is still running
+                
+                # Listed again under the lock, another process may have taken some over already
+                for name in os.listdir(self.spool_dir):
+                    match = SPOOL_FILE_NAME.fullmatch(name)
+                    if not match or match["owner"] != owner:
+                        continue
+                    spool_path = os.path.join(self.spool_dir, name)
+                    with open(spool_path, encoding="utf-8") as f:
+                        ops = [json.loads(line) for line in f if line.strip()]
+                    if ops:
+                        path = match["path"].replace("__", "/")
+                        self._journal(path, ops)
+                        self._pending.setdefault(path, []).extend(ops)
+                        self._versions[path] = self._versions.get(path, 0) + 1
+                        logger.info("Recovered %d queued changes for %s", len(ops), path)
+                    os.remove(spool_path)
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass  # already gone, or just reopened by another process
+    
+    def _journal(self, path, ops):
+        """Append ops to this queue's spool for a data file and sync them to disk"""
+        with open(self._spool_path(path), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(op) + "\n" for op in ops)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def enqueue(self, path, op):
+        """Durably queue one change; returns once it is on local disk"""
+        with self._lock:
+            self._journal(path, [op])
+            self._pending.setdefault(path, []).append(op)
+            self._versions[path] = self._versions.get(path, 0) + 1
+            pending_count = len(self._pending[path])
+        
+        if pending_count >= self.max_batch:
+            self._wakeup.set()
+    
+    def pending(self, path):
+        """Changes queued for a file that are not committed yet"""
+        with self._lock:
+            return list(self._pending.get(path, []))
+    
+    def pending_with_version(self, path):
+        """
+        Changes queued for a file together with the version of that list
+        
+        Returns:
+        --------
+        tuple
+            (version, ops); the version changes whenever the pending ops do
+        """
+        with self._lock:
+            return self._versions.get(path, 0), list(self._pending.get(path, []))
+    
+    def flush(self, path=None):
+        """
+        Commit everything queued (for one file, or all of them)
+        
+        Returns:
+        --------
+        bool
+            True if nothing is left pending for the flushed files
+        """
+        with self._flush_lock:
+            with self._lock:
+                paths = [path] if path is not None else list(self._pending)
+            
+            all_flushed = True
+            for file_path in paths:
+                ops = self.pending(file_path)
+                if not ops:
+                    continue
+                
+                if not self.commit_batch(file_path, ops):
+                    logger.warning("Flushing %d queued changes to %s failed, keeping them spooled", len(ops), file_path)
+                    all_flushed = False
+                    continue
+                
+                # Drop what was committed, keep anything queued in the meantime
+                with self._lock:
+                    remaining = self._pending.get(file_path, [])[len(ops):]
+                    self._pending[file_path] = remaining
+                    self._versions[file_path] = self._versions.get(file_path, 0) + 1
+                    with open(self._spool_path(file_path), "w", encoding="utf-8") as f:
+                        f.writelines(json.dumps(op) + "\n" for op in remaining)
+                        f.flush()
+                        os.fsync(f.fileno())
+            
+            return all_flushed
+    
+    def close(self):
+        """Flush at exit and, once nothing is left pending, remove this queue's spool files"""
+        if not self.flush():
+            return  # the spool stays for the next process to replay
+        with self._lock:
+            if any(self._pending.values()):
+                return  # queued after the flush
+            for path in self._pending:
+                try:
+                    os.remove(self._spool_path(path))
+                except FileNotFoundError:
+                    pass
+            self._owner_lock.close()
+            try:
+                os.remove(self._owner_lock_path(self.owner))
+            except OSError:
+                pass
+    
+    def _run(self):
+        """Background loop flushing on the interval or when a batch fills up"""
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+
+@st.cache_resource
+def get_write_behind_queue(_store) -> WriteBehindQueue:
+    """Get the process-wide write-behind queue, committing through the given store"""
+    return WriteBehindQueue(
+        _store._commit_queued_ops,
+        spool_dir=st.secrets.get("write_behind_spool_dir", ".empathypulse_spool"),
+        interval=float(st.secrets.get("write_behind_interval", 2)),
+        max_batch=int(st.secrets.get("write_behind_max_batch", 50))
+    )
+
+# Storage backend interface
+class DataStoreBackend(Protocol):
+    """
+    Operations every storage backend provides to the app.
+    
+    Records are plain dicts shaped like the JSON files in data/. Callers
+    must treat returned records as read-only; write methods return True on
+    success and False otherwise.
+    """
+    
+    def get_employees(self) -> List[dict]: ...
+    def get_employee(self, emp_id: str) -> Optional[dict]: ...
+    def add_employee(self, employee_data: dict) -> bool: ...
+    def update_employee(self, emp_id: str, updated_data: dict) -> bool: ...
+    def delete_employee(self, emp_id: str) -> bool: ...
+    def search_employees(self, query: str = "", dept: Optional[str] = None, offset: int = 0,
+                         limit: Optional[int] = None) -> Tuple[int, List[dict]]: ...
+    def get_employee_departments(self) -> List[str]: ...
+    
+    def get_admins(self) -> List[dict]: ...
+    def get_admin(self, admin_id: str) -> Optional[dict]: ...
+    def add_admin(self, admin_data: dict) -> bool: ...
+    
+    def get_feedback(self, start_date: Optional[datetime.date] = None,
+                     end_date: Optional[datetime.date] = None) -> List[dict]: ...
+    def get_feedback_for_employee(self, emp_id: str) -> List[dict]: ...
+    def get_feedback_for_department(self, dept: str) -> List[dict]: ...
+    def get_employee_feedback_summary(self, emp_ids: Optional[List[str]] = None) -> pd.DataFrame: ...
+    def get_daily_feedback_rollup(self) -> pd.DataFrame: ...
+    def get_feedback_frame(self, columns: Optional[List[str]] = None, start_date: Optional[datetime.date] = None,
+                           end_date: Optional[datetime.date] = None) -> pd.DataFrame: ...
+    def get_feedback_date_bounds(self) -> Tuple[Optional[datetime.date], Optional[datetime.date]]: ...
+    def add_feedback(self, feedback_data: dict) -> bool: ...
+    def update_feedback(self, feedback_id: str, updated_data: dict) -> bool: ...
+    def update_feedback_bulk(self, updates: Dict[str, dict]) -> bool: ...
+    def claim_feedback_analysis(self, feedback_ids: List[str], owner: str,
+                                lease: datetime.timedelta) -> List[str]: ...
+    
+    def get_password_resets(self) -> List[dict]: ...
+    def add_password_reset(self, reset_data: dict) -> bool: ...
+    def update_password_reset(self, token: str, updated_data: dict) -> bool: ...
+    def get_password_reset_by_token(self, token: str) -> Optional[dict]: ...
+    
+    def get_cache_stats(self) -> Dict[str, int]: ...
+
+# GitHub API Integration
+class GitHubDataStore:
+    """Class to handle data storage in GitHub repository"""
+    
+    def __init__(self):
+        """Initialize GitHub data store with API token and repo details"""
+        # Get GitHub credentials from Streamlit secrets
+        self.token = st.secrets.get("github_token", "")
+        self.repo_owner = st.secrets.get("github_username", "")
+        self.repo_name = st.secrets.get("github_repo", "")
+        
+        # Base API URL
+        self.base_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}"
+        
+        # Define data file paths
+        self.employees_file = "data/employees.json"
+        self.admins_file = "data/admins.json"
+        self.feedback_file = "data/feedback.json"
+        self.password_reset_file = "data/password_reset.json"
+        self.analysis_claims_file = "data/analysis_claims.json"
+        
+        # "json" keeps feedback in one array, "jsonl" in an append-only log,
+        # "monthly" in one array per month
+        self.feedback_format = st.secrets.get("feedback_format", "json")
+        self.feedback_shard_dir = "data/feedback"
+        self.feedback_base_file = "data/feedback.jsonl"
+        self.feedback_log_dir = "data/feedback_log"
+        self.feedback_compact_threshold = int(st.secrets.get("feedback_compact_threshold", 50))
+        
+        # Parsed files are cached once per process, not once per session
+        self.cache = get_shared_data_cache()
+        
+        # Columnar copy of the feedback for analytics ("" turns it off)
+        snapshot_dir = st.secrets.get("feedback_snapshot_dir", ".empathypulse_snapshot")
+        self.feedback_snapshot = FeedbackSnapshot(snapshot_dir) if snapshot_dir else None
+        
+        # One pool of keep-alive connections to the API for all sessions and threads
+        self.http = requests.Session()
+        self.http.mount("https://", requests.adapters.HTTPAdapter(
+            pool_maxsize=int(st.secrets.get("github_pool_size", 16))
+        ))
+        
+        # Feedback writes are acknowledged once spooled locally and committed in batches
+        self.write_queue = get_write_behind_queue(self) if st.secrets.get("write_behind", True) else None
+        
+        # Initialize data if not exists
+        self._ensure_data_files_exist()
+    
+    def _get_headers(self):
+        """Get headers for GitHub API requests"""
+        return {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+    
+    def _conditional_get(self, path, entry):
+        """
+        GET a file, revalidating against the cached copy when there is one
+
+        When the cached entry carries an ETag the request is sent with
+        If-None-Match, so an unchanged file comes back as an empty 304
+        (which GitHub does not count against the rate limit).
+        """
+        url = f"{self.base_url}/contents/{path}"
+        headers = self._get_headers()
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+            self.cache.record("revalidations")
+        return self.http.get(url, headers=headers)
+    
+    def _ensure_data_files_exist(self):
+        """
+        Initialize data files if they don't exist in the repository
+        
+        The files are checked concurrently, and not at all when the shared
+        cache already holds them: an earlier store in this process has then
+        fetched (or created) them.
+        """
+        paths = [self.employees_file, self.admins_file, self.password_reset_file, self.analysis_claims_file]
+        if self.feedback_format == "json":
+            paths.append(self.feedback_file)
+        checks = [lambda path=path: self._ensure_json_file(path) for path in paths]
+        if self.feedback_format == "jsonl":
+            checks.append(self._ensure_feedback_log)
+        if self.feedback_format == "monthly":
+            checks.append(self._ensure_feedback_shards)
+        
+        with ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="empathypulse-init") as pool:
+            for future in [pool.submit(check) for check in checks]:
+                future.result()
+    
+    def _ensure_json_file(self, path):
+        """Create a JSON data file holding an empty array if it doesn't exist"""
+        if self.cache.get(path) is not None:
+            return
+        try:
+            # Try to get file content
+            self._get_file_content(path)
+        except Exception:
+            # File doesn't exist, create it
+            self._create_file(path, json.dumps([]), "Initialize data file")
+    
+    def _ensure_feedback_log(self):
+        """Create the feedback log base file, seeded from feedback.json, if it doesn't exist"""
+        if self.cache.get(self.feedback_base_file) is not None:
+            return
+        try:
+            self._get_file_content(self.feedback_base_file, parse=parse_feedback_base)
+        except Exception:
+            # Start the log from the existing feedback.json, if there is one
+            try:
+                records = self._get_file_content(self.feedback_file)
+            except Exception:
+                records = []
+            self._create_file(
+                self.feedback_base_file,
+                serialize_feedback_base(records, []),
+                "Initialize feedback log",
+                parse=parse_feedback_base
+            )
+    
+    def _ensure_feedback_shards(self):
+        """Split an existing feedback.json into monthly shards if there are no shards yet"""
+        if self.cache.get(self.feedback_shard_dir) is not None or self._list_feedback_shards():
+            return
+        try:
+            records = self._get_file_content(self.feedback_file)
+        except Exception:
+            records = []
+        if records:
+            self._write_feedback_shards(
+                [{"op": "append", "record": record} for record in records],
+                "Split feedback into monthly shards"
+            )
+    
+    def _cached_get(self, path, decode, allow_missing=False):
+        """
+        Read a repository path through the shared cache
+        
+        Fresh entries are served without any request. Stale ones are
+        revalidated by one session at a time with a conditional GET; only a
+        changed path is decoded again.
+        
+        Parameters:
+        -----------
+        path : str
+            Path in the repository
+        decode : callable
+            decode(response, entry) -> (content, sha) for a 200 (or
+            allowed 404) response
+        allow_missing : bool
+            Decode a 404 instead of raising
+        """
+        # Serve straight from the shared cache while the entry is fresh
+        entry = self.cache.get(path)
+        if self.cache.is_fresh(entry):
+            self.cache.record("hits")
+            return entry["content"]
+        
+        # Only one session refreshes a given file at a time, the others
+        # wait and then read the entry it stored
+        with self.cache.path_lock(path):
+            entry = self.cache.get(path)
+            if self.cache.is_fresh(entry):
+                self.cache.record("hits")
+                return entry["content"]
+            
+            # Make API request
+            response = self._conditional_get(path, entry)
+            
+            # Not modified since we cached it
+            if response.status_code == 304 and entry is not None:
+                self.cache.record("not_modified")
+                self.cache.touch(path)
+                return entry["content"]
+            
+            if response.status_code != 200 and not (allow_missing and response.status_code == 404):
+                raise Exception(f"Failed to get file content: {response.json().get('message', 'Unknown error')}")
+            
+            self.cache.record("misses")
+            content, sha = decode(response, entry)
+            
+            # Cache content together with its SHA for future updates
+            self.cache.put(path, content, sha, response.headers.get("ETag"))
+            
+            return content
+    
+    def _get_file_content(self, path, parse=json.loads):
+        """
+        Get file content from GitHub repository
+        
+        Parameters:
+        -----------
+        path : str
+            Path to the file in the repository
+        parse : callable
+            Turns the decoded text into the cached content
+            
+        Returns:
+        --------
+        dict or list
+            Parsed JSON content of the file
+        """
+        def decode(response, entry):
+            content_data = response.json()
+            
+            # Same blob as the cached one, keep the already parsed content
+            if entry is not None and entry["sha"] == content_data["sha"]:
+                return entry["content"], entry["sha"]
+            
+            # Decode content
+            content = base64.b64decode(content_data["content"]).decode("utf-8")
+            return parse(content), content_data["sha"]
+        
+        return self._cached_get(path, decode)
+    
+    def _list_directory(self, path):
+        """List the files in a repository directory as {"name", "sha"} dicts (empty if missing)"""
+        def decode(response, entry):
+            if response.status_code == 404:
+                return [], None
+            listing = [
+                {"name": item["name"], "sha": item["sha"]}
+                for item in response.json() if item.get("type") == "file"
+            ]
+            return listing, None
+        
+        return self._cached_get(path, decode, allow_missing=True)
+    
+    def _update_file(self, path, content, sha, commit_message):
+        """
+        PUT new content for a file on top of the given blob SHA (None creates it)
+        
+        Returns:
+        --------
+        requests.Response
+            The GitHub API response (409/422 when the SHA is stale)
+        """
+        url = f"{self.base_url}/contents/{path}"
+        payload = {
+            "message": commit_message,
+            "content": base64.b64encode(content.encode()).decode()
+        }
+        if sha:
+            payload["sha"] = sha
+        return self.http.put(url, headers=self._get_headers(), json=payload)
+    
+    def _delete_file(self, path, sha, commit_message):
+        """DELETE a file at the given blob SHA, returning the API response"""
+        url = f"{self.base_url}/contents/{path}"
+        payload = {"message": commit_message, "sha": sha}
+        return self.http.delete(url, headers=self._get_headers(), json=payload)
+    
+    def _modify_file(self, path, mutate, commit_message, max_attempts=3):
+        """
+        Optimistically read-modify-write a data file
+        
+        The change is applied to the cached content and written with the
+        cached SHA, so the common case costs a single PUT. Only when GitHub
+        rejects the SHA as stale (409/422) is the file revalidated and the
+        change re-applied on top of the latest content.
+        
+        Parameters:
+        -----------
+        path : str
+            Path to the file in the repository
+        mutate : callable
+            Takes the current list and returns the new list, or None to
+            abort the write (e.g. the record to update does not exist)
+        commit_message : str
+            Commit message for the update
+        max_attempts : int
+            How many times to retry after a stale SHA
+            
+        Returns:
+        --------
+        bool
+            True if the update was successful, False otherwise
+        """
+        # Serialize writers inside this process so they don't race each other's SHA
+        with self.cache.write_lock(path):
+            revalidated = False
+            response = None
+            for _ in range(max_attempts):
+                try:
+                    self._get_file_content(path)
+                except Exception as e:
+                    st.error(f"Failed to read {path} before updating: {e}")
+                    return False
+
+                # Content and SHA come from one entry: a reader may replace the
+                # entry at any time, and pairing old content with a newer SHA
+                # would overwrite the commit behind that SHA
+                entry = self.cache.get(path)
+                if entry is None:
+                    continue
+                current, sha = entry["content"], entry["sha"]
+
+                updated = mutate(list(current))
+                if updated is None:
+                    # The record may only exist in a newer version than the cached one
+                    if revalidated:
+                        return False
+                    revalidated = True
+                    self.cache.expire(path)
+                    continue
+                
+                response = self._update_file(path, json.dumps(updated), sha, commit_message)
+                if response.status_code in [200, 201]:
+                    # The written data replaces the shared cache entry, so other
+                    # sessions see the change without fetching the file again
+                    self.cache.put(path, updated, response.json()["content"]["sha"])
+                    return True
+                
+                if response.status_code not in [409, 422]:
+                    break
+                
+                # Someone else committed first, revalidate and merge our change again
+                revalidated = True
+                self.cache.expire(path)
+            
+            # Whatever we have cached may be stale now
+            self.cache.expire(path)
+            message = response.json().get('message', 'Unknown error') if response is not None else "the file could not be read"
+            st.error(f"Failed to update file: {message}")
+            return False
+    
+    def _commit_queued_ops(self, path, ops):
+        """Commit a batch of queued feedback changes as a single write"""
+        added = sum(1 for op in ops if op["op"] == "append")
+        updated = len(ops) - added
+        return self._write_feedback_ops(ops, f"Add {added} feedback, update {updated} feedback")
+    
+    def _write_feedback_ops(self, ops, commit_message):
+        """Commit feedback ops in the layout selected by feedback_format"""
+        if self.feedback_format == "jsonl":
+            return self._append_feedback_segment(ops, commit_message)
+        if self.feedback_format == "monthly":
+            return self._write_feedback_shards(ops, commit_message)
+        return self._modify_file(
+            self.feedback_file,
+            lambda feedback_list: apply_feedback_ops(feedback_list, ops),
+            commit_message
+        )
+    
+    @staticmethod
+    def _patch_record(items, match, updated_data):
+        """Return a copy of items with the first record matching `match` updated, or None"""
+        for i, item in enumerate(items):
+            if match(item):
+                return items[:i] + [{**item, **updated_data}] + items[i + 1:]
+        return None
+    
+    def _create_file(self, path, content, commit_message, parse=json.loads):
+        """
+        Create new file in GitHub repository
+        
+        Parameters:
+        -----------
+        path : str
+            Path to the file in the repository
+        content : str
+            Content of the file
+        commit_message : str
+            Commit message for the creation
+        parse : callable
+            Turns the content into what is cached for the file
+            
+        Returns:
+        --------
+        bool
+            True if creation was successful, False otherwise
+        """
+        # Make API request to create
+        response = self._update_file(path, content, None, commit_message)
+        
+        if response.status_code not in [200, 201]:
+            st.error(f"Failed to create file: {response.json().get('message', 'Unknown error')}")
+            return False
+        
+        # Update SHA and cache
+        self.cache.put(path, parse(content), response.json()["content"]["sha"])
+        return True
+    
+    def get_cache_stats(self):
+        """Get hit/miss/revalidation counters of the shared data cache"""
+        return self.cache.stats()
+    
+    # Employee operations
+    def get_employees(self):
+        """Get all employees from GitHub"""
+        try:
+            return self._get_file_content(self.employees_file)
+        except Exception as e:
+            st.error(f"Error getting employees: {e}")
+            return []
+    
+    def get_employee(self,emp_id: str) -> Optional[dict]:
+        employees = self._get_file_content(self.employees_file)
+        return self.cache.index("employees", "emp_id").get(employees, emp_id)
+    
+    def add_employee(self, employee_data):
+        """Add new employee to GitHub"""
+        # Generate a unique ID if not provided
+        if not employee_data.get("emp_id"):
+            employee_data["emp_id"] = str(uuid.uuid4())
+        
+        # Add creation timestamp
+        employee_data["created_at"] = datetime.datetime.now().isoformat()
+        
+        return self._modify_file(
+            self.employees_file, 
+            lambda employees: employees + [employee_data], 
+            f"Add employee {employee_data.get('name')}"
+        )
+    
+    def update_employee(self, emp_id, updated_data):
+        """Update employee data in GitHub"""
+        employee = self.get_employee(emp_id)
+        if not employee:
+            return False
+        
+        return self._modify_file(
+            self.employees_file,
+            lambda employees: self._patch_record(employees, lambda e: e.get("emp_id") == emp_id, updated_data),
+            f"Update employee {employee.get('name')}"
+        )
+    
+    def delete_employee(self, emp_id):
+        """Delete an employee and all related data from GitHub"""
+        # Remove employee from employees.json
+        emp_update_result = self._modify_file(
+            self.employees_file,
+            lambda employees: [emp for emp in employees if emp.get("emp_id") != emp_id],
+            f"Delete employee {emp_id}"
+        )
+        # Remove all feedback for this employee from feedback.json, after
+        # committing anything still queued so it can't bring it back
+        if self.write_queue:
+            self.write_queue.flush(self.feedback_file)
+        feedback_update_result = self._write_feedback_ops(
+            [{"op": "delete_employee", "emp_id": emp_id}],
+            f"Delete feedback for employee {emp_id}"
+        )
+        return emp_update_result and feedback_update_result
+    
+    def search_employees(self, query="", dept=None, offset=0, limit=None):
+        """Find employees by name or ID through the shared search index (see EmployeeSearchIndex.search)"""
+        return self.cache.search_index("employees").search(self.get_employees(), query, dept, offset, limit)
+    
+    def get_employee_departments(self):
+        """Sorted departments that have employees"""
+        return self.cache.search_index("employees").departments(self.get_employees())
+    
+    # Admin operations
+    def get_admins(self):
+        """Get all admins from GitHub"""
+        try:
+            return self._get_file_content(self.admins_file)
+        except Exception:
+            return []
+    
+    def get_admin(self, admin_id):
+        """Get admin by ID from GitHub"""
+        return self.cache.index("admins", "admin_id").get(self.get_admins(), admin_id)
+    
+    def add_admin(self, admin_data):
+        """Add new admin to GitHub"""
+        # Add creation timestamp
+        admin_data["created_at"] = datetime.datetime.now().isoformat()
+        
+        return self._modify_file(
+            self.admins_file,
+            lambda admins: admins + [admin_data],
+            f"Add admin {admin_data.get('admin_id')}"
+        )
+    
+    # Feedback log operations
+    def _fetch_feedback_segment(self, name):
+        """Download and parse one log segment (they never change, so no caching headers)"""
+        url = f"{self.base_url}/contents/{self.feedback_log_dir}/{name}"
+        response = self.http.get(url, headers=self._get_headers())
+        if response.status_code != 200:
+            return None
+        self.cache.record("misses")
+        return parse_feedback_segment(base64.b64decode(response.json()["content"]).decode("utf-8"))
+    
+    def _get_feedback_log(self):
+        """
+        Materialize feedback from the base segment and the log segments
+        
+        Both the base and the directory listing are revalidated like any
+        other cached file. Log segments are immutable, so each one is
+        downloaded once per process, and while the base is unchanged only
+        segments that appeared since the last call are applied to the
+        cached records.
+        """
+        view_key = f"{self.feedback_log_dir}#view"
+        for _ in range(2):
+            base = self._get_file_content(self.feedback_base_file, parse=parse_feedback_base)
+            base_sha = self.cache.get(self.feedback_base_file)["sha"]
+            folded = set(base["folded"])
+            live = sorted(item["name"] for item in self._list_directory(self.feedback_log_dir) if item["name"] not in folded)
+            
+            with self.cache.path_lock(view_key):
+                view_entry = self.cache.get(view_key)
+                view = view_entry["content"] if view_entry else None
+                segments = dict(view["segments"]) if view else {}
+                
+                # Extend the cached records when the log only grew since last time
+                if view and view["base_sha"] == base_sha and live[:len(view["applied"])] == view["applied"]:
+                    records, applied = view["records"], view["applied"]
+                    if len(applied) == len(live):
+                        return records
+                else:
+                    records, applied = base["records"], []
+                
+                ops = []
+                for name in live[len(applied):]:
+                    if name not in segments:
+                        segments[name] = self._fetch_feedback_segment(name)
+                    if segments[name] is None:
+                        break
+                    ops.extend(segments[name])
+                else:
+                    records = apply_feedback_ops(records, ops)
+                    self.cache.put(view_key, {
+                        "base_sha": base_sha,
+                        "applied": live,
+                        "records": records,
+                        "segments": {name: segments[name] for name in live}
+                    }, base_sha)
+                    return records
+            
+            # A segment vanished, so a compaction ran since we listed the log
+            self._expire_feedback()
+        
+        raise Exception("Feedback log changed while it was being read")
+    
+    def _expire_feedback(self):
+        """Force the next feedback read to revalidate the stored feedback"""
+        if self.feedback_format == "jsonl":
+            self.cache.expire(self.feedback_base_file)
+            self.cache.expire(self.feedback_log_dir)
+        elif self.feedback_format == "monthly":
+            self.cache.expire(self.feedback_shard_dir)
+        else:
+            self.cache.expire(self.feedback_file)
+    
+    def _append_feedback_segment(self, ops, commit_message):
+        """
+        Write ops as a new log segment
+        
+        Creating a new file needs no SHA, so appends never conflict and only
+        send the size of the change, not the size of the feedback history.
+        """
+        name = new_feedback_segment_name()
+        content = "".join(json.dumps(op) + "\n" for op in ops)
+        response = self._update_file(f"{self.feedback_log_dir}/{name}", content, None, commit_message)
+        if response.status_code not in [200, 201]:
+            st.error(f"Failed to append to feedback log: {response.json().get('message', 'Unknown error')}")
+            return False
+        
+        # Write-through: list the new segment and keep its ops, so the next
+        # read in this process applies it without downloading anything
+        listing_entry = self.cache.get(self.feedback_log_dir)
+        if listing_entry is not None:
+            listing = listing_entry["content"] + [{"name": name, "sha": response.json()["content"]["sha"]}]
+            self.cache.put(self.feedback_log_dir, listing, None)
+        view_key = f"{self.feedback_log_dir}#view"
+        with self.cache.path_lock(view_key):
+            view_entry = self.cache.get(view_key)
+            if view_entry is not None:
+                view = view_entry["content"]
+                self.cache.put(view_key, {**view, "segments": {**view["segments"], name: ops}}, view_entry["sha"])
+        
+        self._maybe_compact_feedback_log()
+        return True
+    
+    def _maybe_compact_feedback_log(self):
+        """Start a background compaction once enough log segments have piled up"""
+        listing_entry = self.cache.get(self.feedback_log_dir)
+        if listing_entry is None or len(listing_entry["content"]) < self.feedback_compact_threshold:
+            return
+        threading.Thread(target=self.compact_feedback_log, name="empathypulse-compaction", daemon=True).start()
+    
+    def compact_feedback_log(self):
+        """
+        Fold the log segments into a new base segment and delete them
+        
+        The new base is written with the SHA of the old one, so of two
+        concurrent compactions only one wins. Segments it folded but could
+        not delete stay listed in the header and are folded again next time.
+        
+        Returns:
+        --------
+        bool
+            True if the log was compacted (or was already empty)
+        """
+        lock = self.cache.write_lock(self.feedback_base_file)
+        if not lock.acquire(blocking=False):
+            return False  # another session is already compacting
+        try:
+            self._expire_feedback()
+            records = self._get_feedback_log()
+            base_entry = self.cache.get(self.feedback_base_file)
+            listed = {item["name"]: item["sha"] for item in self.cache.get(self.feedback_log_dir)["content"]}
+            if not listed:
+                return True
+            
+            applied = self.cache.get(f"{self.feedback_log_dir}#view")["content"]["applied"]
+            folded = [name for name in base_entry["content"]["folded"] if name in listed] + applied
+            response = self._update_file(
+                self.feedback_base_file,
+                serialize_feedback_base(records, folded),
+                base_entry["sha"],
+                f"Compact feedback log ({len(applied)} segments)"
+            )
+            if response.status_code not in [200, 201]:
+                self._expire_feedback()
+                logger.warning("Feedback log compaction failed: %s", response.json().get("message", "Unknown error"))
+                return False
+            
+            new_sha = response.json()["content"]["sha"]
+            self.cache.put(self.feedback_base_file, {"folded": folded, "records": records}, new_sha)
+            
+            for name in folded:
+                self._delete_file(f"{self.feedback_log_dir}/{name}", listed[name], "Remove compacted feedback segment")
+            self.cache.expire(self.feedback_log_dir)
+            return True
+        finally:
+            lock.release()
+    
+    # Monthly feedback shard operations
+    def _feedback_shard_path(self, month):
+        """Repository path of the shard holding one month of feedback"""
+        return f"{self.feedback_shard_dir}/{month}.json"
+    
+    def _list_feedback_shards(self):
+        """Map every existing shard month ("YYYY-MM") to its blob SHA"""
+        return {
+            item["name"][:-len(".json")]: item["sha"]
+            for item in self._list_directory(self.feedback_shard_dir)
+            if item["name"].endswith(".json")
+        }
+    
+    def _get_feedback_shard(self, month, sha):
+        """
+        Get one monthly shard
+        
+        The directory listing (revalidated like any cached file) carries
+        every shard's blob SHA, so a cached shard with the listed SHA is used
+        without any request. Past months rarely change and in practice stay
+        cached for the life of the process.
+        """
+        path = self._feedback_shard_path(month)
+        entry = self.cache.get(path)
+        if entry is not None and entry["sha"] == sha:
+            self.cache.record("hits")
+            return entry["content"]
+        self.cache.expire(path)
+        return self._get_file_content(path)
+    
+    def _get_feedback_shards(self, start_date=None, end_date=None):
+        """Load only the shards overlapping the date range, oldest month first"""
+        first_month = start_date.strftime("%Y-%m") if start_date else None
+        last_month = end_date.strftime("%Y-%m") if end_date else None
+        shards = [
+            (month, sha) for month, sha in sorted(self._list_feedback_shards().items())
+            if not ((first_month and month < first_month) or (last_month and month > last_month))
+        ]
+        
+        # Keep the records of the selected shards as one list while none of
+        # them changes, so callers (and the feedback index) see the same list
+        # every time; the full history and the last range read each have one
+        view_key = f"{self.feedback_shard_dir}#{'range' if first_month or last_month else 'view'}"
+        view = self.cache.get(view_key)
+        if view is not None and view["content"]["shards"] == shards:
+            return view["content"]["records"]
+        
+        feedback_list = []
+        for month, sha in shards:
+            feedback_list.extend(self._get_feedback_shard(month, sha))
+        
+        self.cache.put(view_key, {"shards": shards, "records": feedback_list}, None)
+        return feedback_list
+    
+    def _write_feedback_shards(self, ops, commit_message):
+        """
+        Apply ops to the monthly shards they touch, one write per shard
+        
+        Feedback without a usable timestamp goes to the "undated" shard.
+        Updates of records that are in no shard (e.g. deleted with their
+        employee since) are logged and dropped, as the other formats skip them.
+        """
+        shards = self._list_feedback_shards()
+        ops_by_month = {}
+        missing = []
+        appended = {}
+        for op in ops:
+            if op["op"] == "append":
+                months = [feedback_month(op["record"])]
+                appended[str(op["record"].get("id"))] = months[0]
+            elif op["op"] == "update" and str(op["id"]) in appended:
+                months = [appended[str(op["id"])]]
+            elif op["op"] == "update":
+                month = self._find_feedback_month(op["id"], shards, op.get("month"))
+                if month is None:
+                    # The record may be in a shard written since the directory was listed
+                    self.cache.expire(self.feedback_shard_dir)
+                    shards = self._list_feedback_shards()
+                    month = self._find_feedback_month(op["id"], shards)
+                if month is None:
+                    missing.append(str(op["id"]))
+                months = [month] if month is not None else []
+            else:
+                # Deleting an employee touches every shard holding their feedback
+                months = [
+                    month for month, sha in shards.items()
+                    if any(f.get("emp_id") == op["emp_id"] for f in self._get_feedback_shard(month, sha))
+                ]
+            for month in months:
+                ops_by_month.setdefault(month, []).append(op)
+        
+        if missing:
+            logger.warning("Dropped updates of %d feedback records found in no monthly shard: %s",
+                           len(missing), ", ".join(missing))
+        
+        all_written = True
+        for month, month_ops in sorted(ops_by_month.items()):
+            path = self._feedback_shard_path(month)
+            mutate = lambda feedback_list, month_ops=month_ops: apply_feedback_ops(feedback_list, month_ops)
+            if month in shards:
+                written = self._modify_file(path, mutate, commit_message)
+            else:
+                written = self._create_file(path, json.dumps(mutate([])), commit_message)
+                if not written:
+                    # Someone else started this month first
+                    self.cache.expire(self.feedback_shard_dir)
+                    written = self._modify_file(path, mutate, commit_message)
+            
+            if written:
+                self._note_feedback_shard_sha(month)
+            all_written = all_written and written
+        return all_written
+    
+    def _find_feedback_month(self, feedback_id, shards, hint=None):
+        """Find the shard month of a feedback record, checking the hinted month before scanning the others"""
+        months = sorted(shards, key=lambda month: month != hint)
+        for month in months:
+            if any(str(f.get("id")) == str(feedback_id) for f in self._get_feedback_shard(month, shards[month])):
+                return month
+        return None
+    
+    def _note_feedback_shard_sha(self, month):
+        """Write-through: put a shard's new SHA into the cached directory listing"""
+        listing_entry = self.cache.get(self.feedback_shard_dir)
+        shard_entry = self.cache.get(self._feedback_shard_path(month))
+        if listing_entry is None or shard_entry is None:
+            return
+        name = f"{month}.json"
+        listing = [item for item in listing_entry["content"] if item["name"] != name]
+        listing.append({"name": name, "sha": shard_entry["sha"]})
+        self.cache.put(self.feedback_shard_dir, listing, None, listing_entry["etag"])
+    
+    # Feedback operations
+    def get_feedback(self, start_date=None, end_date=None):
+        """
+        Get feedback from GitHub, including changes still queued for commit
+        
+        Parameters:
+        -----------
+        start_date, end_date : datetime.date, optional
+            Only return feedback submitted in this (inclusive) range. With
+            monthly shards only the months in the range are loaded.
+        """
+        try:
+            if self.feedback_format == "jsonl":
+                feedback_list = self._get_feedback_log()
+            elif self.feedback_format == "monthly":
+                feedback_list = self._get_feedback_shards(start_date, end_date)
+            else:
+                feedback_list = self._get_file_content(self.feedback_file)
+        except Exception:
+            feedback_list = []
+        
+        version, pending = self.write_queue.pending_with_version(self.feedback_file) if self.write_queue else (0, [])
+        if pending:
+            # Cached per base list and queue version, so reruns don't redo the overlay and
+            # the indexes diffing the result see the same list. Ranged reads of monthly
+            # shards have a base list of their own and a slot of their own.
+            if self.feedback_format == "monthly" and (start_date or end_date):
+                name, version = "feedback_with_pending_in_range", (version, start_date, end_date)
+            else:
+                name = "feedback_with_pending"
+            feedback_list = self.cache.derived(
+                name, feedback_list, lambda base: apply_feedback_ops(base, pending), version
+            )
+        if start_date or end_date:
+            feedback_list = self.cache.derived(
+                "feedback_in_range", feedback_list,
+                lambda records: filter_feedback_by_date(records, start_date, end_date), (start_date, end_date)
+            )
+        return feedback_list
+    
+    def get_feedback_date_bounds(self):
+        """
+        Get the dates of the oldest and newest feedback, or (None, None)
+        
+        With monthly shards only the oldest and the newest shard holding
+        feedback are read; shards left empty (e.g. by deleting an employee)
+        are skipped.
+        """
+        if self.feedback_format == "monthly" and not (self.write_queue and self.write_queue.pending(self.feedback_file)):
+            shards = sorted(item for item in self._list_feedback_shards().items() if item[0] != "undated")
+            def dated(shard_order):
+                """Timestamps of the first shard in shard_order that has any"""
+                for month, sha in shard_order:
+                    timestamps = [f["timestamp"] for f in self._get_feedback_shard(month, sha) if f.get("timestamp")]
+                    if timestamps:
+                        return timestamps
+                return []
+            timestamps = dated(shards) + dated(reversed(shards))
+        else:
+            timestamps = [f.get("timestamp", "") for f in self.get_feedback() if f.get("timestamp")]
+        if not timestamps:
+            return None, None
+        return (datetime.date.fromisoformat(min(timestamps)[:10]),
+                datetime.date.fromisoformat(max(timestamps)[:10]))
+    
+    def add_feedback(self, feedback_data):
+        """Add new feedback to GitHub"""
+        # Generate a unique ID if not provided
+        if not feedback_data.get("id"):
+            feedback_data["id"] = str(uuid.uuid4())
+        
+        # Add timestamp and default status
+        if not feedback_data.get("timestamp"):
+            feedback_data["timestamp"] = datetime.datetime.now().isoformat()
+        if not feedback_data.get("status"):
+            feedback_data["status"] = "pending"  # Default status
+        
+        op = {"op": "append", "record": feedback_data}
+        if self.write_queue:
+            self.write_queue.enqueue(self.feedback_file, op)
+            return True
+        
+        return self._write_feedback_ops([op], f"Add feedback from {feedback_data.get('emp_id')}")
+    
+    def update_feedback(self, feedback_id, updated_data):
+        """Update feedback in GitHub"""
+        feedback = self._find_feedback(feedback_id)
+        if feedback is None:
+            # It may only exist in a newer version than the cached one
+            self._expire_feedback()
+            feedback = self._find_feedback(feedback_id)
+        if feedback is None:
+            return False
+        
+        # The month tells a sharded store which shard to rewrite
+        op = {"op": "update", "id": feedback_id, "changes": updated_data, "month": feedback_month(feedback)}
+        if self.write_queue:
+            self.write_queue.enqueue(self.feedback_file, op)
+            return True
+        return self._write_feedback_ops([op], f"Update feedback {feedback_id}")
+    
+    def update_feedback_bulk(self, updates):
+        """
+        Update many feedback records in one commit (one per shard with monthly shards)
+        
+        Parameters:
+        -----------
+        updates : dict
+            Feedback ID -> fields to change; IDs that no longer exist are skipped
+        """
+        # Queued changes go first, so the records they add can be updated
+        if self.write_queue:
+            self.write_queue.flush(self.feedback_file)
+        
+        ops = []
+        for feedback_id, updated_data in updates.items():
+            feedback = self._find_feedback(feedback_id)
+            if feedback is not None:
+                ops.append({"op": "update", "id": feedback_id, "changes": updated_data, "month": feedback_month(feedback)})
+        if not ops:
+            return True
+        return self._write_feedback_ops(ops, f"Update {len(ops)} feedback")
+    
+    def claim_feedback_analysis(self, feedback_ids, owner, lease):
+        """
+        Claim the analysis of feedback records for one lease
+        
+        Claims live in their own small file, written with the usual SHA
+        check, so of several processes claiming the same record only the
+        first commit wins; the others re-read the file and find it taken.
+        
+        Parameters:
+        -----------
+        feedback_ids : list
+            IDs of the records to claim
+        owner : str
+            ID of the claiming process
+        lease : datetime.timedelta
+            How long a claim holds before others may take the record over
+            
+        Returns:
+        --------
+        list
+            The IDs this call claimed
+        """
+        now = datetime.datetime.now()
+        wanted = [str(feedback_id) for feedback_id in feedback_ids]
+        claimed = []
+        
+        def claim(claims):
+            # Expired claims are dropped, so the file only holds analyses in flight
+            live = [c for c in claims if c.get("claimed_at", "") >= (now - lease).isoformat()]
+            taken = {str(c.get("id")) for c in live}
+            claimed[:] = [feedback_id for feedback_id in wanted if feedback_id not in taken]
+            if not claimed:
+                return None
+            return live + [{"id": feedback_id, "owner": owner, "claimed_at": now.isoformat()} for feedback_id in claimed]
+        
+        if not self._modify_file(self.analysis_claims_file, claim, f"Claim analysis of {len(wanted)} feedback"):
+            return []
+        return claimed
+    
+    def _feedback_index(self):
+        """Index of feedback by id, emp_id and dept"""
+        return self.cache.index("feedback", "id", ("emp_id", "dept"))
+    
+    def _find_feedback(self, feedback_id):
+        """Get a feedback record by ID, or None"""
+        return self._feedback_index().get(self.get_feedback(), feedback_id)
+    
+    def get_feedback_for_employee(self, emp_id):
+        """Get all feedback submitted by one employee"""
+        return self._feedback_index().group(self.get_feedback(), "emp_id", emp_id)
+    
+    def get_feedback_for_department(self, dept):
+        """Get all feedback from one department"""
+        return self._feedback_index().group(self.get_feedback(), "dept", dept)
+    
+    def get_employee_feedback_summary(self, emp_ids=None):
+        """
+        Per-employee feedback counts and sentiment tallies
+        
+        For all employees the summary is recomputed only when feedback
+        changes; for a few emp_ids it is computed from their indexed feedback.
+        """
+        if emp_ids is not None:
+            return summarize_feedback_by_employee(
+                [feedback for emp_id in emp_ids for feedback in self.get_feedback_for_employee(emp_id)]
+            )
+        return self.cache.derived("employee_feedback_summary", self.get_feedback(), summarize_feedback_by_employee)
+    
+    def get_daily_feedback_rollup(self):
+        """Per-day, per-department feedback totals (see FeedbackRollup), updated by the records each write changed"""
+        return self.cache.rollup("feedback_daily").frame(self.get_feedback())
+
+    def get_feedback_frame(self, columns=None, start_date=None, end_date=None):
+        """
+        All feedback as a typed DataFrame, shared read-only by every view
+
+        It is read from the memory-mapped feedback snapshot, loading only
+        the given columns, and reloaded only when the feedback list is
+        replaced, i.e. when a fetch or write brings a new SHA of the
+        feedback file (or shard). Without a snapshot it is built in memory
+        by feedback_frame.
+        
+        With a date range only the feedback of that range is loaded (with
+        monthly shards, only its months are read) and the frame is built
+        in memory, as the snapshot mirrors the whole history.
+        """
+        if start_date or end_date:
+            frame = self.cache.derived("feedback_frame_in_range", self.get_feedback(start_date, end_date), feedback_frame)
+            return frame if columns is None else frame[list(columns)]
+        
+        feedback = self.get_feedback()
+        if self.feedback_snapshot is not None:
+            import pyarrow as pa
+            try:
+                return self.feedback_snapshot.frame(feedback, columns)
+            except (OSError, pa.ArrowException):
+                # A full disk or a record Arrow can't store; anything else is a bug and propagates
+                logger.exception("Updating the feedback snapshot failed, building the frame in memory")
+        frame = self.cache.derived("feedback_frame", feedback, feedback_frame)
+        return frame if columns is None else frame[list(columns)]
+
+    # Password reset operations
+    def get_password_resets(self):
+        """Get all password reset tokens from GitHub"""
+        try:
+             resets = self._get_file_content(self.password_reset_file)
+             return resets
+        except Exception as e:
+            st.error(f"Error retrieving password resets: {e}")
+            return []
+    
+    def add_password_reset(self, reset_data):
+        """Add new password reset token to GitHub"""
+        # Add timestamps
+        reset_data["created_at"] = datetime.datetime.now().isoformat()
+        if "expires_at" not in reset_data:
+            expires_at = datetime.datetime.now() + datetime.timedelta(hours=1)
+            reset_data["expires_at"] = expires_at.isoformat()
+        
+        return self._modify_file(
+            self.password_reset_file,
+            lambda resets: resets + [reset_data],
+            f"Add password reset for {reset_data.get('emp_id')}"
+        )
+    
+    def update_password_reset(self, token, updated_data):
+        """Update password reset token in GitHub"""
+        return self._modify_file(
+            self.password_reset_file,
+            lambda resets: self._patch_record(resets, lambda r: r.get("token") == token, updated_data),
+            "Update password reset token"
+        )
+    
+    def get_password_reset_by_token(self, token):
+        """Get password reset by token from GitHub"""
+        return self.cache.index("password_resets", "token").get(self.get_password_resets(), token)
+
+# Local SQLite storage
+class SQLiteDataStore:
+    """
+    Class to handle data storage in a local SQLite database
+    
+    Each record is kept as its JSON document next to the columns it is
+    looked up or filtered by, so point lookups and single-record updates
+    are indexed O(log n) operations and the app needs no network at all.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS employees (
+            emp_id TEXT PRIMARY KEY,
+            dept TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS admins (
+            admin_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS feedback (
+            id TEXT PRIMARY KEY,
+            emp_id TEXT,
+            dept TEXT,
+            timestamp TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_feedback_emp_id ON feedback (emp_id);
+        CREATE INDEX IF NOT EXISTS idx_feedback_dept ON feedback (dept);
+        CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback (timestamp);
+        CREATE TABLE IF NOT EXISTS feedback_daily (
+            date TEXT NOT NULL,
+            dept TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value NUMERIC NOT NULL,
+            PRIMARY KEY (date, dept, field)
+        );
+        CREATE TABLE IF NOT EXISTS password_resets (
+            token TEXT PRIMARY KEY,
+            emp_id TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS analysis_claims (
+            id TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            claimed_at TEXT NOT NULL
+        );
+    """
+    
+    def __init__(self, db_path="empathypulse.db", seed_dir="data"):
+        """
+        Open (and create if needed) the SQLite database
+        
+        Parameters:
+        -----------
+        db_path : str
+            Path of the database file
+        seed_dir : str
+            Directory with the JSON data files imported into a new database
+            (feedback may be a feedback.jsonl log instead of feedback.json)
+        """
+        self.db_path = db_path
+        is_new = not os.path.exists(db_path)
+        
+        # One connection shared by all sessions, guarded by a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.create_function(
+            "employee_search_match", 3,
+            lambda name, emp_id, query: employee_search_match(*employee_search_terms(name, emp_id), query),
+            deterministic=True
+        )
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(self.SCHEMA)
+            self._backfill_daily_rollup()
+        # (data version, typed frame) cached by get_feedback_frame and get_daily_feedback_rollup
+        self._feedback_frame = None
+        self._feedback_frame_in_range = None
+        self._daily_rollup = None
+        
+        if is_new and seed_dir:
+            self._seed_from_json(seed_dir)
+    
+    def _seed_from_json(self, seed_dir):
+        """Import employees, admins, feedback and password resets from JSON files"""
+        loaders = [
+            ("employees.json", self._insert_employee),
+            ("admins.json", self._insert_admin),
+            ("feedback.json", self._insert_feedback),
+            ("password_reset.json", self._insert_password_reset),
+        ]
+        with self._lock, self._conn:
+            for file_name, insert in loaders:
+                path = os.path.join(seed_dir, file_name)
+                if file_name == "feedback.json" and os.path.exists(os.path.join(seed_dir, "feedback.jsonl")):
+                    records = self._read_feedback_log(seed_dir)
+                elif os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        records = json.load(f)
+                else:
+                    continue
+                for record in records:
+                    insert(record)
+    
+    @staticmethod
+    def _read_feedback_log(seed_dir):
+        """Replay a JSON Lines feedback log (base segment plus feedback_log/) from disk"""
+        with open(os.path.join(seed_dir, "feedback.jsonl"), encoding="utf-8") as f:
+            base_text = f.read()
+        segments = {}
+        log_dir = os.path.join(seed_dir, "feedback_log")
+        if os.path.isdir(log_dir):
+            for name in os.listdir(log_dir):
+                with open(os.path.join(log_dir, name), encoding="utf-8") as f:
+                    segments[name] = f.read()
+        return replay_feedback_log(base_text, segments)
+    
+    def _query(self, sql, params=()):
+        """Run a read query and decode the JSON documents it returns"""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def _query_one(self, sql, params=()):
+        """Run a read query expected to match at most one record"""
+        records = self._query(sql, params)
+        return records[0] if records else None
+    
+    def _write(self, operation, *args):
+        """Run a write inside a transaction, reporting failures like the GitHub store"""
+        try:
+            with self._lock, self._conn:
+                return operation(*args) is not False
+        except sqlite3.Error as e:
+            st.error(f"Failed to update database: {e}")
+            return False
+    
+    def _patch(self, table, key_column, key, updated_data, insert):
+        """Merge updated_data into one record and rewrite its row"""
+        row = self._conn.execute(f"SELECT data FROM {table} WHERE {key_column} = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        insert({**json.loads(row[0]), **updated_data}, replace=True)
+    
+    # REPLACE deletes the old row and inserts a new one at the end, an upsert
+    # updates it in place, so listings keep their order across updates
+    def _insert_employee(self, employee, replace=False):
+        upsert = " ON CONFLICT (emp_id) DO UPDATE SET dept = excluded.dept, data = excluded.data" if replace else ""
+        self._conn.execute(
+            f"INSERT INTO employees (emp_id, dept, data) VALUES (?, ?, ?){upsert}",
+            (employee.get("emp_id"), employee.get("dept"), json.dumps(employee))
+        )
+    
+    def _insert_admin(self, admin, replace=False):
+        upsert = " ON CONFLICT (admin_id) DO UPDATE SET data = excluded.data" if replace else ""
+        self._conn.execute(
+            f"INSERT INTO admins (admin_id, data) VALUES (?, ?){upsert}",
+            (admin.get("admin_id"), json.dumps(admin))
+        )
+    
+    def _insert_feedback(self, feedback, replace=False):
+        # REPLACE would move the row to the end, so updates keep their rowid
+        if replace:
+            row = self._conn.execute("SELECT data FROM feedback WHERE id = ?", (str(feedback.get("id")),)).fetchone()
+            self._conn.execute(
+                "UPDATE feedback SET emp_id = ?, dept = ?, timestamp = ?, data = ? WHERE id = ?",
+                (feedback.get("emp_id"), feedback.get("dept"), feedback.get("timestamp"),
+                 json.dumps(feedback), str(feedback.get("id")))
+            )
+            if row is not None:
+                self._apply_daily_rollup(json.loads(row[0]), -1)
+                self._apply_daily_rollup(feedback, 1)
+            return
+        self._conn.execute(
+            "INSERT INTO feedback (id, emp_id, dept, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+            (str(feedback.get("id")), feedback.get("emp_id"), feedback.get("dept"),
+             feedback.get("timestamp"), json.dumps(feedback))
+        )
+        self._apply_daily_rollup(feedback, 1)
+    
+    def _apply_daily_rollup(self, feedback, sign):
+        """Add a record to its feedback_daily cell (sign 1) or take it out again (sign -1), like FeedbackRollup"""
+        date = str(feedback.get("timestamp", ""))[:10]
+        if len(date) < 10:
+            return
+        # JSON keeps a missing department apart from an empty one inside the primary key
+        dept = json.dumps(feedback.get("dept"))
+        for field, value in rollup_fields(feedback).items():
+            self._conn.execute(
+                """
+                INSERT INTO feedback_daily (date, dept, field, value) VALUES (?, ?, ?, ?)
+                ON CONFLICT (date, dept, field) DO UPDATE SET value = value + excluded.value
+                """,
+                (date, dept, field, sign * value)
+            )
+        if sign < 0:
+            self._conn.execute("DELETE FROM feedback_daily WHERE date = ? AND dept = ? AND value = 0", (date, dept))
+    
+    def _backfill_daily_rollup(self):
+        """Fill feedback_daily for a database created before it existed"""
+        if self._conn.execute("SELECT 1 FROM feedback_daily LIMIT 1").fetchone() is not None:
+            return
+        for (data,) in self._conn.execute("SELECT data FROM feedback").fetchall():
+            self._apply_daily_rollup(json.loads(data), 1)
+    
+    def _insert_password_reset(self, reset, replace=False):
+        upsert = " ON CONFLICT (token) DO UPDATE SET emp_id = excluded.emp_id, data = excluded.data" if replace else ""
+        self._conn.execute(
+            f"INSERT INTO password_resets (token, emp_id, data) VALUES (?, ?, ?){upsert}",
+            (reset.get("token"), reset.get("emp_id"), json.dumps(reset))
+        )
+    
+    def get_cache_stats(self):
+        """SQLite reads are local, there is no remote cache to report on"""
+        return {}
+    
+    # Employee operations
+    def get_employees(self):
+        """Get all employees from the database"""
+        return self._query("SELECT data FROM employees ORDER BY rowid")
+    
+    def get_employee(self, emp_id: str) -> Optional[dict]:
+        """Get employee by ID from the database"""
+        return self._query_one("SELECT data FROM employees WHERE emp_id = ?", (emp_id,))
+    
+    def add_employee(self, employee_data):
+        """Add new employee to the database"""
+        # Generate a unique ID if not provided
+        if not employee_data.get("emp_id"):
+            employee_data["emp_id"] = str(uuid.uuid4())
+        
+        # Add creation timestamp
+        employee_data["created_at"] = datetime.datetime.now().isoformat()
+        
+        return self._write(self._insert_employee, employee_data)
+    
+    def update_employee(self, emp_id, updated_data):
+        """Update employee data in the database"""
+        return self._write(self._patch, "employees", "emp_id", emp_id, updated_data, self._insert_employee)
+    
+    def delete_employee(self, emp_id):
+        """Delete an employee and all related feedback from the database"""
+        def delete():
+            self._conn.execute("DELETE FROM employees WHERE emp_id = ?", (emp_id,))
+            for (data,) in self._conn.execute("SELECT data FROM feedback WHERE emp_id = ?", (emp_id,)).fetchall():
+                self._apply_daily_rollup(json.loads(data), -1)
+            self._conn.execute("DELETE FROM feedback WHERE emp_id = ?", (emp_id,))
+        return self._write(delete)
+    
+    def search_employees(self, query="", dept=None, offset=0, limit=None):
+        """
+        Find employees by name or ID, sorted by name, with the same matching as EmployeeSearchIndex
+        
+        Only the requested slice of matches is decoded; the count comes from the database.
+        """
+        clauses, params = [], []
+        query = query.strip().casefold()
+        if query:
+            # lower() and LIKE only fold ASCII, so matching is done by the index's own function
+            clauses.append("employee_search_match(json_extract(data, '$.name'), emp_id, ?)")
+            params.append(query)
+        if dept is not None:
+            clauses.append("dept = ?")
+            params.append(dept)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM employees{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT data FROM employees{where} ORDER BY coalesce(json_extract(data, '$.name'), ''), emp_id LIMIT ? OFFSET ?",
+                params + [limit if limit is not None else -1, offset]
+            ).fetchall()
+        return total, [json.loads(row[0]) for row in rows]
+    
+    def get_employee_departments(self):
+        """Sorted departments that have employees"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT dept FROM employees WHERE dept IS NOT NULL ORDER BY dept").fetchall()
+        return [row[0] for row in rows]
+    
+    # Admin operations
+    def get_admins(self):
+        """Get all admins from the database"""
+        return self._query("SELECT data FROM admins ORDER BY rowid")
+    
+    def get_admin(self, admin_id):
+        """Get admin by ID from the database"""
+        return self._query_one("SELECT data FROM admins WHERE admin_id = ?", (admin_id,))
+    
+    def add_admin(self, admin_data):
+        """Add new admin to the database"""
+        # Add creation timestamp
+        admin_data["created_at"] = datetime.datetime.now().isoformat()
+        
+        return self._write(self._insert_admin, admin_data)
+    
+    # Feedback operations
+    def get_feedback(self, start_date=None, end_date=None):
+        """Get feedback from the database, oldest first, optionally within a date range"""
+        clauses, params = [], []
+        if start_date:
+            clauses.append("timestamp >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            # ISO timestamps sort as strings; everything on end_date is before the next day
+            clauses.append("timestamp < ?")
+            params.append((end_date + datetime.timedelta(days=1)).isoformat())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT data FROM feedback{where} ORDER BY rowid", params)
+    
+    def get_feedback_for_employee(self, emp_id):
+        """Get all feedback submitted by one employee"""
+        return self._query("SELECT data FROM feedback WHERE emp_id = ? ORDER BY rowid", (emp_id,))
+    
+    def get_feedback_for_department(self, dept):
+        """Get all feedback from one department"""
+        return self._query("SELECT data FROM feedback WHERE dept = ? ORDER BY rowid", (dept,))
+    
+    def get_employee_feedback_summary(self, emp_ids=None):
+        """Per-employee feedback counts and sentiment tallies (of all employees, or of emp_ids), computed by the database"""
+        import pandas as pd
+        where, params = "emp_id IS NOT NULL", []
+        if emp_ids is not None:
+            where = f"emp_id IN ({', '.join('?' * len(emp_ids))})"
+            params = list(emp_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT emp_id, COUNT(*),
+                       SUM(json_extract(data, '$.sentiment') = 'POSITIVE'),
+                       SUM(json_extract(data, '$.sentiment') = 'NEGATIVE')
+                FROM feedback WHERE {where} GROUP BY emp_id
+                """,
+                params
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["emp_id"] + FEEDBACK_SUMMARY_COLUMNS).set_index("emp_id").astype("int64")
+    
+    def get_daily_feedback_rollup(self):
+        """
+        Per-day, per-department feedback totals
+        
+        The totals live in the feedback_daily table, which every feedback
+        write updates by taking the old version of the record out and adding
+        the new one, so this reads days x departments rows rather than the
+        feedback. The frame is rebuilt only after the database changes.
+        """
+        version = self._data_version()
+        cached = self._daily_rollup
+        if cached is None or cached[0] != version:
+            with self._lock:
+                rows = self._conn.execute("SELECT date, dept, field, value FROM feedback_daily").fetchall()
+            cells = {}
+            for date, dept, field, value in rows:
+                cells.setdefault((date, json.loads(dept)), {})[field] = value
+            cached = (version, rollup_frame(cells))
+            self._daily_rollup = cached
+        return cached[1]
+    
+    def _data_version(self):
+        """
+        Token that changes whenever the database does
+        
+        PRAGMA data_version moves on commits made through other connections
+        (e.g. the reanalyze CLI), total_changes on those made through this one.
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return data_version, self._conn.total_changes
+    
+    def get_feedback_frame(self, columns=None, start_date=None, end_date=None):
+        """
+        Feedback (of a date range, or all of it) as a typed DataFrame (see
+        feedback_frame), rebuilt only after the database or the range changes
+        """
+        # Read the version first: a write racing the query only causes an extra rebuild
+        version = self._data_version()
+        if start_date or end_date:
+            version = (version, start_date, end_date)
+            cached = self._feedback_frame_in_range
+        else:
+            cached = self._feedback_frame
+        if cached is None or cached[0] != version:
+            cached = (version, feedback_frame(self.get_feedback(start_date, end_date)))
+            if start_date or end_date:
+                self._feedback_frame_in_range = cached
+            else:
+                self._feedback_frame = cached
+        return cached[1] if columns is None else cached[1][list(columns)]
+    
+    def get_feedback_date_bounds(self):
+        """Get the dates of the oldest and newest feedback, or (None, None)"""
+        with self._lock:
+            first, last = self._conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM feedback").fetchone()
+        if not first:
+            return None, None
+        return datetime.date.fromisoformat(first[:10]), datetime.date.fromisoformat(last[:10])
+    
+    def add_feedback(self, feedback_data):
+        """Add new feedback to the database"""
         # Generate a unique ID if not provided
         if not feedback_data.get("id"):
             feedback_data["id"] = str(uuid.uuid4())
         
-        # Add timestamp and default status
-        if not feedback_data.get("timestamp"):
-            feedback_data["timestamp"] = datetime.datetime.now().isoformat()
-        feedback_data["status"] = "pending"  # Default status
+        # Add timestamp and default status
+        if not feedback_data.get("timestamp"):
+            feedback_data["timestamp"] = datetime.datetime.now().isoformat()
+        if not feedback_data.get("status"):
+            feedback_data["status"] = "pending"  # Default status
+        
+        return self._write(self._insert_feedback, feedback_data)
+    
+    def update_feedback(self, feedback_id, updated_data):
+        """Update feedback in the database"""
+        return self._write(self._patch, "feedback", "id", str(feedback_id), updated_data, self._insert_feedback)
+    
+    def update_feedback_bulk(self, updates):
+        """Update many feedback records in one transaction (missing IDs are skipped)"""
+        def patch_all():
+            for feedback_id, updated_data in updates.items():
+                self._patch("feedback", "id", str(feedback_id), updated_data, self._insert_feedback)
+        return self._write(patch_all)
+    
+    def claim_feedback_analysis(self, feedback_ids, owner, lease):
+        """Claim the analysis of feedback records for one lease (see GitHubDataStore.claim_feedback_analysis)"""
+        now = datetime.datetime.now()
+        claimed = []
+        
+        def claim():
+            self._conn.execute("DELETE FROM analysis_claims WHERE claimed_at < ?", ((now - lease).isoformat(),))
+            for feedback_id in feedback_ids:
+                cursor = self._conn.execute(
+                    "INSERT INTO analysis_claims (id, owner, claimed_at) VALUES (?, ?, ?) ON CONFLICT (id) DO NOTHING",
+                    (str(feedback_id), owner, now.isoformat())
+                )
+                if cursor.rowcount:
+                    claimed.append(str(feedback_id))
+        
+        return claimed if self._write(claim) else []
+    
+    # Password reset operations
+    def get_password_resets(self):
+        """Get all password reset tokens from the database"""
+        return self._query("SELECT data FROM password_resets ORDER BY rowid")
+    
+    def add_password_reset(self, reset_data):
+        """Add new password reset token to the database"""
+        # Add timestamps
+        reset_data["created_at"] = datetime.datetime.now().isoformat()
+        if "expires_at" not in reset_data:
+            expires_at = datetime.datetime.now() + datetime.timedelta(hours=1)
+            reset_data["expires_at"] = expires_at.isoformat()
+        
+        return self._write(self._insert_password_reset, reset_data)
+    
+    def update_password_reset(self, token, updated_data):
+        """Update password reset token in the database"""
+        return self._write(self._patch, "password_resets", "token", token, updated_data, self._insert_password_reset)
+    
+    def get_password_reset_by_token(self, token):
+        """Get password reset by token from the database"""
+        return self._query_one("SELECT data FROM password_resets WHERE token = ?", (token,))
+
+@st.cache_resource
+def get_sqlite_store():
+    """Get the SQLite data store shared by all sessions"""
+    return SQLiteDataStore(
+        db_path=st.secrets.get("sqlite_path", "empathypulse.db"),
+        seed_dir=st.secrets.get("sqlite_seed_dir", "data")
+    )
+
+# Initialize the configured data store
+@st.cache_resource
+def get_data_store() -> DataStoreBackend:
+    """Get the process-wide data store selected by the storage_backend secret ("github" or "sqlite")"""
+    backend = st.secrets.get("storage_backend", "github")
+    if backend == "sqlite":
+        return get_sqlite_store()
+    return GitHubDataStore()
+
+class LazyDataStore:
+    """
+    Stand-in for the data store that creates it on first use.
+    
+    Creating a GitHubDataStore fetches the data files, so pages that never
+    read data (login and signup forms, password reset) render without
+    waiting for it.
+    """
+    
+    def __init__(self, factory: Callable[[], DataStoreBackend]):
+        """Remember how to create the store"""
+        self._factory = factory
+        self._store: Optional[DataStoreBackend] = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        """Create the store if needed and forward to it"""
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = self._factory()
+        return getattr(self._store, name)
+
+data_store = LazyDataStore(get_data_store)
+# Emotion and sentiment classifiers
+EMOTION_MODEL = "bhadresh-savani/distilbert-base-uncased-emotion"
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Tokens shared by consecutive windows of a long text
+CHUNK_OVERLAP = 64
+
+def class_scores(logits, multi_label=False):
+    """Turn classifier logits into class scores, like the text-classification pipeline"""
+    return logits.sigmoid() if multi_label else logits.softmax(dim=-1)
+
+def top_labels(scores, id2label):
+    """(label, score) of the top class of each row of class scores"""
+    best_scores, best = scores.max(dim=-1)
+    return [(id2label[int(i)], float(score)) for i, score in zip(best, best_scores)]
+
+def window_length(tokenizer, *configs):
+    """Longest token window the tokenizer and all models accept"""
+    limits = [config.max_position_embeddings for config in configs if getattr(config, "max_position_embeddings", None)]
+    return min([tokenizer.model_max_length] + limits)
+
+def encode_windows(tokenizer, texts, max_length, overlap=CHUNK_OVERLAP):
+    """
+    Tokenize texts into windows of at most max_length tokens
+    
+    A text that fits is one window; a longer one is split into windows
+    that share `overlap` tokens, so no part of it is dropped.
+    
+    Returns:
+    --------
+    tuple
+        (token IDs of each window, index in texts of the text each window came from)
+    """
+    encoded = tokenizer(texts, truncation=True, max_length=max_length, stride=overlap, return_overflowing_tokens=True)
+    return encoded["input_ids"], list(encoded["overflow_to_sample_mapping"])
+
+def merge_window_scores(scores, owners, lengths, count):
+    """
+    Combine the class scores of each text's windows into one row per text
+    
+    Windows are weighted by their confidence (top score) times their token
+    count, so a clear-cut passage outweighs an ambivalent one and a short
+    tail window does not count as much as a full one.
+    
+    Parameters:
+    -----------
+    scores : torch.Tensor
+        Class scores, one row per window
+    owners : list
+        Index of the text each window belongs to
+    lengths : list
+        Token count of each window
+    count : int
+        Number of texts
+    """
+    import torch
+    weights = scores.max(dim=-1).values * torch.tensor(lengths, dtype=scores.dtype)
+    owners = torch.tensor(owners)
+    totals = torch.zeros(count, scores.shape[-1], dtype=scores.dtype).index_add_(0, owners, scores * weights[:, None])
+    return totals / torch.zeros(count, dtype=scores.dtype).index_add_(0, owners, weights)[:, None]
+
+def model_version(mode, *configs):
+    """Identify the models behind a classifier, for keying cached results"""
+    parts = [mode]
+    for config in configs:
+        parts.append(f"{config.name_or_path}@{getattr(config, '_commit_hash', None) or 'local'}")
+    return "|".join(parts)
+
+def analysis_results(emotions, sentiments):
+    """Combine per-text (label, score) pairs into analyze_feedback dicts"""
+    return [
+        {
+            'emotion': emotion_label,
+            'emotion_confidence': emotion_score,
+            'sentiment': sentiment_label,
+            'sentiment_confidence': sentiment_score
+        }
+        for (emotion_label, emotion_score), (sentiment_label, sentiment_score) in zip(emotions, sentiments)
+    ]
+
+class PipelineClassifier:
+    """The two Hugging Face pipelines, each tokenizing the texts itself"""
+    
+    def __init__(self, emotion_model=EMOTION_MODEL, sentiment_model=SENTIMENT_MODEL, overlap=CHUNK_OVERLAP):
+        """Load the emotion and sentiment pipelines"""
+        from transformers import pipeline
+        self.emotion_classifier = pipeline("text-classification", model=emotion_model)
+        
+        # Add a second model for more nuanced sentiment analysis
+        self.sentiment_classifier = pipeline("sentiment-analysis", model=sentiment_model)
+        self.overlap = overlap
+        self.version = model_version(
+            "torch", self.emotion_classifier.model.config, self.sentiment_classifier.model.config
+        ) + f"|overlap@{overlap}"
+    
+    def _split(self, texts):
+        """Cut texts into pieces that each fit the models, at the token windows of encode_windows"""
+        tokenizer = self.emotion_classifier.tokenizer
+        max_length = window_length(
+            tokenizer, self.emotion_classifier.model.config, self.sentiment_classifier.model.config
+        )
+        encoded = tokenizer(
+            texts, truncation=True, max_length=max_length, stride=self.overlap,
+            return_overflowing_tokens=True, return_offsets_mapping=True, return_special_tokens_mask=True
+        )
+        pieces = []
+        for offsets, special, owner in zip(encoded["offset_mapping"], encoded["special_tokens_mask"],
+                                           encoded["overflow_to_sample_mapping"]):
+            spans = [span for span, is_special in zip(offsets, special) if not is_special]
+            pieces.append(texts[owner][spans[0][0]:spans[-1][1]] if spans else texts[owner])
+        return pieces, list(encoded["overflow_to_sample_mapping"]), [len(ids) for ids in encoded["input_ids"]]
+    
+    def __call__(self, texts: List[str]) -> List[Dict[str, Union[str, float]]]:
+        """Analyze a batch of texts"""
+        import torch
+        pieces, owners, lengths = self._split(texts)
+        results = {}
+        for name, model in (("emotion", self.emotion_classifier), ("sentiment", self.sentiment_classifier)):
+            # truncation only guards against a piece re-tokenizing a little longer
+            outputs = model(pieces, batch_size=len(texts), truncation=True, top_k=None)
+            id2label = model.model.config.id2label
+            scores = torch.tensor([
+                [{r['label']: r['score'] for r in output}[id2label[i]] for i in range(len(id2label))]
+                for output in outputs
+            ])
+            results[name] = top_labels(merge_window_scores(scores, owners, lengths, len(texts)), id2label)
+        return analysis_results(results["emotion"], results["sentiment"])
+
+class WindowedClassifier(ABC):
+    """
+    Base for the classifiers that feed token IDs to the models themselves.
+    
+    Each text is split into windows by encode_windows and every window of
+    the batch is scored; windows are sorted by length and padded in groups
+    of similar length, so cost grows linearly with text length instead of
+    padding every short text to the longest one. The window scores of
+    each text are then combined by merge_window_scores.
+    
+    Subclasses set tokenizer, labels ({"emotion": id2label, "sentiment":
+    id2label}), max_length and overlap, and implement _scores.
+    """
+    
+    tensor_type = "pt"
+    
+    @abstractmethod
+    def _scores(self, inputs) -> Dict[str, torch.Tensor]:
+        """Class scores of a padded batch of windows, per head"""
+    
+    def __call__(self, texts: List[str]) -> List[Dict[str, Union[str, float]]]:
+        """Analyze a batch of texts"""
+        import torch
+        windows, owners = encode_windows(self.tokenizer, texts, self.max_length, self.overlap)
+        scores = {name: torch.empty(len(windows), len(id2label)) for name, id2label in self.labels.items()}
+        
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i]))
+        for start in range(0, len(order), len(texts)):
+            positions = order[start:start + len(texts)]
+            inputs = self.tokenizer.pad({"input_ids": [windows[i] for i in positions]}, return_tensors=self.tensor_type)
+            for name, batch_scores in self._scores(inputs).items():
+                scores[name][positions] = batch_scores.float()
+        
+        lengths = [len(window) for window in windows]
+        results = {
+            name: top_labels(merge_window_scores(scores[name], owners, lengths, len(texts)), id2label)
+            for name, id2label in self.labels.items()
+        }
+        return analysis_results(results["emotion"], results["sentiment"])
+
+class SharedEncodingClassifier(WindowedClassifier):
+    """
+    Both classifiers run on one tokenization of the batch.
+    
+    The emotion and SST-2 models are both fine-tuned from
+    distilbert-base-uncased and share its vocabulary, so each batch is
+    tokenized and padded once and the same input tensors go through both
+    models.
+    """
+    
+    def __init__(self, emotion_model=EMOTION_MODEL, sentiment_model=SENTIMENT_MODEL, overlap=CHUNK_OVERLAP):
+        """Load one tokenizer and both models, checking that their vocabularies match"""
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(emotion_model)
+        if AutoTokenizer.from_pretrained(sentiment_model).get_vocab() != self.tokenizer.get_vocab():
+            raise ValueError(
+                f"{emotion_model} and {sentiment_model} use different vocabularies; "
+                "set inference_mode = \"pipelines\""
+            )
+        self.emotion_model = AutoModelForSequenceClassification.from_pretrained(emotion_model).eval()
+        self.sentiment_model = AutoModelForSequenceClassification.from_pretrained(sentiment_model).eval()
+        self.labels = {"emotion": self.emotion_model.config.id2label, "sentiment": self.sentiment_model.config.id2label}
+        self.max_length = window_length(self.tokenizer, self.emotion_model.config, self.sentiment_model.config)
+        self.overlap = overlap
+        # Same results as the pipelines, so the same cached results apply
+        self.version = model_version("torch", self.emotion_model.config, self.sentiment_model.config) + f"|overlap@{overlap}"
+    
+    def _scores(self, inputs):
+        """Run both models on the same input tensors"""
+        import torch
+        with torch.inference_mode():
+            return {
+                name: class_scores(model(**inputs).logits, model.config.problem_type == "multi_label_classification")
+                for name, model in (("emotion", self.emotion_model), ("sentiment", self.sentiment_model))
+            }
+
+class MultiHeadClassifier(WindowedClassifier):
+    """
+    One DistilBERT encoder with an emotion head and a sentiment head.
+    
+    Halves model memory and encoder time compared to two full models. The
+    checkpoint directory holds the encoder and tokenizer (save_pretrained
+    layout) and a heads.pt file:
+    
+        {"emotion": {"labels": [...], "state_dict": ...},
+         "sentiment": {"labels": [...], "state_dict": ...}}
+    
+    Each head is Linear(dim, dim) -> ReLU -> Linear(dim, len(labels)) on the
+    [CLS] hidden state, the same shape as the pre_classifier/classifier pair
+    of DistilBertForSequenceClassification.
+    """
+    
+    def __init__(self, checkpoint_path: str, overlap=CHUNK_OVERLAP):
+        """Load the encoder, tokenizer and heads from checkpoint_path"""
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(checkpoint_path)
+        self.encoder = AutoModel.from_pretrained(checkpoint_path).eval()
+        heads = torch.load(os.path.join(checkpoint_path, "heads.pt"), map_location="cpu")
+        
+        dim = self.encoder.config.dim
+        self.heads = {}
+        for name in ("emotion", "sentiment"):
+            labels = heads[name]["labels"]
+            head = torch.nn.Sequential(torch.nn.Linear(dim, dim), torch.nn.ReLU(), torch.nn.Linear(dim, len(labels)))
+            head.load_state_dict(heads[name]["state_dict"])
+            self.heads[name] = head.eval()
+        self.labels = {name: dict(enumerate(heads[name]["labels"])) for name in self.heads}
+        self.max_length = window_length(self.tokenizer, self.encoder.config)
+        self.overlap = overlap
+        
+        with open(os.path.join(checkpoint_path, "heads.pt"), "rb") as f:
+            heads_digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        self.version = model_version("multihead", self.encoder.config) + f"|heads@{heads_digest}|overlap@{overlap}"
+    
+    def _scores(self, inputs):
+        """Run the encoder once and both heads on its [CLS] state"""
+        import torch
+        with torch.inference_mode():
+            cls_state = self.encoder(**inputs).last_hidden_state[:, 0]
+            return {name: class_scores(head(cls_state)) for name, head in self.heads.items()}
+
+# Largest difference in any score the INT8 ONNX models may have from torch
+ONNX_TOLERANCE = 0.05
+
+# Texts the ONNX export is checked against torch with
+ONNX_PROBE_TEXTS = [
+    "I love working with my team, everyone is so supportive.",
+    "My manager ignores my concerns and I feel burned out.",
+    "The new project deadline is stressful but manageable.",
+    "Nothing much to report this week.",
+    "I'm worried about the reorganization and what it means for my role.",
+    "Great quarter! The whole department did amazing work.",
+]
+
+class OnnxClassifier(WindowedClassifier):
+    """
+    Both classifiers exported to ONNX with dynamic INT8 quantization.
+    
+    Runs on onnxruntime's CPU provider with one shared tokenization, like
+    SharedEncodingClassifier. The first start exports each model to
+    `onnx_dir` and checks the quantized model against torch on
+    ONNX_PROBE_TEXTS: no class score may differ by more than
+    ONNX_TOLERANCE (so labels can only differ on near-ties). Later starts
+    load the exported files without torch weights. Needs the optional onnxruntime and onnx packages.
+    """
+    
+    tensor_type = "np"
+    
+    def __init__(self, emotion_model=EMOTION_MODEL, sentiment_model=SENTIMENT_MODEL, onnx_dir=".empathypulse_onnx",
+                 overlap=CHUNK_OVERLAP):
+        """Load (exporting on first use) the quantized models"""
+        from transformers import AutoConfig, AutoTokenizer
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError('inference_mode = "onnx" needs onnxruntime and onnx (pip install onnxruntime onnx)') from e
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(emotion_model)
+        if AutoTokenizer.from_pretrained(sentiment_model).get_vocab() != self.tokenizer.get_vocab():
+            raise ValueError(
+                f"{emotion_model} and {sentiment_model} use different vocabularies; "
+                "set inference_mode = \"pipelines\""
+            )
+        
+        self.models = {}
+        configs = []
+        for name, model_name in (("emotion", emotion_model), ("sentiment", sentiment_model)):
+            path = os.path.join(onnx_dir, model_name.replace("/", "__") + ".int8.onnx")
+            if not os.path.exists(path):
+                self._export(model_name, path)
+            config = AutoConfig.from_pretrained(model_name)
+            configs.append(config)
+            session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+            self.models[name] = (session, config.problem_type == "multi_label_classification")
+        self.labels = {"emotion": configs[0].id2label, "sentiment": configs[1].id2label}
+        self.max_length = window_length(self.tokenizer, *configs)
+        self.overlap = overlap
+        self.version = model_version("onnx-int8", *configs) + f"|overlap@{overlap}"
+    
+    def _export(self, model_name, path):
+        """Export a model to ONNX, quantize its weights to INT8 and check it against torch"""
+        import torch
+        from transformers import AutoModelForSequenceClassification
+        import onnxruntime
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        inputs = self.tokenizer(ONNX_PROBE_TEXTS, padding=True, truncation=True, return_tensors="pt")
+        fp32_path = path.replace(".int8.onnx", ".fp32.onnx")
         
-        feedback_list.append(feedback_data)
-        return self._update_file(
-            self.feedback_file,
-            json.dumps(feedback_list),
-            f"Add feedback from {feedback_data.get('emp_id')}"
+        dynamic_axes = {"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"}, "logits": {0: "batch"}}
+        torch.onnx.export(
+            model, (inputs["input_ids"], inputs["attention_mask"]), fp32_path,
+            input_names=["input_ids", "attention_mask"], output_names=["logits"],
+            dynamic_axes=dynamic_axes, opset_version=17
         )
-    
-    def update_feedback(self, feedback_id, updated_data):
-        """Update feedback in GitHub"""
-        feedback_list = self.get_feedback()
-        
-        for i, feedback in enumerate(feedback_list):
-            if str(feedback.get("id")) == str(feedback_id):
-                feedback_list[i].update(updated_data)
-                return self._update_file(
-                    self.feedback_file,
-                    json.dumps(feedback_list),
-                    f"Update feedback {feedback_id}"
-                )
+        quantize_dynamic(fp32_path, path + ".tmp", weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
         
-        return False
+        with torch.inference_mode():
+            expected = model(**inputs).logits.softmax(dim=-1)
+        session = onnxruntime.InferenceSession(path + ".tmp", providers=["CPUExecutionProvider"])
+        logits = session.run(["logits"], {k: v.numpy() for k, v in inputs.items()})[0]
+        actual = torch.from_numpy(logits).softmax(dim=-1)
+        
+        difference = float((actual - expected).abs().max())
+        if difference > ONNX_TOLERANCE:
+            os.remove(path + ".tmp")
+            raise ValueError(f"INT8 export of {model_name} is off by {difference:.3f} (tolerance {ONNX_TOLERANCE})")
+        os.replace(path + ".tmp", path)
+        logger.info("Exported %s to %s (max score difference %.4f)", model_name, path, difference)
     
-    # Password reset operations
-    def get_password_resets(self):
-        """Get all password reset tokens from GitHub"""
+    def _scores(self, inputs):
+        """Run both ONNX sessions on the same input arrays"""
+        import torch
+        feed = {"input_ids": inputs["input_ids"], "attention_mask": inputs["attention_mask"]}
+        return {
+            name: class_scores(torch.from_numpy(session.run(["logits"], feed)[0]), multi_label)
+            for name, (session, multi_label) in self.models.items()
+        }
+
+def build_classifier(mode: str, emotion_model=EMOTION_MODEL, sentiment_model=SENTIMENT_MODEL,
+                     multihead_path=None, onnx_dir=".empathypulse_onnx", overlap=CHUNK_OVERLAP):
+    """Create the classifier for an inference_mode ("shared", "pipelines", "multihead" or "onnx")"""
+    if mode == "multihead":
+        return MultiHeadClassifier(multihead_path, overlap)
+    if mode == "onnx":
+        return OnnxClassifier(emotion_model, sentiment_model, onnx_dir, overlap)
+    if mode == "pipelines":
+        return PipelineClassifier(emotion_model, sentiment_model, overlap)
+    return SharedEncodingClassifier(emotion_model, sentiment_model, overlap)
+
+class ClassifierLoader:
+    """
+    Loads a classifier on a background thread.
+    
+    Loading the models takes seconds, so it starts with the process and
+    runs alongside the first page renders; only code that actually needs
+    the models waits for them, through wait().
+    """
+    
+    def __init__(self, load: Callable[[], Any]):
+        """Start calling load() on a daemon thread"""
+        self.classifier = None
+        self.error: Optional[Exception] = None
+        self.load_seconds: Optional[float] = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._load, args=(load,), name="empathypulse-model-loader", daemon=True).start()
+    
+    def _load(self, load):
+        """Load the classifier, keeping the error if it fails"""
+        start = time.perf_counter()
         try:
-             resets = self._get_file_content(self.password_reset_file)
-             return resets
+            self.classifier = load()
         except Exception as e:
-            st.error(f"Error retrieving password resets: {e}")
-            return []
+            logger.exception("Failed to load emotion models")
+            self.error = e
+        finally:
+            self.load_seconds = time.perf_counter() - start
+            self._ready.set()
+        if self.classifier is not None:
+            logger.info("Emotion models loaded in %.1fs", self.load_seconds)
     
-    def add_password_reset(self, reset_data):
-        """Add new password reset token to GitHub"""
-        resets = self.get_password_resets()
-        
-        # Add timestamps
-        reset_data["created_at"] = datetime.datetime.now().isoformat()
-        if "expires_at" not in reset_data:
-            expires_at = datetime.datetime.now() + datetime.timedelta(hours=1)
-            reset_data["expires_at"] = expires_at.isoformat()
-        
-        resets.append(reset_data)
-        return self._update_file(
-            self.password_reset_file,
-            json.dumps(resets),
-            f"Add password reset for {reset_data.get('emp_id')}"
+    @property
+    def ready(self) -> bool:
+        """Whether loading has finished (successfully or not)"""
+        return self._ready.is_set()
+    
+    def wait(self, timeout: Optional[float] = None):
+        """Block until loading has finished; returns the classifier, or None if it failed"""
+        self._ready.wait(timeout)
+        return self.classifier
+
+# Initialize the emotion model (with caching to improve performance)
+@st.cache_resource
+def load_classifiers() -> ClassifierLoader:
+    """Start loading the emotion classification models in the background"""
+    mode = st.secrets.get("inference_mode", "shared")
+    options = {
+        "multihead_path": st.secrets.get("multihead_model_path"),
+        "onnx_dir": st.secrets.get("onnx_model_dir", ".empathypulse_onnx"),
+        "overlap": int(st.secrets.get("chunk_overlap_tokens", CHUNK_OVERLAP))
+    }
+    return ClassifierLoader(lambda: build_classifier(mode, **options))
+
+def normalize_feedback_text(text: str) -> str:
+    """
+    Normalize text for the inference cache
+    
+    The models are uncased and split on whitespace, so case and spacing
+    never change their output.
+    """
+    return " ".join(str(text).split()).lower()
+
+class InferenceCache:
+    """
+    Persistent LRU cache of analysis results, keyed by text and model version.
+    
+    Keys are the SHA-256 of the normalized text plus the classifier's
+    version, so switching models never serves stale results. Entries live
+    in a small SQLite file; once there are more than `max_entries` the
+    least recently used ones are evicted.
+    """
+    
+    def __init__(self, path=".empathypulse_inference_cache.db", max_entries=100_000):
+        """Open (creating if needed) the cache database at path"""
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)"
         )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self._stats = {"hits": 0, "misses": 0}
     
-    def update_password_reset(self, token, updated_data):
-        """Update password reset token in GitHub"""
-        resets = self.get_password_resets()
-        
-        for i, reset in enumerate(resets):
-            if reset.get("token") == token:
-                resets[i].update(updated_data)
-                return self._update_file(
-                    self.password_reset_file,
-                    json.dumps(resets),
-                    f"Update password reset token"
+    @staticmethod
+    def key(text: str, version: str) -> str:
+        """Cache key of a text for one model version"""
+        return hashlib.sha256(f"{version}\0{normalize_feedback_text(text)}".encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Union[str, float]]]:
+        """Get a cached result, marking it as recently used"""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            with self._conn:
+                self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+    
+    def put(self, key: str, result: Dict[str, Union[str, float]]):
+        """Store a result, evicting the least recently used entries over the cap"""
+        with self._lock, self._conn:
+            # rowcount is 1 for a replaced key too, so only a new key adds an entry
+            is_new = self._conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, result, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(result), time.time())
+            )
+            self._entries += is_new
+            if self._entries > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                    (self._entries - self.max_entries,)
                 )
+                self._entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Hits, misses, hit rate and number of stored results"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": self._entries
+            }
+
+def classify_texts(classifier, texts, cache=None, lookup=True):
+    """
+    Analyze texts with a classifier, running each distinct text once
+    
+    Texts are compared after normalize_feedback_text. With a cache, new
+    results are stored in it and, if lookup is set, known ones are reused.
+    
+    Returns:
+    --------
+    list
+        analyze_feedback dicts in the order of texts
+    """
+    unique_texts = {}
+    for text in texts:
+        unique_texts.setdefault(normalize_feedback_text(text), text)
+    
+    results = {}
+    if cache is not None and lookup:
+        for normalized in unique_texts:
+            cached = cache.get(cache.key(normalized, classifier.version))
+            if cached is not None:
+                results[normalized] = cached
+    
+    missing = [normalized for normalized in unique_texts if normalized not in results]
+    if missing:
+        for normalized, result in zip(missing, classifier([unique_texts[n] for n in missing])):
+            results[normalized] = result
+            if cache is not None:
+                cache.put(cache.key(normalized, classifier.version), result)
+    return [results[normalize_feedback_text(text)] for text in texts]
+
+class InferenceService:
+    """
+    Micro-batching front end for the classifiers, shared by all sessions.
+    
+    Sessions submit texts and get a Future back. A worker thread collects
+    requests until `max_batch` are waiting or `max_wait` seconds have passed
+    since the first one, then runs the classifier once on the whole batch
+    (padded to its longest text), so concurrent submissions share the model
+    overhead instead of queueing behind each other one text at a time.
+    
+    With an InferenceCache, texts analyzed before by the same model version
+    are answered from it without queueing, and repeats within a batch are
+    only run once. Requests submitted while the models are still loading
+    wait in the queue until they are ready.
+    """
+    
+    def __init__(self, loader: ClassifierLoader, max_batch=16, max_wait=0.01, cache=None):
+        """
+        Parameters:
+        -----------
+        loader : ClassifierLoader
+            Loader of the classifier (classifier(texts) -> analyze_feedback dicts)
+        max_batch : int
+            Largest number of texts run in one batch
+        max_wait : float
+            Seconds to wait for a batch to fill once a request is waiting
+        cache : InferenceCache, optional
+            Persistent cache of results in front of the classifier
+        """
+        self.loader = loader
+        self.cache = cache
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._requests: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
         
-        return False
+        self._thread = threading.Thread(target=self._run, name="empathypulse-inference", daemon=True)
+        self._thread.start()
     
-    def get_password_reset_by_token(self, token):
-        """Get password reset by token from GitHub"""
-        resets = self.get_password_resets()
-        for reset in resets:
-            if reset.get("token") == token:
-                return reset
-        return None
+    def submit(self, text: str) -> Future:
+        """Queue a text for analysis; the Future resolves to the analyze_feedback dict"""
+        future = Future()
+        # Cached results are keyed by model version, known once the models are loaded
+        classifier = self.loader.classifier
+        if self.cache is not None and classifier is not None:
+            cached = self.cache.get(self.cache.key(text, classifier.version))
+            if cached is not None:
+                future.set_result(cached)
+                return future
+        self._requests.put((text, future))
+        return future
+    
+    def _next_batch(self):
+        """Block for one request, then gather more until the batch is full or max_wait is up"""
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        """Worker loop running one batch at a time"""
+        while True:
+            batch = self._next_batch()
+            classifier = self.loader.wait()
+            try:
+                if classifier is None:
+                    raise RuntimeError(f"Emotion models failed to load: {self.loader.error}")
+                # submit() already looked these texts up in the cache
+                results = classify_texts(classifier, [text for text, _ in batch], self.cache, lookup=False)
+            except Exception as e:
+                logger.exception("Inference batch of %d failed", len(batch))
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
 
-# Initialize GitHub data store
-#@st.cache_resource
-def get_github_store():
-    """Get or create GitHub data store instance"""
-    return GitHubDataStore()
+@st.cache_resource
+def get_inference_cache() -> Optional[InferenceCache]:
+    """Get the persistent inference cache, unless inference_cache is turned off"""
+    if not st.secrets.get("inference_cache", True):
+        return None
+    return InferenceCache(
+        st.secrets.get("inference_cache_path", ".empathypulse_inference_cache.db"),
+        max_entries=int(st.secrets.get("inference_cache_max_entries", 100_000))
+    )
 
-github_store = get_github_store()
-# Initialize the emotion model (with caching to improve performance)
 @st.cache_resource
-def load_classifiers():
-    """Load and cache the emotion classification models"""
-    try:
-        emotion_classifier = pipeline("text-classification", 
-                                    model="bhadresh-savani/distilbert-base-uncased-emotion")
-        
-        # Add a second model for more nuanced sentiment analysis
-        sentiment_classifier = pipeline("sentiment-analysis", 
-                                    model="distilbert-base-uncased-finetuned-sst-2-english")
-        
-        return emotion_classifier, sentiment_classifier
-    except Exception as e:
-        st.error(f"Failed to load emotion models: {e}")
-        return None, None
+def get_inference_service() -> InferenceService:
+    """Get the inference service shared by all sessions of this process"""
+    return InferenceService(
+        load_classifiers(),
+        max_batch=int(st.secrets.get("inference_max_batch", 16)),
+        max_wait=float(st.secrets.get("inference_max_wait_ms", 10)) / 1000,
+        cache=get_inference_cache()
+    )
 
-emotion_classifier, sentiment_classifier = load_classifiers()
+# Result used when feedback cannot be analyzed
+NEUTRAL_ANALYSIS = {
+    'emotion': 'neutral',
+    'emotion_confidence': 0.5,
+    'sentiment': 'NEUTRAL',
+    'sentiment_confidence': 0.5
+}
 
 # Helper function to analyze feedback
 def analyze_feedback(feedback_text: str) -> Dict[str, Union[str, float]]:
@@ -549,23 +3444,110 @@ def analyze_feedback(feedback_text: str) -> Dict[str, Union[str, float]]:
         Dictionary with emotion and sentiment analysis results
     """
     try:
-        emotion_result = emotion_classifier(feedback_text)[0]
-        sentiment_result = sentiment_classifier(feedback_text)[0]
-        
-        return {
-            'emotion': emotion_result['label'],
-            'emotion_confidence': emotion_result['score'],
-            'sentiment': sentiment_result['label'],
-            'sentiment_confidence': sentiment_result['score']
-        }
+        return get_inference_service().submit(feedback_text).result()
     except Exception as e:
         st.error(f"Error analyzing feedback: {e}")
-        return {
-            'emotion': 'neutral',
-            'emotion_confidence': 0.5,
-            'sentiment': 'NEUTRAL',
-            'sentiment_confidence': 0.5
+        return dict(NEUTRAL_ANALYSIS)
+
+class FeedbackAnalyzer:
+    """
+    Background analysis of submitted feedback.
+    
+    Submissions are stored right away with status "analyzing" and handed to
+    schedule(). The text goes to the inference service, where it is batched
+    with everyone else's; when its result arrives a small worker pool writes
+    the emotion and sentiment into the record and moves it to "pending",
+    which is when the alert engine is told about it. A slow model delays
+    the analysis, never the Submit button.
+    
+    Each record is analyzed by one process at a time. A new record belongs
+    to the process it was submitted to for one lease from its timestamp;
+    records still "analyzing" after that (their process died) are claimed
+    through the store before they are analyzed again, so of several
+    processes resuming them only one does.
+    """
+    
+    def __init__(self, inference_service, workers=2, alert_engine=None, lease=datetime.timedelta(minutes=10)):
+        """
+        Parameters:
+        -----------
+        inference_service : InferenceService
+            Service analyzing the texts
+        workers : int
+            Threads saving results
+        alert_engine : AlertEngine, optional
+            Engine told about every analyzed record
+        lease : datetime.timedelta
+            How long a process holds the records it submitted or claimed
+        """
+        self.inference_service = inference_service
+        self.alert_engine = alert_engine
+        self.lease = lease
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="empathypulse-analysis")
+        self._lock = threading.Lock()
+        self._in_flight = set()
+    
+    def schedule(self, store, feedback):
+        """Analyze a stored feedback record in the background"""
+        with self._lock:
+            self._in_flight.add(str(feedback["id"]))
+        future = self.inference_service.submit(feedback.get("feedback_text", ""))
+        future.add_done_callback(lambda done: self._pool.submit(self._complete, store, feedback, done))
+    
+    def resume(self, store):
+        """Schedule the records a previous process left in "analyzing", from a worker thread"""
+        self._pool.submit(self._resume, store)
+    
+    def _resume(self, store):
+        """Claim and schedule the unfinished records (worker pool thread)"""
+        expired = (datetime.datetime.now() - self.lease).isoformat()
+        with self._lock:
+            in_flight = set(self._in_flight)
+        unfinished = {
+            str(f["id"]): f for f in store.get_feedback()
+            if f.get("status") == "analyzing" and str(f["id"]) not in in_flight
         }
+        orphaned = {feedback_id: f for feedback_id, f in unfinished.items() if str(f.get("timestamp", "")) < expired}
+        
+        if orphaned:
+            for feedback_id in store.claim_feedback_analysis(list(orphaned), self.owner, self.lease):
+                self.schedule(store, orphaned[feedback_id])
+        if len(orphaned) < len(unfinished):
+            # Their submitters may still be analyzing them; look again once the lease runs out
+            timer = threading.Timer(self.lease.total_seconds(), self.resume, (store,))
+            timer.daemon = True
+            timer.start()
+    
+    def _complete(self, store, feedback, future):
+        """Save one analysis result (worker pool thread)"""
+        try:
+            result = future.result()
+        except Exception:
+            logger.exception("Analysis of feedback %s failed", feedback.get("id"))
+            result = dict(NEUTRAL_ANALYSIS)
+        
+        changes = {**result, "status": "pending"}
+        saved = store.update_feedback(feedback["id"], changes)
+        with self._lock:
+            self._in_flight.discard(str(feedback["id"]))
+        if not saved:
+            logger.error("Could not save the analysis of feedback %s", feedback.get("id"))
+            return
+        if self.alert_engine is not None and self.alert_engine.notify({**feedback, **changes}):
+            logger.info("Priority alert raised for feedback %s", feedback.get("id"))
+
+@st.cache_resource
+def get_feedback_analyzer(_store) -> FeedbackAnalyzer:
+    """Get the process-wide feedback analyzer, resuming analyses left unfinished"""
+    analyzer = FeedbackAnalyzer(
+        get_inference_service(),
+        workers=int(st.secrets.get("analysis_workers", 2)),
+        alert_engine=get_alert_engine(),
+        lease=datetime.timedelta(minutes=float(st.secrets.get("analysis_lease_minutes", 10)))
+    )
+    analyzer.resume(_store)
+    return analyzer
 
 # Password security functions
 def hash_password(password: str) -> str:
@@ -642,7 +3624,7 @@ def admin_exists() -> bool:
     bool
         True if at least one admin exists, False otherwise
     """
-    admins = github_store.get_admins()
+    admins = data_store.get_admins()
     return len(admins) > 0
 
 
@@ -670,7 +3652,7 @@ def setup_admin():
                     st.error("Passwords do not match.")
                 else:
                     # Add admin to GitHub
-                    github_store.add_admin({
+                    data_store.add_admin({
                         "admin_id": admin_id,
                         "password": hash_password(password)
                     })
@@ -695,7 +3677,7 @@ def admin_login():
             if not admin_id or not password:
                 st.error("Please enter both Admin ID and Password.")
             else:
-                admin = github_store.get_admin(admin_id)
+                admin = data_store.get_admin(admin_id)
                 
                 if admin and verify_password(admin['password'], password):
                     st.session_state.role = "admin"
@@ -735,7 +3717,7 @@ def signup():
                 st.error("Passwords do not match.")
             else:
                 # Check if employee already exists
-                existing_emp = github_store.get_employee(emp_id)
+                existing_emp = data_store.get_employee(emp_id)
                 
                 if existing_emp:
                     st.error("Employee ID already exists. Please log in or use a different ID.")
@@ -749,7 +3731,7 @@ def signup():
                     }
                     
                     # Add to GitHub
-                    github_store.add_employee(employee_data)
+                    data_store.add_employee(employee_data)
                     
                     st.success("Account created successfully! Please log in.")
                     time.sleep(2)  # Give user time to read the message
@@ -776,7 +3758,7 @@ def login():
             if not emp_id or not password:
                 st.error("Please enter both Employee ID and Password.")
             else:
-                employee = github_store.get_employee(emp_id)
+                employee = data_store.get_employee(emp_id)
                 
                 if employee and verify_password(employee['password'], password):
                     st.session_state.role = "employee"
@@ -808,7 +3790,7 @@ def forgot_password():
             if not emp_id:
                 st.error("Please enter your Employee ID.")
             else:
-                employee = github_store.get_employee(emp_id)
+                employee = data_store.get_employee(emp_id)
                 
                 if employee:
                     # Generate reset token
@@ -816,7 +3798,7 @@ def forgot_password():
                     
                     # Save token to GitHub
                     expires_at = datetime.datetime.now() + datetime.timedelta(hours=1)
-                    github_store.add_password_reset({
+                    data_store.add_password_reset({
                         "emp_id": emp_id,
                         "token": token,
                         "used": False,
@@ -857,7 +3839,7 @@ def reset_password():
         return
     
     # Validate token
-    reset_data = github_store.get_password_reset_by_token(token)
+    reset_data = data_store.get_password_reset_by_token(token)
     st.write("✅ Matched Reset Data:", reset_data)
     
     if not reset_data:
@@ -893,15 +3875,15 @@ def reset_password():
                 st.error("Passwords do not match.")
             else:
                 # Update employee password
-                employee = github_store.get_employee(reset_data["emp_id"])
+                employee = data_store.get_employee(reset_data["emp_id"])
                 
                 if employee:
-                    github_store.update_employee(
+                    data_store.update_employee(
                         employee["emp_id"],
                         {"password": hash_password(new_password)}
                     )
                     
-                    github_store.update_password_reset(
+                    data_store.update_password_reset(
                         token,
                         {"used": True}
                     )
@@ -1010,6 +3992,13 @@ def employee_dashboard():
         if st.session_state.get("clear_feedback_form_next", False):
             clear_feedback_form()
             st.session_state["clear_feedback_form_next"] = False
+            st.success("Thank you for your feedback!")
+
+        classifier_loader = load_classifiers()
+        if classifier_loader.error is not None:
+            st.error(f"Failed to load emotion models: {classifier_loader.error}")
+        elif not classifier_loader.ready:
+            st.info("The emotion models are still starting up. You can submit now; your feedback will be analyzed as soon as they are ready.")
 
         with st.form("feedback_form"):
             mood = st.radio(
@@ -1038,7 +4027,6 @@ def employee_dashboard():
                         "😫 Terrible": 1
                     }
                     mood_score = mood_mapping.get(mood, 3)
-                    analysis_result = analyze_feedback(feedback_text)
 
                     feedback_data = {
                         "id": str(uuid.uuid4()),
@@ -1051,16 +4039,12 @@ def employee_dashboard():
                         "team_satisfaction": team_satisfaction,
                         "management_satisfaction": management_satisfaction,
                         "feedback_text": feedback_text,
-                        "emotion": analysis_result.get("emotion"),
-                        "emotion_confidence": analysis_result.get("emotion_confidence"),
-                        "sentiment": analysis_result.get("sentiment"),
-                        "sentiment_confidence": analysis_result.get("sentiment_confidence"),
-                        "status": "pending"
+                        # Emotion and sentiment are filled in by the background analysis
+                        "status": "analyzing"
                     }
 
-                    if github_store.add_feedback(feedback_data):
-                        st.success("Thank you for your feedback!")
-                        time.sleep(2)
+                    if data_store.add_feedback(feedback_data):
+                        get_feedback_analyzer(data_store).schedule(data_store, feedback_data)
                         st.session_state["clear_feedback_form_next"] = True
                         st.rerun()
                     else:
@@ -1068,8 +4052,7 @@ def employee_dashboard():
 
     with tab2:
         st.subheader("Your Feedback History")
-        all_feedback = github_store.get_feedback()
-        employee_feedback = [f for f in all_feedback if f.get("emp_id") == st.session_state.employee_id]
+        employee_feedback = data_store.get_feedback_for_employee(st.session_state.employee_id)
 
         if not employee_feedback:
              st.info("You haven't submitted any feedback yet.")
@@ -1087,12 +4070,15 @@ def employee_dashboard():
                         st.markdown(f"**Management Support:** {feedback.get('management_satisfaction', 0)}/10")
 
                     with col2:
-                        sentiment = feedback.get("sentiment", "NEUTRAL")
-                        sentiment_class = "positive" if sentiment == "POSITIVE" else "negative" if sentiment == "NEGATIVE" else "neutral"
-                        st.markdown(f"**Sentiment:** <span class='{sentiment_class}'>{sentiment}</span>", unsafe_allow_html=True)
+                        if feedback.get("status") == "analyzing":
+                            st.markdown("**Sentiment:** ⏳ Analyzing...")
+                        else:
+                            sentiment = feedback.get("sentiment", "NEUTRAL")
+                            sentiment_class = "positive" if sentiment == "POSITIVE" else "negative" if sentiment == "NEGATIVE" else "neutral"
+                            st.markdown(f"**Sentiment:** <span class='{sentiment_class}'>{sentiment}</span>", unsafe_allow_html=True)
 
-                        emotion = feedback.get("emotion", "neutral")
-                        st.markdown(f"**Detected Emotion:** {emotion.capitalize()}")
+                            emotion = str(feedback.get("emotion") or "neutral")
+                            st.markdown(f"**Detected Emotion:** {emotion.capitalize()}")
 
                     st.markdown("**Your Feedback:**")
                     st.markdown(f"> {feedback.get('feedback_text', 'No text provided')}")
@@ -1124,6 +4110,8 @@ def clear_signup_form():
 # Admin dashboard
 def admin_dashboard():
     """Dashboard page for admin users"""
+    import pandas as pd
+    import plotly.express as px
     if not validate_session() or not st.session_state.get("admin_id"):
         logout()
         return
@@ -1134,10 +4122,7 @@ def admin_dashboard():
     unsafe_allow_html=True
 )
 
-    all_feedback = github_store.get_feedback()
-
-    for feedback in all_feedback:
-        notify_admin_if_priority_negative(feedback, send_to_hr_dashboard)
+    priority_alerts()
     
     # Tabs for different admin functions
     tab1, tab2, tab3 = st.tabs(["Sentiment Overview", "Employee Feedback", "Manage Employees"])
@@ -1145,65 +4130,55 @@ def admin_dashboard():
     with tab1:
         st.subheader("Employee Sentiment Overview")
         
-        # Get all feedback
-        all_feedback = github_store.get_feedback()
+        # Per-day, per-department totals instead of every feedback record
+        rollup = data_store.get_daily_feedback_rollup()
         
-        if not all_feedback:
+        if rollup.empty:
             st.info("No feedback data available yet.")
         else:
-            # Convert to DataFrame for easier analysis
-            df = pd.DataFrame(all_feedback)
-            
-            # Add date column
-            df['date'] = pd.to_datetime(df['timestamp']).dt.date
-            
-            # Recent data - last 30 days
-            today = datetime.datetime.now().date()
-            thirty_days_ago = today - datetime.timedelta(days=30)
-            recent_df = df[df['date'] >= thirty_days_ago]
-            
             # Department filter
-            unique_depts = list(df['dept'].unique())
+            unique_depts = sorted(rollup['dept'].dropna().unique())
             selected_dept = st.selectbox("Filter by Department", ["All"] + unique_depts)
             
             if selected_dept != "All":
-                filtered_df = df[df['dept'] == selected_dept]
-                recent_filtered_df = recent_df[recent_df['dept'] == selected_dept]
+                filtered = rollup[rollup['dept'] == selected_dept]
             else:
-                filtered_df = df
-                recent_filtered_df = recent_df
+                filtered = rollup
+            
+            def average(score, rows):
+                count = rows[f"{score}_count"].sum()
+                return rows[f"{score}_sum"].sum() / count if count else 0
             
             # Display stats
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                total_feedback = len(filtered_df)
+                total_feedback = int(filtered['feedback'].sum())
                 st.metric("Total Feedback", total_feedback)
             
             with col2:
-                avg_work_satisfaction = filtered_df['work_satisfaction'].mean() if 'work_satisfaction' in filtered_df else 0
+                avg_work_satisfaction = average('work_satisfaction', filtered)
                 st.metric("Avg Work Satisfaction", f"{avg_work_satisfaction:.1f}/10")
             
             with col3:
-                avg_team_satisfaction = filtered_df['team_satisfaction'].mean() if 'team_satisfaction' in filtered_df else 0
+                avg_team_satisfaction = average('team_satisfaction', filtered)
                 st.metric("Avg Team Satisfaction", f"{avg_team_satisfaction:.1f}/10")
             
             with col4:
-                avg_management_satisfaction = filtered_df['management_satisfaction'].mean() if 'management_satisfaction' in filtered_df else 0
+                avg_management_satisfaction = average('management_satisfaction', filtered)
                 st.metric("Avg Management Rating", f"{avg_management_satisfaction:.1f}/10")
             
             # Sentiment trend over time
             st.subheader("Sentiment Trend Over Time")
             
-            if 'date' in filtered_df and 'sentiment' in filtered_df:
-                # Group by date and sentiment
-                sentiment_by_date = filtered_df.groupby(['date', 'sentiment']).size().reset_index(name='count')
-                
-                # Pivot for plotting
-                sentiment_pivot = sentiment_by_date.pivot(index='date', columns='sentiment', values='count').fillna(0)
-                
-                # Sort by date
-                sentiment_pivot = sentiment_pivot.sort_index()
+            sentiment_columns = [column for column in filtered.columns if column.startswith("sentiment:")]
+            if sentiment_columns:
+                # Sentiment counts per date, leaving out sentiments and dates with none
+                sentiment_pivot = filtered.groupby('date')[sentiment_columns].sum()
+                sentiment_pivot = sentiment_pivot.loc[sentiment_pivot.any(axis=1), sentiment_pivot.any(axis=0)]
+                sentiment_pivot.columns = pd.Index(
+                    [column.split(":", 1)[1] for column in sentiment_pivot.columns], name='sentiment'
+                )
                 
                 # Plot
                 fig = px.line(sentiment_pivot, x=sentiment_pivot.index, y=sentiment_pivot.columns,
@@ -1215,9 +4190,14 @@ def admin_dashboard():
             # Emotion distribution
             st.subheader("Emotion Distribution")
             
-            if 'emotion' in filtered_df:
-                emotion_counts = filtered_df['emotion'].value_counts().reset_index()
-                emotion_counts.columns = ['emotion', 'count']
+            emotion_columns = [column for column in filtered.columns if column.startswith("emotion:")]
+            if emotion_columns:
+                emotion_totals = filtered[emotion_columns].sum()
+                emotion_totals = emotion_totals[emotion_totals > 0].sort_values(ascending=False)
+                emotion_counts = pd.DataFrame({
+                    'emotion': [column.split(":", 1)[1] for column in emotion_totals.index],
+                    'count': emotion_totals.values
+                })
                 
                 fig = px.pie(emotion_counts, values='count', names='emotion',
                             title="Distribution of Emotions in Feedback")
@@ -1225,12 +4205,16 @@ def admin_dashboard():
                 st.plotly_chart(fig, use_container_width=True)
             
             # Department comparison
-            if selected_dept == "All" and 'dept' in df:
+            if selected_dept == "All":
                 st.subheader("Department Comparison")
                 
-                dept_satisfaction = df.groupby('dept')[['work_satisfaction', 'team_satisfaction', 'management_satisfaction']].mean().reset_index()
+                dept_totals = rollup.groupby('dept').sum(numeric_only=True)
+                dept_satisfaction = pd.DataFrame({
+                    score: dept_totals[f"{score}_sum"] / dept_totals[f"{score}_count"].where(dept_totals[f"{score}_count"] > 0)
+                    for score in SATISFACTION_SCORES
+                }).reset_index()
                 
-                fig = px.bar(dept_satisfaction, x='dept', y=['work_satisfaction', 'team_satisfaction', 'management_satisfaction'],
+                fig = px.bar(dept_satisfaction, x='dept', y=SATISFACTION_SCORES,
                             title="Average Satisfaction by Department",
                             labels={"value": "Average Rating (1-10)", "variable": "Metric", "dept": "Department"},
                             barmode='group')
@@ -1240,33 +4224,33 @@ def admin_dashboard():
     with tab2:
         st.subheader("Employee Feedback")
         
-        # Get all feedback
-        all_feedback = github_store.get_feedback()
+        # The date bounds come from the store without reading every record
+        first_date, last_date = data_store.get_feedback_date_bounds()
         
-        if not all_feedback:
+        if first_date is None:
             st.info("No feedback data available yet.")
         else:
-            # Convert to DataFrame for filtering
-            df = pd.DataFrame(all_feedback)
-            
-            # Add date column
-            df['date'] = pd.to_datetime(df['timestamp']).dt.date
-            
             # Filters
             col1, col2, col3,col4 = st.columns(4)
             
-            with col1:
-                unique_depts = list(df['dept'].unique())
-                selected_dept = st.selectbox("Department", ["All"] + unique_depts)
-            
             with col2:
                 date_range = st.date_input(
                     "Date Range",
-                    value=(df['date'].min(), df['date'].max() if not df.empty else datetime.date.today()),
-                    min_value=df['date'].min() if not df.empty else None,
+                    value=(max(first_date, last_date - datetime.timedelta(days=30)), last_date),
+                    min_value=first_date,
                     max_value=datetime.date.today()
                 )
             
+            # Only the selected dates are loaded (with monthly shards, only their months);
+            # the typed frame is shared by every session until the feedback changes
+            start_date = date_range[0]
+            end_date = date_range[1] if len(date_range) == 2 else None
+            df = data_store.get_feedback_frame(start_date=start_date, end_date=end_date)
+            
+            with col1:
+                unique_depts = list(df['dept'].cat.categories)
+                selected_dept = st.selectbox("Department", ["All"] + unique_depts)
+            
             with col3:
                 sentiment_options = ["All", "POSITIVE", "NEGATIVE", "NEUTRAL"]
                 selected_sentiment = st.selectbox("Sentiment", sentiment_options)
@@ -1275,77 +4259,92 @@ def admin_dashboard():
                 status_options = ["All", "Pending", "complete"]
                 selected_status = st.selectbox("Status", status_options)
             
-            # Apply filters
-            filtered_df = df.copy()
-            # Normalize the status column and dropdown values for consistent comparison
-            if 'status' in filtered_df.columns:
-                filtered_df['status'] = filtered_df['status'].fillna("").str.lower()  # Normalize to lowercase
-                selected_status = selected_status.lower()  # Normalize dropdown value to lowercase
-
-            if selected_status != "all":
-                filtered_df = filtered_df[filtered_df['status'] == selected_status]
+            # Apply filters as one mask over the shared frame
+            mask = pd.Series(True, index=df.index)
 
             if selected_dept != "All":
-                filtered_df = filtered_df[filtered_df['dept'] == selected_dept]
-
-            if len(date_range) == 2:
-                start_date, end_date = date_range
-                filtered_df = filtered_df[(filtered_df['date'] >= start_date) & (filtered_df['date'] <= end_date)]
+                mask &= df['dept'] == selected_dept
 
             if selected_sentiment != "All":
-                filtered_df = filtered_df[filtered_df['sentiment'] == selected_sentiment]
+                mask &= df['sentiment'] == selected_sentiment
 
             if selected_status != "All":
-                # Ensure 'status' column exists and handle missing values
-                if 'status' in filtered_df.columns:
-                    filtered_df['status'] = filtered_df['status'].fillna("").astype(str)
-                    filtered_df = filtered_df[filtered_df['status'].str.lower() == selected_status.lower()]
-                else:
-                    st.error("The 'status' column is missing in the feedback data.")
-                    return
+                # Statuses compare case-insensitively, checked once per category rather than per row
+                statuses = [status for status in df['status'].cat.categories if str(status).lower() == selected_status.lower()]
+                mask &= df['status'].isin(statuses)
 
-            # Sort by timestamp (newest first)
-            filtered_df = filtered_df.sort_values(by='timestamp', ascending=False)
+            # Matching rows, newest first: the time order is sorted once per version of the feedback
+            order = get_shared_data_cache().derived("feedback_newest_first", df, newest_first)
+            matching = order[mask.to_numpy()[order]]
+            total = len(matching)
+            
+            # Only the current page is turned into records and rendered
+            page_size = st.selectbox("Feedback per page", [10, 25, 50, 100], index=1, key="feedback_page_size")
+            page_count = max(1, -(-total // page_size))
+            page_filters = (selected_dept, selected_sentiment, selected_status, tuple(date_range), page_size)
+            if st.session_state.get("feedback_page_filters") != page_filters:
+                st.session_state.feedback_page_filters = page_filters
+                st.session_state.feedback_page = 0
+            page = min(st.session_state.get("feedback_page", 0), page_count - 1)
+            first = page * page_size
             
             # Display feedback
-            if filtered_df.empty:
+            if total == 0:
                 st.info("No feedback matches the selected filters.")
             else:
-                for i, feedback in enumerate(filtered_df.to_dict(orient="records")):
-                    feedback_id = str(feedback.get("id", f"unknown_{i}"))  # Ensure feedback_id is a string
-                    emp_name = feedback.get("emp_id", "Anonymous")
-                    department = feedback.get("dept", "Unknown Department")
-                    date = feedback.get("timestamp", "Unknown Date")[:10]
-                    sentiment = feedback.get("sentiment", "N/A")
-                    sentiment_confidence = feedback.get("sentiment_confidence", 0.0)
-                    emotion = feedback.get("emotion", "Neutral")
-                    emotion_confidence = feedback.get("emotion_confidence", 0.0)
-                    text = feedback.get("feedback_text", "No feedback provided")
-                    status = feedback.get("status", "pending")
-                    work_satisfaction = feedback.get("work_satisfaction", 0)
-                    team_satisfaction = feedback.get("team_satisfaction", 0)
-                    management_satisfaction = feedback.get("management_satisfaction", 0)
+                col1, col2, col3 = st.columns([1, 3, 1])
+                with col1:
+                    st.button("Newer", disabled=page == 0, key="feedback_page_newer",
+                              on_click=lambda: setattr(st.session_state, "feedback_page", page - 1))
+                with col2:
+                    st.caption(f"Showing {first + 1}-{min(first + page_size, total)} of {total} feedback (page {page + 1} of {page_count})")
+                with col3:
+                    st.button("Older", disabled=page == page_count - 1, key="feedback_page_older",
+                              on_click=lambda: setattr(st.session_state, "feedback_page", page + 1))
+                
+                page_df = df.take(matching[first:first + page_size])
+                # Every column is in the frame, so missing values are NaN/NA; as None they get the defaults below
+                page_records = page_df.astype(object).where(page_df.notna(), None).to_dict(orient="records")
+                for i, feedback in enumerate(page_records):
+                    feedback_id = str(feedback.get("id") or f"unknown_{i}")  # Ensure feedback_id is a string
+                    emp_name = feedback.get("emp_id") or "Anonymous"
+                    department = feedback.get("dept") or "Unknown Department"
+                    date = feedback["timestamp"].strftime("%Y-%m-%d") if feedback["timestamp"] is not None else "Unknown Date"
+                    sentiment = feedback.get("sentiment") or "N/A"
+                    sentiment_confidence = feedback.get("sentiment_confidence") or 0.0
+                    emotion = str(feedback.get("emotion") or "Neutral")
+                    emotion_confidence = feedback.get("emotion_confidence") or 0.0
+                    text = feedback.get("feedback_text") or "No feedback provided"
+                    status = feedback.get("status") or "pending"
+                    work_satisfaction = feedback.get("work_satisfaction") or 0
+                    team_satisfaction = feedback.get("team_satisfaction") or 0
+                    management_satisfaction = feedback.get("management_satisfaction") or 0
 
                     with st.expander(f"Feedback from {department} on {date}"):
                         col1, col2 = st.columns([1, 3])
 
                         with col1:
                             st.markdown(f"**Employee:** {emp_name}")
-                            st.markdown(f"**Mood:** {feedback.get('mood', 'Unknown')}")
+                            st.markdown(f"**Mood:** {feedback.get('mood') or 'Unknown'}")
                             st.markdown(f"**Work Satisfaction:** {work_satisfaction}/10")
                             st.markdown(f"**Team Collaboration:** {team_satisfaction}/10")
                             st.markdown(f"**Management Support:** {management_satisfaction}/10")
 
                         with col2:
-                            st.markdown(f"**Feedback Content:**")
+                            st.markdown("**Feedback Content:**")
                             st.markdown(f"> {text}")
-                            st.markdown(f"**Sentiment Analysis:** {sentiment} ({sentiment_confidence:.2f})")
-                            st.markdown(f"**Emotion Detection:** {emotion.capitalize()} ({emotion_confidence:.2f})")
+                            if status == "analyzing":
+                                st.markdown("**Sentiment Analysis:** ⏳ Analyzing...")
+                            else:
+                                st.markdown(f"**Sentiment Analysis:** {sentiment} ({sentiment_confidence:.2f})")
+                                st.markdown(f"**Emotion Detection:** {emotion.capitalize()} ({emotion_confidence:.2f})")
 
                         # Only show "Mark Complete" button if status is pending
-                        if status == "pending":
+                        if status == "analyzing":
+                            st.markdown("**Status:** ⏳ Analyzing")
+                        elif status == "pending":
                             if st.button(f"Mark Complete (ID: {feedback_id})", key=f"mark_complete_{feedback_id}_{i}"):
-                                success = github_store.update_feedback(feedback_id, {"status": "complete", "alert_shown": True})
+                                success = data_store.update_feedback(feedback_id, {"status": "complete", "alert_shown": True})
                                 if success:
                                     st.success(f"Feedback ID {feedback_id} marked as complete!")
                                     st.rerun()
@@ -1357,31 +4356,49 @@ def admin_dashboard():
     with tab3:
         st.subheader("Manage Employees")
         
-        # Get all employees
-        employees = github_store.get_employees()
+        col1, col2, col3 = st.columns([2, 3, 1])
+        
+        # Filter by department and search by name or ID
+        with col1:
+            selected_dept = st.selectbox("Filter by Department", ["All"] + data_store.get_employee_departments(), key="emp_dept_filter")
+        with col2:
+            search_term = st.text_input("Search by Name or Employee ID", key="emp_search")
+        with col3:
+            page_size = st.selectbox("Per page", [10, 25, 50, 100], index=1, key="emp_page_size")
+        
+        page_filters = (selected_dept, search_term, page_size)
+        if st.session_state.get("emp_page_filters") != page_filters:
+            st.session_state.emp_page_filters = page_filters
+            st.session_state.emp_page = 0
+        page = st.session_state.get("emp_page", 0)
+        dept = None if selected_dept == "All" else selected_dept
+        
+        # Only the current page of the name-sorted matches is fetched
+        total, employees = data_store.search_employees(search_term, dept, page * page_size, page_size)
+        page_count = max(1, -(-total // page_size))
+        if page >= page_count:
+            page = page_count - 1
+            total, employees = data_store.search_employees(search_term, dept, page * page_size, page_size)
         
-        # Convert to DataFrame for display
         if employees:
+            # Feedback counts for the employees on this page only
             emp_df = pd.DataFrame(employees)
-            
-            # Add creation date if available
-            if 'created_at' in emp_df:
-                emp_df['created_date'] = pd.to_datetime(emp_df['created_at']).dt.date
-            
-            # Filter by department
-            unique_depts = list(emp_df['dept'].unique()) if 'dept' in emp_df else []
-            selected_dept = st.selectbox("Filter by Department", ["All"] + unique_depts, key="emp_dept_filter")
-            
-            if selected_dept != "All":
-                emp_df = emp_df[emp_df['dept'] == selected_dept]
-            
-            # Sort by name
-            if 'name' in emp_df:
-                emp_df = emp_df.sort_values(by='name')
+            emp_df = join_feedback_summary(emp_df, data_store.get_employee_feedback_summary(list(emp_df['emp_id'])))
             
             # Display employees
             st.subheader("Employee Directory")
             
+            first = page * page_size
+            col1, col2, col3 = st.columns([1, 3, 1])
+            with col1:
+                st.button("Previous", disabled=page == 0, key="emp_page_previous",
+                          on_click=lambda: setattr(st.session_state, "emp_page", page - 1))
+            with col2:
+                st.caption(f"Showing {first + 1}-{first + len(employees)} of {total} employees (page {page + 1} of {page_count})")
+            with col3:
+                st.button("Next", disabled=page == page_count - 1, key="emp_page_next",
+                          on_click=lambda: setattr(st.session_state, "emp_page", page + 1))
+            
             for _, employee in emp_df.iterrows():
                 with st.expander(f"{employee.get('name')} - {employee.get('dept')}", expanded=False):
                     col1, col2 = st.columns([1, 3])
@@ -1391,20 +4408,16 @@ def admin_dashboard():
                         st.markdown(f"**Employee ID:** {employee.get('emp_id')}")
                         st.markdown(f"**Department:** {employee.get('dept')}")
                         
-                        if 'created_at' in employee:
+                        if pd.notna(employee.get('created_at')):
                             created_date = datetime.datetime.fromisoformat(employee.get('created_at')).strftime("%Y-%m-%d")
                             st.markdown(f"**Joined:** {created_date}")
                         
-                        # Count feedback submissions
-                        all_feedback = github_store.get_feedback()
-                        emp_feedback = [f for f in all_feedback if f.get('emp_id') == employee.get('emp_id')]
-                        
-                        st.markdown(f"**Feedback Submissions:** {len(emp_feedback)}")
+                        st.markdown(f"**Feedback Submissions:** {employee['submissions']}")
                         
                         # Calculate average sentiment
-                        if emp_feedback:
-                            positive_count = sum(1 for f in emp_feedback if f.get('sentiment') == 'POSITIVE')
-                            negative_count = sum(1 for f in emp_feedback if f.get('sentiment') == 'NEGATIVE')
+                        if employee['submissions']:
+                            positive_count = employee['positive']
+                            negative_count = employee['negative']
                             
                             if positive_count > negative_count:
                                 st.markdown("**Overall Sentiment:** <span class='positive'>Mostly Positive</span>", unsafe_allow_html=True)
@@ -1412,6 +4425,8 @@ def admin_dashboard():
                                 st.markdown("**Overall Sentiment:** <span class='negative'>Mostly Negative</span>", unsafe_allow_html=True)
                             else:
                                 st.markdown("**Overall Sentiment:** <span class='neutral'>Mixed or Neutral</span>", unsafe_allow_html=True)
+        elif search_term or dept is not None:
+            st.info("No employees match the search.")
         else:
             st.info("No employees registered yet.")
         
@@ -1421,10 +4436,11 @@ def admin_dashboard():
 # Admin delete employee page
 def admin_delete_employee_page():
     """Admin page for deleting employees."""
+    import pandas as pd
     st.markdown("""<h1 style = "font-family : gabriola;color:Red;justify-content:center;text-align:center">Delete employee records only when the employee is no longer with the organization.</h1""", unsafe_allow_html=True)
     st.markdown("""<h6 class="glow-text" style = 'color:red;text-align:center;'>Remove an employee and all their feedback from the system.</h6>""",unsafe_allow_html=True)
 
-    employees = github_store.get_employees()
+    employees = data_store.get_employees()
     emp_df = pd.DataFrame(employees) if employees else pd.DataFrame()
 
     if not emp_df.empty:
@@ -1459,9 +4475,8 @@ def admin_delete_employee_page():
                 col_confirm, col_cancel = st.columns(2)
                 with col_confirm:
                     if st.button("Yes, Delete", key="confirm_delete_emp_btn_page"):
-                        github_store.delete_employee(emp_id)
+                        data_store.delete_employee(emp_id)
                         st.success(f"Employee {emp['name']} deleted.")
-                        st.session_state.pop("data_cache", None)  # Clear cache to force fresh fetch
                         del st.session_state["confirm_delete_emp_id_page"]
                         st.rerun()
                 with col_cancel:
@@ -1490,7 +4505,8 @@ def admin_add_employee_page():
         with col_submit:
             submit = st.form_submit_button("Add Employee")
         with col_clear:
-            clear = st.form_submit_button("Clear Form", on_click=clear_employee_form)
+            # The on_click callback does the clearing
+            st.form_submit_button("Clear Form", on_click=clear_employee_form)
 
         if submit:
             if not new_emp_id or not new_name or not new_dept or not new_password:
@@ -1498,7 +4514,7 @@ def admin_add_employee_page():
             elif len(new_password) < 8:
                 st.error("Password must be at least 8 characters long.")
             else:
-                existing_emp = github_store.get_employee(new_emp_id)
+                existing_emp = data_store.get_employee(new_emp_id)
                 if existing_emp:
                     st.error("Employee ID already exists.")
                 else:
@@ -1508,7 +4524,7 @@ def admin_add_employee_page():
                         "dept": new_dept,
                         "password": hash_password(new_password)
                     }
-                    github_store.add_employee(employee_data)
+                    data_store.add_employee(employee_data)
                     st.success(f"Employee {new_name} added successfully!")
                     time.sleep(2)
                     st.session_state["clear_employee_form_next"] = True
@@ -1595,7 +4611,7 @@ def main():
         st.session_state.page = "landing"
     
     # Check if admin exists, if not, redirect to admin setup
-    if not admin_exists() and st.session_state.page == "landing":
+    if st.session_state.page == "landing" and not admin_exists():
         st.session_state.page = "admin_setup"
     
     # Route to appropriate page based on session state
@@ -1663,6 +4679,28 @@ def main():
                 st.rerun()
             if st.button("Admin Logout", key="nav_admin_logout"):
                 logout()
+            
+            cache_stats = data_store.get_cache_stats()
+            if cache_stats:
+                st.caption(
+                    f"Data cache: {cache_stats['hits']} hits, {cache_stats['misses']} downloads, "
+                    f"{cache_stats['not_modified']}/{cache_stats['revalidations']} revalidations unchanged"
+                )
+            classifier_loader = load_classifiers()
+            if classifier_loader.error is not None:
+                st.caption("Emotion models: failed to load")
+            elif classifier_loader.ready:
+                st.caption(f"Emotion models: loaded in {classifier_loader.load_seconds:.1f}s")
+            else:
+                st.caption("Emotion models: loading...")
+            inference_cache = get_inference_cache()
+            if inference_cache is not None:
+                inference_stats = inference_cache.stats()
+                st.caption(
+                    f"Inference cache: {inference_stats['hit_rate']:.0%} hit rate "
+                    f"({inference_stats['hits']} hits, {inference_stats['misses']} misses, "
+                    f"{inference_stats['entries']} stored)"
+                )
         else:
             if st.button("Home", key="nav_home"):
                 st.session_state.page = "landing"
@@ -1687,14 +4725,19 @@ def main():
         # Add app info
         st.markdown("---")
         st.markdown("### About EmpathyPulse")
-        #st.write("Admins:", github_store.get_admins())
+        #st.write("Admins:", data_store.get_admins())
         st.markdown("Version 1.0.0")
         st.markdown("© 2025 EmpathyPulse")
+    
+    # With the page out, start loading the models and resume any analyses
+    # a restart interrupted
+    get_feedback_analyzer(data_store)
 
     #st.write("Admin Exists:", admin_exists())
 
 def admin_export_page():
     """Admin data export page."""
+    import pandas as pd
     st.markdown("""<h1 class="glow-text" style = 'color:red;font-family:gabriola;font-size:50px;text-align:center;'>HR Dashboard - Employee Sentiment Monitoring</h1>""", unsafe_allow_html=True)
     st.markdown("""<h6 style = 'font-family:gabriola;font-size:30px'>Export Data</h6>""", unsafe_allow_html=True)
 
@@ -1705,84 +4748,493 @@ def admin_export_page():
 
     if st.button(button_label):
         if export_type == "Employee Feedback":
-            data = github_store.get_feedback()
+            df = data_store.get_feedback_frame()
         elif export_type == "Employee Directory":
-            data = github_store.get_employees()
+            employees = data_store.get_employees()
+            df = join_feedback_summary(pd.DataFrame(employees), data_store.get_employee_feedback_summary()) if employees else pd.DataFrame()
         elif export_type == "Department Summary":
             # Summarize department stats
-            feedback = github_store.get_feedback()
-            df = pd.DataFrame(feedback)
-            if df.empty:
+            feedback = data_store.get_feedback_frame(["dept"] + SATISFACTION_SCORES)
+            if feedback.empty:
                 st.warning("No feedback data available for summary.")
                 return
-            summary = df.groupby("dept")[["work_satisfaction", "team_satisfaction", "management_satisfaction"]].mean().reset_index()
+            summary = feedback.groupby("dept", observed=True)[SATISFACTION_SCORES].mean().reset_index()
             summary.columns = ["Department", "Avg Work Satisfaction", "Avg Team Collaboration", "Avg Management Support"]
-            data = summary.to_dict(orient="records")
+            df = summary
 
-        if data:
-            df = pd.DataFrame(data)
+        if not df.empty:
             csv = df.to_csv(index=False).encode("utf-8")
             st.download_button(label=button_label, data=csv, file_name=f"{export_type.replace(' ', '_')}.csv", mime="text/csv")
         else:
             st.warning("No data available to export.")
 
 
-def send_to_hr_dashboard(alert_info):
-    """Display alert in the HR dashboard UI using Streamlit."""
-    with st.container():
-        st.error(f"🚨 {alert_info['title']}")
-        st.markdown(alert_info['message'])
+# Priority alerts for negative feedback
+DEPARTMENT_ALERT_WEIGHTS = {
+    "HR": 0.1,
+    "Engineering": 0.4,
+    "Sales": 0.3,
+    "Support": 0.2,
+    "Marketing": 0.3,
+    "Finance": 0.2,
+    "Operations": 0.2,
+    "Research": 0.3,
+}
 
+def score_priority_alerts(feedback_list, threshold=0.7):
+    """
+    Score all undismissed negative feedback at once
+    
+    The priority score is the sentiment confidence (0.5 if missing) plus the
+    department weight (0.2 for unlisted departments).
+    
+    Returns:
+    --------
+    pd.DataFrame
+        id, emp_id, dept and priority_score of the feedback at or above threshold
+    """
+    import pandas as pd
+    columns = ["id", "emp_id", "dept", "sentiment", "sentiment_confidence", "alert_shown", "status"]
+    df = pd.DataFrame(feedback_list, columns=columns)
+    
+    shown = df["alert_shown"].notna() & df["alert_shown"].astype(bool)
+    pending = df["sentiment"].fillna("").astype(str).str.lower().eq("negative") & ~shown & df["status"].ne("complete")
+    df = df[pending]
+    
+    priority_score = (
+        pd.to_numeric(df["sentiment_confidence"], errors="coerce").fillna(0.5)
+        + df["dept"].map(DEPARTMENT_ALERT_WEIGHTS).fillna(0.2)
+    )
+    df = df.assign(priority_score=priority_score)
+    return df.loc[df["priority_score"] >= threshold, ["id", "emp_id", "dept", "priority_score"]]
 
-def notify_admin_if_priority_negative(feedback_data, admin_notifier, threshold=0.7):
+class AlertEngine:
     """
-    Notify HR admin if an employee gives a negative sentiment review with high priority.
-    Marks feedback with 'alert_shown': True after notification.
+    Set of open priority alerts, kept in step with the feedback list
+    
+    Each new version of the feedback list is diffed against the previous one
+    and only new or changed records are scored, so a dashboard rerun costs
+    about as much as the number of open alerts rather than the history.
     """
-    if feedback_data.get('sentiment', '').lower() != 'negative':
-        return
+    
+    def __init__(self, threshold=0.7):
+        """Create an empty engine alerting at or above threshold"""
+        import pandas as pd
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._feedback = None
+        self._open = {}
+        self._employees = None
+        self._names = pd.Series(dtype=object)
+    
+    def open_alerts(self, feedback_list, employees):
+        """
+        Get the open alerts with the employee names resolved
+        
+        Returns:
+        --------
+        pd.DataFrame
+            id, emp_id, dept, priority_score and name of each open alert
+        """
+        import pandas as pd
+        with self._lock:
+            self._sync(feedback_list)
+            if employees is not self._employees:
+                self._names = pd.Series(
+                    {e.get("emp_id"): e.get("name", e.get("emp_id")) for e in employees}, dtype=object
+                )
+                self._employees = employees
+            alerts = pd.DataFrame(list(self._open.values()), columns=["id", "emp_id", "dept", "priority_score"])
+            names = self._names
+        
+        # Feedback without an emp_id is anonymous; unknown employees show their ID
+        alerts["name"] = alerts["emp_id"].map(names).fillna(alerts["emp_id"]).fillna("Anonymous")
+        return alerts
+    
+    def notify(self, feedback):
+        """
+        Rescore one record right after it changed (e.g. its analysis finished)
+        
+        The alert opens without waiting for the next feedback list; when that
+        list arrives the record is rescored along with the other changes.
+        
+        Returns:
+        --------
+        bool
+            True if the record has an open alert
+        """
+        alerts = score_priority_alerts([feedback], self.threshold).to_dict(orient="records")
+        with self._lock:
+            self._open.pop(str(feedback.get("id")), None)
+            for alert in alerts:
+                self._open[str(alert["id"])] = alert
+        return bool(alerts)
+    
+    def _sync(self, feedback_list):
+        """Rescore the feedback that changed since the last call"""
+        if feedback_list is self._feedback:
+            return
+        
+        changes = diff_records(self._feedback or [], feedback_list, "id")
+        if changes is None:
+            self._open = {}
+            changed = feedback_list
+        else:
+            changed = [new for _, new in changes]
+        
+        if changed:
+            for feedback in changed:
+                self._open.pop(str(feedback.get("id")), None)
+            for alert in score_priority_alerts(changed, self.threshold).to_dict(orient="records"):
+                self._open[str(alert["id"])] = alert
+        self._feedback = feedback_list
 
-    if feedback_data.get('alert_shown') or feedback_data.get('status') == 'complete':
-        return
+@st.cache_resource
+def get_alert_engine() -> AlertEngine:
+    """Get the alert engine shared by all admin sessions"""
+    return AlertEngine()
 
-    base_priority = feedback_data.get('sentiment_confidence', 0.5)
-
-    department_weights = {
-        "HR": 0.1,
-        "Engineering": 0.4,
-        "Sales": 0.3,
-        "Support": 0.2,
-        "Marketing": 0.3,
-        "Finance": 0.2,
-        "Operations": 0.2,
-        "Research": 0.3,
-    }
+@st.fragment(run_every=datetime.timedelta(seconds=15))
+def priority_alerts():
+    """Show the open alerts, refreshed on their own so analyses finishing in the background show up"""
+    open_alerts = get_alert_engine().open_alerts(data_store.get_feedback(), data_store.get_employees())
+    for alert in open_alerts.itertuples(index=False):
+        show_priority_alert(alert)
 
-    dept_weight = department_weights.get(feedback_data.get('dept', ''), 0.2)
-    priority_score = base_priority + dept_weight
+def show_priority_alert(alert):
+    """Show one open alert on the admin dashboard, with a button to dismiss it"""
+    with st.container():
+        st.error(f"🚨 High Priority Alert: {alert.name}")
+        st.markdown(f"""
+        **{alert.name}** from **{alert.dept if isinstance(alert.dept, str) else 'Unknown'}** has shown **negative sentiment**.
 
-    if priority_score >= threshold:
-        emp_id = feedback_data.get('emp_id')
-        name = "Anonymous"
-        if emp_id:
-            employee = github_store.get_employee(emp_id)
-            name = employee.get('name', emp_id) if employee else emp_id
+        **Priority Score:** {alert.priority_score:.2f}
+        """)
 
-        # Show alert with dismiss option
-        with st.container():
-            st.error(f"🚨 High Priority Alert: {name}")
-            st.markdown(f"""
-            **{name}** from **{feedback_data.get('dept', 'Unknown')}** has shown **negative sentiment**.
+        if st.button(f"Dismiss Alert (ID: {alert.id})", key=f"dismiss_{alert.id}"):
+            data_store.update_feedback(alert.id, {"alert_shown": True})
+            st.success("Alert dismissed.")
+            st.rerun()
 
-            **Priority Score:** {priority_score:.2f}
-            """)
 
-            if st.button(f"Dismiss Alert (ID: {feedback_data.get('id')})", key=f"dismiss_{feedback_data.get('id')}"):
-                github_store.update_feedback(feedback_data.get('id'), {"alert_shown": True})
-                st.success("Alert dismissed.")
-                st.rerun()
+# Command-line tools
+def current_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def benchmark_inference(modes, texts, batch_sizes, **model_options):
+    """
+    Load each inference mode in turn and time it on texts
+    
+    Parameters:
+    -----------
+    modes : list
+        inference_mode values to compare
+    texts : list
+        Feedback texts to analyze
+    batch_sizes : list
+        Batch sizes to run the texts in
+    model_options :
+        Passed on to build_classifier (model names, multihead_path)
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Per mode and batch size: load time, memory added by loading the
+        models, throughput, p50/p99 latency per batch, and how far its
+        results are from the first mode's (label agreement, largest score
+        difference)
+    """
+    import pandas as pd
+    # Imported before timing, so load_s and rss_added_mb cover the models only
+    for module in ["torch", "transformers.pipelines"]:
+        importlib.import_module(module)
+    rows = []
+    reference = None
+    for mode in modes:
+        gc.collect()
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        mode_classifier = build_classifier(mode, **model_options)
+        load_seconds = time.perf_counter() - start
+        
+        # Weights are memory-mapped, so measure after a warm-up has touched them
+        mode_classifier(texts[:max(batch_sizes)])
+        rss_after = current_rss_mb()
+        for batch_size in batch_sizes:
+            latencies = []
+            results = []
+            for i in range(0, len(texts), batch_size):
+                start = time.perf_counter()
+                results.extend(mode_classifier(texts[i:i + batch_size]))
+                latencies.append(time.perf_counter() - start)
+            latencies = pd.Series(latencies)
+            
+            if reference is None:
+                reference = results
+            agreement = sum(
+                r["emotion"] == ref["emotion"] and r["sentiment"] == ref["sentiment"]
+                for r, ref in zip(results, reference)
+            ) / len(results)
+            score_difference = max(
+                max(abs(r["emotion_confidence"] - ref["emotion_confidence"]),
+                    abs(r["sentiment_confidence"] - ref["sentiment_confidence"]))
+                for r, ref in zip(results, reference)
+            )
+            rows.append({
+                "mode": mode,
+                "batch_size": batch_size,
+                "load_s": round(load_seconds, 2),
+                "rss_added_mb": round(rss_after - rss_before) if rss_before is not None else None,
+                "texts_per_s": round(len(texts) / latencies.sum(), 1),
+                "p50_ms": round(latencies.quantile(0.5) * 1000, 1),
+                "p99_ms": round(latencies.quantile(0.99) * 1000, 1),
+                "label_agreement": round(agreement, 3),
+                "max_score_diff": round(score_difference, 4),
+            })
+        del mode_classifier
+    return pd.DataFrame(rows)
+
+def iter_month_ranges(first_date, last_date):
+    """Yield (start, end) dates of each calendar month from first_date's to last_date's"""
+    month_start = first_date.replace(day=1)
+    while month_start <= last_date:
+        next_month = (month_start + datetime.timedelta(days=32)).replace(day=1)
+        yield month_start, next_month - datetime.timedelta(days=1)
+        month_start = next_month
+
+def reanalyze_feedback(store, classifier, batch_size=32, workers=2, commit_every=500,
+                       checkpoint_path=".empathypulse_reanalyze.jsonl", restart=False,
+                       cache=None, start_date=None, end_date=None, report=print):
+    """
+    Re-run the classifier over stored feedback and write the results back in bulk
+    
+    Feedback is read one month at a time and analyzed in batches of
+    batch_size on a pool of worker threads. Every commit_every records the
+    results are saved with one update_feedback_bulk call and their IDs are
+    appended to the checkpoint file, so an interrupted run continues where
+    it stopped. A checkpoint from a different model version is ignored.
+    
+    Returns:
+    --------
+    dict
+        Records updated, records skipped (no text or already done), seconds
+        taken and records per second
+    """
+    done = set()
+    if os.path.exists(checkpoint_path) and not restart:
+        with open(checkpoint_path) as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") == classifier.version:
+                for line in f:
+                    done.update(json.loads(line))
+        if done:
+            report(f"Resuming: {len(done)} records already done")
+    if not done:
+        with open(checkpoint_path, "w") as f:
+            f.write(json.dumps({"version": classifier.version}) + "\n")
+    
+    first_date, last_date = store.get_feedback_date_bounds()
+    if first_date is None:
+        return {"updated": 0, "skipped": 0, "seconds": 0.0, "records_per_s": 0.0}
+    first_date = max(first_date, start_date) if start_date else first_date
+    last_date = min(last_date, end_date) if end_date else last_date
+    
+    def analyze(batch):
+        results = classify_texts(classifier, [f["feedback_text"] for f in batch], cache)
+        return {
+            f["id"]: {**result, **({"status": "pending"} if f.get("status") == "analyzing" else {})}
+            for f, result in zip(batch, results)
+        }
+    
+    def commit(updates):
+        if not store.update_feedback_bulk(updates):
+            raise RuntimeError("Saving re-analyzed feedback failed; run again to resume")
+        with open(checkpoint_path, "a") as f:
+            f.write(json.dumps(list(updates)) + "\n")
+    
+    updated = skipped = 0
+    pending_updates = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="empathypulse-reanalyze") as pool:
+        for month_start, month_end in iter_month_ranges(first_date, last_date):
+            todo = []
+            for feedback in store.get_feedback(max(month_start, first_date), min(month_end, last_date)):
+                if feedback.get("feedback_text") and str(feedback.get("id")) not in done:
+                    todo.append(feedback)
+                else:
+                    skipped += 1
+            
+            batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+            for results in pool.map(analyze, batches):
+                pending_updates.update(results)
+                if len(pending_updates) >= commit_every:
+                    commit(pending_updates)
+                    updated += len(pending_updates)
+                    pending_updates = {}
+                    elapsed = time.perf_counter() - start
+                    report(f"{updated} records updated, {updated / elapsed:.1f} records/s")
+        
+        if pending_updates:
+            commit(pending_updates)
+            updated += len(pending_updates)
+    
+    elapsed = time.perf_counter() - start
+    return {
+        "updated": updated,
+        "skipped": skipped,
+        "seconds": round(elapsed, 1),
+        "records_per_s": round(updated / elapsed, 1) if elapsed else 0.0
+    }
+
+# Run in a fresh interpreter by benchmark_startup: prints the seconds until
+# the first script run has rendered, then until the models have loaded
+STARTUP_PROBE = """
+import sys, threading, time
+from streamlit.testing.v1 import AppTest
+script_path, page = sys.argv[1:3]
+app = AppTest.from_file(script_path, default_timeout=600)
+app.session_state["page"] = page
+print("-- app start --", file=sys.stderr, flush=True)
+start = time.perf_counter()
+app.run()
+print(time.perf_counter() - start)
+print("-- first paint --", file=sys.stderr, flush=True)
+for thread in threading.enumerate():
+    if thread.name == "empathypulse-model-loader":
+        thread.join()
+print(time.perf_counter() - start)
+"""
+
+def benchmark_startup(script_path: str, runs: int = 3, page: str = "login", top: int = 15) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Time cold starts of the app, each in a new Python process
+    
+    One more start runs under `python -X importtime` to profile the
+    imports the first script run triggers.
+    
+    Parameters:
+    -----------
+    page : str
+        Page the session starts on (the value of st.session_state.page)
+    top : int
+        Number of packages in the import profile
+    
+    Returns:
+    --------
+    tuple
+        Per run: seconds until `page` has been rendered (first_paint_s) and
+        until the emotion models are ready (models_ready_s); and the
+        packages that took longest to import, with their own import time
+    """
+    import pandas as pd
+    rows = []
+    for run in range(1, runs + 1):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE, script_path, page],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        rows.append({"run": run, "first_paint_s": round(float(output[-2]), 2), "models_ready_s": round(float(output[-1]), 2)})
+    
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    profile = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_PROBE, script_path, page],
+        capture_output=True, text=True, check=True
+    ).stderr.split("-- app start --")[-1].split("-- first paint --")[0]
+    import_us = {}
+    for line in profile.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line[len("import time:"):].split("|")
+            if self_us.strip().isdigit():
+                package = name.strip().split(".")[0]
+                import_us[package] = import_us.get(package, 0) + int(self_us)
+    imports = pd.DataFrame(
+        [{"package": package, "import_ms": round(us / 1000, 1)} for package, us in import_us.items()],
+        columns=["package", "import_ms"]
+    ).sort_values("import_ms", ascending=False).head(top)
+    return pd.DataFrame(rows), imports
 
+def run_cli(argv):
+    """Entry point for `python empathypulse_final.py <command>`"""
+    parser = argparse.ArgumentParser(prog="empathypulse_final.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    bench = commands.add_parser("benchmark-inference", help="Compare latency and memory of the inference modes")
+    bench.add_argument("--modes", nargs="+", default=["pipelines", "shared"],
+                       help="inference modes to compare (add multihead with --multihead-path)")
+    bench.add_argument("--feedback-file", default="data/feedback.json",
+                       help="feedback JSON whose texts are analyzed")
+    bench.add_argument("--count", type=int, default=256, help="number of texts to analyze")
+    bench.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 16])
+    bench.add_argument("--emotion-model", default=EMOTION_MODEL)
+    bench.add_argument("--sentiment-model", default=SENTIMENT_MODEL)
+    bench.add_argument("--multihead-path")
+    bench.add_argument("--onnx-dir", default=".empathypulse_onnx")
+    
+    startup = commands.add_parser("benchmark-startup", help="Time cold starts until the first page renders")
+    startup.add_argument("--runs", type=int, default=3)
+    startup.add_argument("--page", default="login", help="page to open (landing, login, signup, ...)")
+    
+    reanalyze = commands.add_parser("reanalyze", help="Recompute emotion and sentiment for stored feedback")
+    reanalyze.add_argument("--batch-size", type=int, default=32, help="texts per inference batch")
+    reanalyze.add_argument("--workers", type=int, default=2, help="inference threads")
+    reanalyze.add_argument("--commit-every", type=int, default=500, help="records per bulk commit")
+    reanalyze.add_argument("--checkpoint", default=".empathypulse_reanalyze.jsonl")
+    reanalyze.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    reanalyze.add_argument("--since", type=datetime.date.fromisoformat, help="first date (YYYY-MM-DD) to re-analyze")
+    reanalyze.add_argument("--until", type=datetime.date.fromisoformat, help="last date (YYYY-MM-DD) to re-analyze")
+    
+    args = parser.parse_args(argv)
+    if args.command == "reanalyze":
+        classifier_loader = load_classifiers()
+        classifier = classifier_loader.wait()
+        if classifier is None:
+            sys.exit(f"The emotion models could not be loaded: {classifier_loader.error}")
+        summary = reanalyze_feedback(
+            data_store, classifier,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            commit_every=args.commit_every,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+            cache=get_inference_cache(),
+            start_date=args.since,
+            end_date=args.until
+        )
+        print(
+            f"Done: {summary['updated']} records updated, {summary['skipped']} skipped "
+            f"in {summary['seconds']}s ({summary['records_per_s']} records/s)"
+        )
+    elif args.command == "benchmark-inference":
+        with open(args.feedback_file) as f:
+            sample = [fb["feedback_text"] for fb in json.load(f) if fb.get("feedback_text")]
+        if not sample:
+            sys.exit("No feedback text to benchmark")
+        texts = [sample[i % len(sample)] for i in range(args.count)]
+        results = benchmark_inference(
+            args.modes, texts, args.batch_sizes,
+            emotion_model=args.emotion_model,
+            sentiment_model=args.sentiment_model,
+            multihead_path=args.multihead_path,
+            onnx_dir=args.onnx_dir
+        )
+        print(results.to_string(index=False))
+    elif args.command == "benchmark-startup":
+        timings, imports = benchmark_startup(os.path.abspath(__file__), args.runs, args.page)
+        print(timings.to_string(index=False))
+        print(f"\nSlowest imports during the first run of the {args.page} page:")
+        print(imports.to_string(index=False))
 
 # Run the application
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # `streamlit run` and AppTest run this as __main__ too, with their own argv;
+    # only a plain `python empathypulse_final.py <command>` has no script run context
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    if get_script_run_ctx(suppress_warning=True) is None and len(sys.argv) > 1:
+        run_cli(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import json
+import threading
+
+import pytest
+
+import empathypulse_final as ep
+
+DATA_FILES = ["data/employees.json", "data/admins.json", "data/feedback.json", "data/password_reset.json"]
+
+
+class FakeResponse:
+    """The parts of requests.Response the data store reads"""
+
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body if body is not None else {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeGitHub:
+    """
+    In-memory GitHub contents API, used as the data store's HTTP session
+
+    Files are kept as text with a SHA that changes with every write, and a
+    write on top of a stale SHA is rejected with `stale_status` like GitHub
+    rejects it.
+    """
+
+    def __init__(self, files=None):
+        self.files = {}
+        self.requests = []
+        self.stale_status = 409
+        self._lock = threading.Lock()
+        for path, data in (files or {}).items():
+            self.write(path, json.dumps(data))
+
+    def write(self, path, text):
+        """Commit text to a file directly, as another writer would"""
+        sha = hashlib.sha1(f"{path}\n{text}".encode()).hexdigest()
+        self.files[path] = (text, sha)
+        return sha
+
+    def data(self, path):
+        """Parsed content of a JSON file"""
+        return json.loads(self.files[path][0])
+
+    def count(self, method, path):
+        """Number of requests of one method made for a path"""
+        return self.requests.count((method, path))
+
+    def mount(self, prefix, adapter):
+        pass
+
+    @staticmethod
+    def _path(url):
+        return url.split("/contents/", 1)[1]
+
+    def get(self, url, headers=None):
+        path = self._path(url)
+        with self._lock:
+            self.requests.append(("GET", path))
+            if path in self.files:
+                text, sha = self.files[path]
+                etag = f'"{sha}"'
+                if (headers or {}).get("If-None-Match") == etag:
+                    return FakeResponse(304, headers={"ETag": etag})
+                body = {"content": base64.b64encode(text.encode()).decode(), "sha": sha}
+                return FakeResponse(200, body, {"ETag": etag})
+            prefix = path + "/"
+            listing = [
+                {"name": name[len(prefix):], "sha": sha, "type": "file"}
+                for name, (_, sha) in sorted(self.files.items())
+                if name.startswith(prefix) and "/" not in name[len(prefix):]
+            ]
+            if listing:
+                return FakeResponse(200, listing, {"ETag": f'"{hash(json.dumps(listing))}"'})
+            return FakeResponse(404, {"message": "Not Found"})
+
+    def put(self, url, headers=None, json=None):
+        path = self._path(url)
+        with self._lock:
+            self.requests.append(("PUT", path))
+            current = self.files.get(path)
+            if json.get("sha") != (current[1] if current else None):
+                return FakeResponse(self.stale_status if current else 422, {"message": "sha does not match"})
+            sha = self.write(path, base64.b64decode(json["content"]).decode())
+            return FakeResponse(200 if current else 201, {"content": {"sha": sha}})
+
+    def delete(self, url, headers=None, json=None):
+        path = self._path(url)
+        with self._lock:
+            self.requests.append(("DELETE", path))
+            current = self.files.get(path)
+            if current is None or json.get("sha") != current[1]:
+                return FakeResponse(409, {"message": "sha does not match"})
+            del self.files[path]
+            return FakeResponse(200)
+
+
+@pytest.fixture
+def fake_github(monkeypatch, tmp_path):
+    """Fake GitHub holding empty data files; local spools and snapshots go to tmp_path"""
+    fake = FakeGitHub({path: [] for path in DATA_FILES})
+    monkeypatch.setattr(ep.requests, "Session", lambda: fake)
+    monkeypatch.chdir(tmp_path)
+    return fake
+
+
+@pytest.fixture
+def github_store(fake_github, monkeypatch):
+    """Create GitHubDataStores on the fake GitHub, each with fresh process-wide caches"""
+    def make(**secrets):
+        # Writes go straight to GitHub and there is no snapshot unless a test asks for them
+        monkeypatch.setattr(ep.st, "secrets", {"write_behind": False, "feedback_snapshot_dir": "", **secrets})
+        ep.get_shared_data_cache.clear()
+        ep.get_write_behind_queue.clear()
+        return ep.GitHubDataStore()
+    return make
@@ -0,0 +1,52 @@
+import datetime
+import sys
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import empathypulse_final as ep
+
+
+@pytest.fixture(autouse=True)
+def fresh_resources():
+    """Every app run opens the store its secrets name, not one cached by an earlier test"""
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def test_app_runs_with_command_line_arguments(tmp_path, monkeypatch):
+    """Arguments meant for Streamlit don't make the page run the command line tools"""
+    monkeypatch.setattr(sys, "argv", ["empathypulse_final.py", "--server.port", "8502"])
+    app = AppTest.from_file("empathypulse_final.py", default_timeout=120)
+    app.secrets["storage_backend"] = "sqlite"
+    app.secrets["sqlite_path"] = str(tmp_path / "empathypulse.db")
+    app.secrets["sqlite_seed_dir"] = ""
+
+    app.run()
+
+    assert not app.exception
+    assert app.title[0].value == "Admin Setup"
+
+
+def test_feedback_tab_shows_records_without_analysis(tmp_path):
+    """Feedback whose analysis fields are missing renders with defaults instead of failing"""
+    db_path = str(tmp_path / "empathypulse.db")
+    store = ep.SQLiteDataStore(db_path, seed_dir=None)
+    assert store.add_admin({"admin_id": "hr", "password": "x"})
+    yesterday = (datetime.datetime.now() - datetime.timedelta(days=1)).isoformat()
+    assert store.add_feedback({"id": "f1", "emp_id": "E1", "dept": "Sales", "timestamp": yesterday,
+                               "feedback_text": "Fine", "status": "pending"})
+
+    app = AppTest.from_file("empathypulse_final.py", default_timeout=120)
+    app.secrets["storage_backend"] = "sqlite"
+    app.secrets["sqlite_path"] = db_path
+    app.secrets["sqlite_seed_dir"] = ""
+    app.session_state["page"] = "admin_dashboard"
+    app.session_state["role"] = "admin"
+    app.session_state["admin_id"] = "hr"
+
+    app.run()
+
+    assert not app.exception
+    assert any("Emotion Detection:** Neutral" in markdown.value for markdown in app.markdown)
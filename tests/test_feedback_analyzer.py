@@ -0,0 +1,48 @@
+import datetime
+
+import empathypulse_final as ep
+
+NEGATIVE = {"emotion": "anger", "emotion_confidence": 0.9, "sentiment": "NEGATIVE", "sentiment_confidence": 0.95}
+
+
+class FakeInferenceService:
+    """Inference service answering every text with the same analysis"""
+
+    def __init__(self):
+        self.texts = []
+
+    def submit(self, text):
+        self.texts.append(text)
+        future = ep.Future()
+        future.set_result(dict(NEGATIVE))
+        return future
+
+
+def analyzing(feedback_id, age):
+    """Feedback submitted `age` ago whose analysis has not been saved"""
+    timestamp = (datetime.datetime.now() - age).isoformat()
+    return {"id": feedback_id, "emp_id": "E1", "dept": "Engineering", "timestamp": timestamp,
+            "feedback_text": feedback_id, "status": "analyzing"}
+
+
+def test_resume_takes_over_only_orphaned_and_unclaimed_feedback(tmp_path):
+    """Fresh records stay with their submitter and records claimed elsewhere are left alone"""
+    store = ep.SQLiteDataStore(str(tmp_path / "empathypulse.db"), seed_dir=None)
+    for feedback in [analyzing("old", datetime.timedelta(hours=1)),
+                     analyzing("claimed", datetime.timedelta(hours=1)),
+                     analyzing("new", datetime.timedelta(seconds=1))]:
+        assert store.add_feedback(feedback)
+    lease = datetime.timedelta(minutes=10)
+    assert store.claim_feedback_analysis(["claimed"], "other-process", lease) == ["claimed"]
+
+    alerts = ep.AlertEngine()
+    service = FakeInferenceService()
+    analyzer = ep.FeedbackAnalyzer(service, workers=1, alert_engine=alerts, lease=lease)
+    analyzer._resume(store)
+    analyzer._pool.shutdown(wait=True)
+
+    assert service.texts == ["old"]
+    statuses = {f["id"]: f["status"] for f in store.get_feedback()}
+    assert statuses == {"old": "pending", "claimed": "analyzing", "new": "analyzing"}
+    # The negative result is an open alert before the engine sees the new feedback list
+    assert list(alerts.open_alerts([], [])["id"]) == ["old"]
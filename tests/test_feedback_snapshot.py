@@ -0,0 +1,50 @@
+import os
+
+import empathypulse_final as ep
+
+
+def test_snapshot_of_analyzing_record(tmp_path):
+    """A fresh submission has no analysis fields yet and must still be snapshotted"""
+    record = {
+        "id": "f1",
+        "emp_id": "E1",
+        "dept": "Sales",
+        "timestamp": "2025-08-01T09:30:00.123456",
+        "mood": "😐 Neutral",
+        "mood_score": 3,
+        "work_satisfaction": 7,
+        "team_satisfaction": 6,
+        "management_satisfaction": 5,
+        "feedback_text": "Still settling in.",
+        "status": "analyzing",
+    }
+    snapshot = ep.FeedbackSnapshot(str(tmp_path))
+
+    frame = snapshot.frame([record])
+
+    assert os.listdir(tmp_path) == ["2025-08.arrow"]
+    assert list(frame.columns) == ep.feedback_snapshot_schema().names
+    row = frame.iloc[0]
+    assert row["id"] == "f1"
+    assert row["status"] == "analyzing"
+    assert row["work_satisfaction"] == 7
+    assert frame[["emotion", "sentiment", "emotion_confidence", "sentiment_confidence", "alert_shown"]].isna().all().all()
+
+
+def test_snapshot_is_not_rewritten_while_changes_are_queued(github_store, tmp_path):
+    """Reruns with the same queued changes reuse the snapshot instead of rewriting its months"""
+    snapshot_dir = tmp_path / "snapshot"
+    store = github_store(write_behind=True, write_behind_interval=3600,
+                         write_behind_spool_dir=str(tmp_path / "spool"), feedback_snapshot_dir=str(snapshot_dir))
+    assert store.add_feedback({"id": "f1", "emp_id": "E1", "dept": "Sales", "timestamp": "2025-08-01T09:00:00"})
+
+    frame = store.get_feedback_frame()
+    assert list(frame["id"]) == ["f1"]
+    written = os.stat(snapshot_dir / "2025-08.arrow").st_mtime_ns
+
+    assert store.get_feedback_frame() is frame
+    assert os.stat(snapshot_dir / "2025-08.arrow").st_mtime_ns == written
+
+    assert store.update_feedback("f1", {"status": "complete"})
+    assert list(store.get_feedback_frame()["status"]) == ["complete"]
+    store.write_queue.close()
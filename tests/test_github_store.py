@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+import empathypulse_final as ep
+
+
+@pytest.mark.parametrize("stale_status", [409, 422])
+def test_modify_file_merges_onto_a_concurrent_commit(github_store, fake_github, stale_status):
+    """A write on top of a stale SHA is re-applied to the latest content, not lost"""
+    fake_github.stale_status = stale_status
+    store = github_store()
+    assert store.get_employees() == []
+
+    # Another process commits after this one cached the file
+    fake_github.write("data/employees.json", json.dumps([{"emp_id": "E1", "name": "Ada"}]))
+
+    assert store.add_employee({"emp_id": "E2", "name": "Grace"})
+    assert [e["emp_id"] for e in fake_github.data("data/employees.json")] == ["E1", "E2"]
+    assert fake_github.count("PUT", "data/employees.json") == 2
+    # The cache holds what was written, so reading it back costs no request
+    assert [e["emp_id"] for e in store.get_employees()] == ["E1", "E2"]
+
+
+def test_modify_file_finds_a_record_only_in_the_latest_version(github_store, fake_github):
+    """An update of a record the cached copy lacks revalidates the file once before giving up"""
+    store = github_store()
+    assert store.get_password_resets() == []
+    fake_github.write("data/password_reset.json", json.dumps([{"token": "t1", "used": False}]))
+
+    assert store.update_password_reset("t1", {"used": True})
+    assert fake_github.data("data/password_reset.json") == [{"token": "t1", "used": True}]
+    assert not store.update_password_reset("missing", {"used": True})
+
+
+def test_replay_feedback_log_applies_live_segments_in_order():
+    """Segments are applied by name and those the base already folded are skipped"""
+    base = ep.serialize_feedback_base([{"id": "f1", "status": "pending"}], folded=["001.jsonl"])
+    segments = {
+        "003.jsonl": json.dumps({"op": "update", "id": "f2", "changes": {"status": "complete"}}) + "\n",
+        "001.jsonl": json.dumps({"op": "append", "record": {"id": "f1", "status": "stale"}}) + "\n",
+        "002.jsonl": json.dumps({"op": "append", "record": {"id": "f2", "status": "pending"}}) + "\n",
+    }
+
+    assert ep.replay_feedback_log(base, segments) == [
+        {"id": "f1", "status": "pending"},
+        {"id": "f2", "status": "complete"},
+    ]
+
+
+def test_feedback_log_segments_and_compaction(github_store, fake_github):
+    """Writes add log segments; compaction folds them into the base and deletes them"""
+    store = github_store(feedback_format="jsonl", feedback_compact_threshold=100)
+    assert store.add_feedback({"id": "f1", "emp_id": "E1", "timestamp": "2025-08-01T09:00:00"})
+    assert store.add_feedback({"id": "f2", "emp_id": "E2", "timestamp": "2025-08-02T09:00:00"})
+    assert store.update_feedback("f1", {"status": "complete"})
+
+    segments = [path for path in fake_github.files if path.startswith("data/feedback_log/")]
+    assert len(segments) == 3
+    expected = [
+        {"id": "f1", "emp_id": "E1", "timestamp": "2025-08-01T09:00:00", "status": "complete"},
+        {"id": "f2", "emp_id": "E2", "timestamp": "2025-08-02T09:00:00", "status": "pending"},
+    ]
+    assert store.get_feedback() == expected
+    # A new process replays the same records from GitHub
+    assert github_store(feedback_format="jsonl").get_feedback() == expected
+
+    assert store.compact_feedback_log()
+    assert not any(path.startswith("data/feedback_log/") for path in fake_github.files)
+    base = ep.parse_feedback_base(fake_github.files["data/feedback.jsonl"][0])
+    assert base["records"] == expected
+    assert sorted(base["folded"]) == sorted(path.split("/")[-1] for path in segments)
+    assert store.get_feedback() == expected
+    assert github_store(feedback_format="jsonl").get_feedback() == expected
+
+
+def test_monthly_shards_place_every_change(github_store, fake_github, caplog):
+    """Undated feedback gets its own shard and updates of vanished records are logged, not lost silently"""
+    store = github_store(feedback_format="monthly")
+    assert store.add_feedback({"id": "f1", "emp_id": "E1", "timestamp": "2025-08-01T09:00:00"})
+    assert store.add_feedback({"id": "f2", "emp_id": "E1", "timestamp": "unknown"})
+    assert [f["id"] for f in fake_github.data("data/feedback/undated.json")] == ["f2"]
+
+    # A record, and an update of it, committed together land in the same shard
+    assert store._write_feedback_ops([
+        {"op": "append", "record": {"id": "f3", "emp_id": "E2", "timestamp": "2025-09-01T09:00:00"}},
+        {"op": "update", "id": "f3", "changes": {"status": "complete"}},
+    ], "Add feedback")
+    assert fake_github.data("data/feedback/2025-09.json")[0]["status"] == "complete"
+
+    # The month on an update is only a hint: the record is looked up where it really is
+    assert store._write_feedback_ops(
+        [{"op": "update", "id": "f2", "changes": {"status": "complete"}, "month": "2025-08"}], "Update feedback"
+    )
+    assert fake_github.data("data/feedback/undated.json")[0]["status"] == "complete"
+
+    puts = sum(method == "PUT" for method, _ in fake_github.requests)
+    assert store._write_feedback_ops([{"op": "update", "id": "gone", "changes": {}, "month": "2025-08"}], "Update")
+    assert sum(method == "PUT" for method, _ in fake_github.requests) == puts
+    assert "gone" in caplog.text
+    assert sorted(f["id"] for f in store.get_feedback()) == ["f1", "f2", "f3"]
+
+
+def test_monthly_date_bounds_skip_empty_shards(github_store):
+    """Shards emptied by deleting an employee don't hide the dates of the feedback left"""
+    store = github_store(feedback_format="monthly")
+    for feedback_id, emp_id, timestamp in [
+        ("f1", "E1", "2025-06-03T09:00:00"),
+        ("f2", "E2", "2025-07-04T09:00:00"),
+        ("f3", "E2", "2025-07-20T09:00:00"),
+        ("f4", "E1", "2025-08-05T09:00:00"),
+    ]:
+        assert store.add_feedback({"id": feedback_id, "emp_id": emp_id, "timestamp": timestamp})
+    assert store.delete_employee("E1")
+
+    assert store.get_feedback_date_bounds() == (ep.datetime.date(2025, 7, 4), ep.datetime.date(2025, 7, 20))
+
+
+def test_analysis_claims_are_exclusive_until_the_lease_ends(github_store, fake_github):
+    """A claim committed by another process first wins over the cached claims file"""
+    lease = ep.datetime.timedelta(minutes=10)
+    store = github_store()
+    other = github_store()
+    assert store.claim_feedback_analysis(["f1", "f2"], "a", lease) == ["f1", "f2"]
+
+    # other's cache still has the claims file from before a's commit
+    assert other.claim_feedback_analysis(["f2", "f3"], "b", lease) == ["f3"]
+    assert other.claim_feedback_analysis(["f1", "f2"], "b", lease) == []
+    assert sorted(c["id"] for c in fake_github.data("data/analysis_claims.json")) == ["f1", "f2", "f3"]
+
+    assert other.claim_feedback_analysis(["f1"], "b", ep.datetime.timedelta(0)) == ["f1"]
+    assert [c["id"] for c in fake_github.data("data/analysis_claims.json")] == ["f1"]
+
+
+def test_ranged_feedback_frame_reads_only_its_months(github_store, fake_github):
+    """A date range loads the shards of its months, and the same range gives the same frame"""
+    store = github_store(feedback_format="monthly")
+    for feedback_id, timestamp in [("f1", "2025-06-03T09:00:00"), ("f2", "2025-07-04T09:00:00"),
+                                   ("f3", "2025-07-31T18:00:00"), ("f4", "2025-08-05T09:00:00")]:
+        assert store.add_feedback({"id": feedback_id, "emp_id": "E1", "timestamp": timestamp})
+
+    reader = github_store(feedback_format="monthly")
+    frame = reader.get_feedback_frame(start_date=ep.datetime.date(2025, 7, 4), end_date=ep.datetime.date(2025, 7, 31))
+    assert list(frame["id"]) == ["f2", "f3"]
+    assert fake_github.count("GET", "data/feedback/2025-06.json") == 0
+    assert fake_github.count("GET", "data/feedback/2025-08.json") == 0
+    assert reader.get_feedback_frame(start_date=ep.datetime.date(2025, 7, 4),
+                                     end_date=ep.datetime.date(2025, 7, 31)) is frame
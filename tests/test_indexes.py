@@ -0,0 +1,76 @@
+import empathypulse_final as ep
+
+EMPLOYEES = [
+    {"emp_id": "E1", "name": "Ada Lovelace", "dept": "Engineering"},
+    {"emp_id": "E2", "name": "Grace Hopper", "dept": "Engineering"},
+    {"emp_id": "E3", "name": "Alan Turing", "dept": "Research"},
+]
+
+
+def test_diff_records_by_identity():
+    """Replaced and appended records are reported, removals and reordering are not diffable"""
+    previous = [{"id": "f1"}, {"id": "f2"}]
+    changed = {"id": "f2", "status": "complete"}
+    appended = {"id": "f3"}
+
+    assert ep.diff_records(previous, list(previous), "id") == []
+    assert ep.diff_records(previous, [previous[0], changed, appended], "id") == [
+        (previous[1], changed),
+        (None, appended),
+    ]
+    assert ep.diff_records(previous, previous[:1], "id") is None
+    assert ep.diff_records(previous, [previous[1], previous[0]], "id") is None
+
+
+def test_record_index_follows_new_versions():
+    """Changed, appended and removed records are reflected in lookups and groups"""
+    index = ep.RecordIndex("id", ("emp_id",))
+    feedback = [{"id": "f1", "emp_id": "E1"}, {"id": "f2", "emp_id": "E1"}]
+    assert [f["id"] for f in index.group(feedback, "emp_id", "E1")] == ["f1", "f2"]
+
+    moved = [feedback[0], {"id": "f2", "emp_id": "E2"}, {"id": "f3", "emp_id": "E2"}]
+    assert [f["id"] for f in index.group(moved, "emp_id", "E1")] == ["f1"]
+    assert [f["id"] for f in index.group(moved, "emp_id", "E2")] == ["f2", "f3"]
+    assert index.get(moved, "f2") is moved[1]
+
+    removed = moved[1:]
+    assert index.get(removed, "f1") is None
+    assert index.group(removed, "emp_id", "E1") == []
+
+
+def test_employee_search_index_follows_new_versions():
+    """Renames, department changes, hires and departures are searchable right away"""
+    index = ep.EmployeeSearchIndex()
+    assert index.search(EMPLOYEES, "lov") == (1, [EMPLOYEES[0]])
+    assert index.search(EMPLOYEES, "a")[0] == 2  # "Ada", "Alan"
+    assert index.departments(EMPLOYEES) == ["Engineering", "Research"]
+
+    renamed = {"emp_id": "E1", "name": "Ada King", "dept": "Research"}
+    hired = {"emp_id": "E4", "name": "Katherine Johnson", "dept": "Research"}
+    employees = [renamed, EMPLOYEES[1], EMPLOYEES[2], hired]
+    assert index.search(employees, "lov") == (0, [])
+    assert index.search(employees, "king")[1] == [renamed]
+    assert index.search(employees, dept="Research") == (3, [renamed, EMPLOYEES[2], hired])
+    assert index.search(employees, offset=1, limit=2) == (4, [EMPLOYEES[2], EMPLOYEES[1]])
+
+    remaining = employees[1:]
+    assert index.search(remaining, "ada") == (0, [])
+    assert index.departments(remaining) == ["Engineering", "Research"]
+
+
+def test_pending_overlay_is_reused_until_the_queue_changes(github_store, tmp_path):
+    """Feedback with queued changes applied is one list per base and queue version"""
+    store = github_store(write_behind=True, write_behind_interval=3600,
+                         write_behind_spool_dir=str(tmp_path / "spool"))
+    assert store.add_feedback({"id": "f1", "emp_id": "E1", "timestamp": "2025-08-01T09:00:00"})
+
+    feedback = store.get_feedback()
+    assert [f["id"] for f in feedback] == ["f1"]
+    assert store.get_feedback() is feedback
+
+    assert store.update_feedback("f1", {"status": "complete"})
+    updated = store.get_feedback()
+    assert updated is not feedback
+    assert updated[0]["status"] == "complete"
+    assert store.get_feedback() is updated
+    store.write_queue.close()
@@ -0,0 +1,123 @@
+import random
+
+import pandas as pd
+import pytest
+
+import empathypulse_final as ep
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    """Empty SQLite store in a temporary database"""
+    return ep.SQLiteDataStore(str(tmp_path / "empathypulse.db"), seed_dir=None)
+
+
+def test_updates_keep_row_order(sqlite_store):
+    """Updating a record leaves it where it was in the listing"""
+    for emp_id in ["E1", "E2", "E3"]:
+        assert sqlite_store.add_employee({"emp_id": emp_id, "name": emp_id, "dept": "Sales"})
+        assert sqlite_store.add_password_reset({"token": f"t-{emp_id}", "emp_id": emp_id, "used": False})
+
+    assert sqlite_store.update_employee("E1", {"dept": "HR"})
+    assert sqlite_store.update_password_reset("t-E1", {"used": True})
+
+    assert [e["emp_id"] for e in sqlite_store.get_employees()] == ["E1", "E2", "E3"]
+    assert sqlite_store.get_employee("E1")["dept"] == "HR"
+    assert sqlite_store.get_employee_departments() == ["HR", "Sales"]
+    assert [r["token"] for r in sqlite_store.get_password_resets()] == ["t-E1", "t-E2", "t-E3"]
+    assert sqlite_store.get_password_reset_by_token("t-E1")["used"] is True
+
+
+def test_analysis_claims_are_exclusive_until_the_lease_ends(sqlite_store):
+    """Of two processes claiming the same records, each record goes to one of them"""
+    lease = ep.datetime.timedelta(minutes=10)
+    assert sqlite_store.claim_feedback_analysis(["f1", "f2"], "a", lease) == ["f1", "f2"]
+    assert sqlite_store.claim_feedback_analysis(["f2", "f3"], "b", lease) == ["f3"]
+    assert sqlite_store.claim_feedback_analysis(["f1"], "b", ep.datetime.timedelta(0)) == ["f1"]
+
+
+def rollup_rows(frame):
+    """Rollup frame in a canonical row order"""
+    return frame.assign(dept=frame["dept"].fillna("")).sort_values(["date", "dept"]).reset_index(drop=True)
+
+
+def test_daily_rollup_table_matches_feedback_rollup(sqlite_store):
+    """The feedback_daily totals kept by writes equal FeedbackRollup over the same feedback"""
+    rng = random.Random(7)
+    rollup = ep.FeedbackRollup()
+    feedback_ids = []
+    for step in range(300):
+        action = rng.random()
+        if action < 0.5 or not feedback_ids:
+            feedback_id = f"f{step}"
+            feedback = {
+                "id": feedback_id,
+                "emp_id": rng.choice(["E1", "E2", "E3"]),
+                "dept": rng.choice(["Sales", "HR", None]),
+                # Some records have no usable date and stay out of the totals
+                "timestamp": rng.choice([f"2025-08-{rng.randint(1, 5):02d}T09:00:00", ""]),
+                "work_satisfaction": rng.choice([rng.randint(1, 10), None, "7"]),
+                "team_satisfaction": rng.randint(1, 10),
+            }
+            assert sqlite_store.add_feedback(feedback)
+            feedback_ids.append(feedback_id)
+        elif action < 0.9:
+            changes = {"sentiment": rng.choice(["POSITIVE", "NEGATIVE"]), "emotion": rng.choice(["joy", "anger"]),
+                       "management_satisfaction": rng.randint(1, 10)}
+            assert sqlite_store.update_feedback(rng.choice(feedback_ids), changes)
+        else:
+            emp_id = rng.choice(["E1", "E2", "E3"])
+            assert sqlite_store.delete_employee(emp_id)
+            feedback_ids = [f["id"] for f in sqlite_store.get_feedback()]
+
+        if step % 25 == 0:
+            # The incremental rollup is checked along the way, a fresh one at the end
+            pd.testing.assert_frame_equal(
+                rollup_rows(sqlite_store.get_daily_feedback_rollup()),
+                rollup_rows(rollup.frame(sqlite_store.get_feedback())),
+                check_dtype=False
+            )
+
+    pd.testing.assert_frame_equal(
+        rollup_rows(sqlite_store.get_daily_feedback_rollup()),
+        rollup_rows(ep.FeedbackRollup().frame(sqlite_store.get_feedback())),
+        check_dtype=False
+    )
+
+
+def test_ranged_feedback_frame(sqlite_store):
+    """A date range selects whole days and is cached apart from the full frame"""
+    for feedback_id, timestamp in [("f1", "2025-07-03T23:59:59"), ("f2", "2025-07-04T00:00:00"),
+                                   ("f3", "2025-07-31T18:00:00"), ("f4", "2025-08-01T00:00:00")]:
+        assert sqlite_store.add_feedback({"id": feedback_id, "emp_id": "E1", "timestamp": timestamp})
+
+    july = {"start_date": ep.datetime.date(2025, 7, 4), "end_date": ep.datetime.date(2025, 7, 31)}
+    frame = sqlite_store.get_feedback_frame(**july)
+    assert list(frame["id"]) == ["f2", "f3"]
+    assert len(sqlite_store.get_feedback_frame()) == 4
+    assert sqlite_store.get_feedback_frame(**july) is frame
+
+
+def test_search_matches_employee_search_index(sqlite_store):
+    """SQL search and the in-memory index find and order the same employees, non-ASCII names included"""
+    rng = random.Random(11)
+    parts = ["Ada", "ÅSA", "Straße", "STRASSE", "Σίσυφος", "İpek", "Émile", "zoë", "O'Neil", "50%_off", "Lee"]
+    employees = []
+    for i in range(80):
+        employee = {
+            "emp_id": rng.choice(["E", "é", "K"]) + str(i),
+            "name": " ".join(rng.sample(parts, rng.randint(1, 2))),
+            "dept": rng.choice(["Sales", "HR"]),
+        }
+        assert sqlite_store.add_employee(employee)
+        employees.append(employee)
+    employees = sqlite_store.get_employees()
+    index = ep.EmployeeSearchIndex()
+
+    queries = ["", " ", "a", "å", "ÅS", "ss", "ß", "strasse", "σί", "ΣΊΣ", "i̇p", "é", "ém", "e1", "É1", "%", "_o", "50%",
+               "o'n", "lee e"]
+    queries += [rng.choice(parts)[rng.randint(0, 2):][:rng.randint(1, 5)].upper() for _ in range(40)]
+    for query in queries:
+        for dept in [None, "HR"]:
+            expected = index.search(employees, query, dept, offset=3, limit=10)
+            assert sqlite_store.search_employees(query, dept, offset=3, limit=10) == expected, query
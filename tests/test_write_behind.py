@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+import empathypulse_final as ep
+
+FEEDBACK = "data/feedback.json"
+OPS = [
+    {"op": "append", "record": {"id": "f1", "emp_id": "E1"}},
+    {"op": "update", "id": "f1", "changes": {"status": "complete"}},
+]
+
+
+def make_queue(spool_dir, committed):
+    """Queue that only commits when flushed explicitly, recording what it commits"""
+    def commit_batch(path, ops):
+        committed.append((path, ops))
+        return True
+    return ep.WriteBehindQueue(commit_batch, str(spool_dir), interval=3600)
+
+
+def spool_files(spool_dir):
+    return sorted(name for name in os.listdir(spool_dir) if name.endswith(".pending.jsonl"))
+
+
+@pytest.mark.parametrize("owner", ["4242-deadbeef", None])
+def test_replays_the_spool_of_a_crashed_process(tmp_path, owner):
+    """Changes a dead process spooled are taken over, committed and then dropped from disk"""
+    name = f"data__feedback.json.{owner}.pending.jsonl" if owner else "data__feedback.json.pending.jsonl"
+    (tmp_path / name).write_text("".join(json.dumps(op) + "\n" for op in OPS))
+    committed = []
+
+    queue = make_queue(tmp_path, committed)
+
+    assert queue.pending(FEEDBACK) == OPS
+    # The changes now live in the new queue's own spool
+    assert spool_files(tmp_path) == [f"data__feedback.json.{queue.owner}.pending.jsonl"]
+    assert queue.flush()
+    assert committed == [(FEEDBACK, OPS)]
+    assert queue.pending(FEEDBACK) == []
+
+    queue.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_leaves_the_spool_of_a_running_process_alone(tmp_path):
+    """A second process sharing the spool directory neither replays nor rewrites a live spool"""
+    running = make_queue(tmp_path, [])
+    for op in OPS:
+        running.enqueue(FEEDBACK, op)
+
+    committed = []
+    starting = make_queue(tmp_path, committed)
+    assert starting.pending(FEEDBACK) == []
+    assert starting.flush()
+    starting.close()
+
+    assert committed == []
+    assert running.pending(FEEDBACK) == OPS
+    assert spool_files(tmp_path) == [f"data__feedback.json.{running.owner}.pending.jsonl"]
+
+
+def test_spool_survives_a_failed_flush(tmp_path):
+    """Changes that could not be committed stay spooled for the next process"""
+    queue = ep.WriteBehindQueue(lambda path, ops: False, str(tmp_path), interval=3600)
+    queue.enqueue(FEEDBACK, OPS[0])
+    assert not queue.flush()
+    queue.close()
+    # What a crash or a failed flush at exit leaves: the spool, with its owner's lock released
+    queue._owner_lock.close()
+
+    committed = []
+    assert make_queue(tmp_path, committed).pending(FEEDBACK) == [OPS[0]]